@@ -0,0 +1,125 @@
+"""
+Microbenchmark of the vacation request row formatting.
+
+Compares the previous `_format_results`, which parsed and formatted every column of
+every row into a new dictionary, with the `VacationRequestRecord` pipeline.
+
+Usage (from the project root):
+
+    python -m benchmarks.bench_format_results [--rows 100000]
+"""
+
+import argparse
+import random
+import timeit
+from datetime import date, datetime, timedelta
+from scripts.vacation_record import (
+    VacationRequestRecord,
+    format_date,
+    format_start_time,
+)
+
+
+def _format_results_baseline(data):
+    formatted_data = []
+    for row in data:
+        (
+            vacation_id,
+            first_name,
+            last_name,
+            from_date,
+            to_date,
+            start_time,
+            hours,
+            reason,
+            approved,
+        ) = row
+        formatted_row = {
+            "Vacation ID": vacation_id,
+            "Employee": f"{first_name} {last_name}",
+            "From Date": from_date.strftime("%Y-%m-%d") if from_date else "N/A",
+            "To Date": to_date.strftime("%Y-%m-%d") if to_date else "N/A",
+            "Start Time": datetime.strptime(start_time[:15], "%H:%M:%S.%f").strftime(
+                "%I:%M %p"
+            )
+            if start_time
+            else "N/A",
+            "Hours": float(hours) if hours else "N/A",
+            "Reason": reason,
+            "Approved": approved,
+        }
+        formatted_data.append(formatted_row)
+    return formatted_data
+
+
+def _format_results_records(data):
+    return [VacationRequestRecord(*row) for row in data]
+
+
+def make_rows(count: int, seed: int = 0) -> list:
+    """
+    Rows shaped like the VacationRequest query, start times as the legacy driver returns them.
+    """
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+    start_times = [f"{h:02d}:{m:02d}:00.0000000" for h in range(6, 18) for m in (0, 30)]
+
+    rows = []
+    for pk in range(count, 0, -1):
+        from_date = start + timedelta(days=rng.randrange(730))
+        rows.append(
+            (
+                pk,
+                f"First{rng.randrange(500)}",
+                f"Last{rng.randrange(500)}",
+                from_date,
+                from_date + timedelta(days=rng.randrange(10)),
+                rng.choice(start_times),
+                rng.choice((4, 8, 16, 40)),
+                "Family trip",
+                0,
+            )
+        )
+    return rows
+
+
+def _display_all(records):
+    for record in records:
+        tuple(
+            record[key] for key in ("Vacation ID", "From Date", "To Date", "Start Time")
+        )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rows = make_rows(args.rows)
+
+    def best(stmt) -> float:
+        format_date.cache_clear()
+        format_start_time.cache_clear()
+        return min(timeit.repeat(stmt, number=1, repeat=args.repeat))
+
+    baseline = best(lambda: _format_results_baseline(rows))
+    records = best(lambda: _format_results_records(rows))
+    displayed = best(lambda: _display_all(_format_results_records(rows)))
+    first_page = best(lambda: _display_all(_format_results_records(rows)[:100]))
+
+    print(f"{args.rows} rows, best of {args.repeat}")
+    print(f"  baseline dict formatting        {baseline * 1000:9.1f} ms")
+    print(
+        f"  records                         {records * 1000:9.1f} ms  ({baseline / records:.1f}x)"
+    )
+    print(
+        f"  records, every row displayed    {displayed * 1000:9.1f} ms  ({baseline / displayed:.1f}x)"
+    )
+    print(
+        f"  records, first page displayed   {first_page * 1000:9.1f} ms  ({baseline / first_page:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
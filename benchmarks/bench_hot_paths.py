@@ -0,0 +1,300 @@
+"""
+Benchmarks of the application's hot paths against a synthetic stand-in database.
+
+Runs headless: the database is an in-memory `SqliteBackend` filled by
+`scripts.synthetic_data`, the department store and the request history live in a
+temporary directory, and `AddView` is loaded without creating its window.
+
+Usage (from the project root):
+
+    python -m benchmarks.bench_hot_paths --save-baseline
+    python -m benchmarks.bench_hot_paths --require-baseline [--filter controller]
+
+Exits with 1 when a case is slower, or peaks higher in memory, than its baseline by
+more than the threshold, and with --require-baseline when there is no baseline. Peak
+memory is the Python heap traced by tracemalloc, SQLite's own allocations are not
+included.
+"""
+
+import atexit
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime
+from typing import Dict, Tuple
+from benchmarks.bench_format_results import make_rows
+from benchmarks.runner import Case, benchmark, main
+from scripts import controller as controller_module
+from scripts import mie_trak_funcs
+from scripts.controller import Controller
+from scripts.db_backend import SqliteBackend
+from scripts.department_store import ACCESSED_KEYS
+from scripts.request_history import TIME_STAMP_FORMAT, RequestHistory
+from scripts.synthetic_data import SyntheticDataset, synthetic_backend
+
+
+TIERS = ("small", "medium", "large")
+
+_WORKDIR = tempfile.mkdtemp(prefix="mietrak-bench-")
+atexit.register(shutil.rmtree, _WORKDIR, ignore_errors=True)
+
+_BACKENDS: Dict[str, Tuple[SqliteBackend, SyntheticDataset]] = {}
+
+
+def _use_tier(tier: str) -> SyntheticDataset:
+    """
+    Points `mie_trak_funcs` at the stand-in database of a tier, generated once per run.
+    Benchmarks using it must leave its data as they found it.
+    """
+    if tier not in _BACKENDS:
+        _BACKENDS[tier] = synthetic_backend(tier, seed=0)
+    backend, dataset = _BACKENDS[tier]
+    mie_trak_funcs.configure_backend(backend)
+    return dataset
+
+
+def _controller(name: str, cache: Dict | None = None) -> Controller:
+    """
+    A Controller on its own department store in the work directory.
+    """
+    controller_module.DEPARTMENT_STORE_FILE = os.path.join(_WORKDIR, f"{name}.db")
+    controller_module.DEPARTMENT_DATA_FILE = None
+    controller = Controller()
+    if cache is not None:
+        controller.store.replace_all(cache)
+        controller.cache_dict = controller.store.load()
+    return controller
+
+
+def _department_cache(departments: int, items: int) -> Dict:
+    return {
+        str(department_pk): {
+            "name": f"Department {department_pk}",
+            **{
+                key: {
+                    str(item_pk): f"{item_table} {item_pk}"
+                    for item_pk in range(1, items + 1)
+                }
+                for item_table, key in ACCESSED_KEYS.items()
+            },
+        }
+        for department_pk in range(1, departments + 1)
+    }
+
+
+# Vacation requests
+
+
+@benchmark("vacation_requests.get_all", params=TIERS, unit="rows")
+def bench_get_all_vacation_requests(tier: str) -> Case:
+    """The pending request list: one query plus `_format_results`."""
+    _use_tier(tier)
+    return Case(lambda: len(mie_trak_funcs.get_all_vacation_requests()))
+
+
+@benchmark(
+    "vacation_requests.format_results", params=(1_000, 10_000, 100_000), unit="rows"
+)
+def bench_format_results(row_count: int) -> Case:
+    rows = make_rows(row_count)
+    return Case(lambda: len(mie_trak_funcs._format_results(rows)))
+
+
+# Controller
+
+
+@benchmark(
+    "controller.add_dashboard_to_department", params=(10, 100, 1_000), unit="users"
+)
+def bench_add_dashboard_to_department(department_size: int) -> Case:
+    """
+    Grants a dashboard to a department of ``department_size`` members, the grant is
+    revoked again between runs.
+    """
+    backend, _ = synthetic_backend("small", seed=0)
+    mie_trak_funcs.configure_backend(backend)
+
+    department_pk, dashboard_pk = 10_000, 1
+    first_user = 100_000
+    conn = backend.raw_connection()
+    with conn:
+        conn.execute(
+            "INSERT INTO Department VALUES (?, ?)", (department_pk, "Benchmark")
+        )
+        conn.executemany(
+            "INSERT INTO [User] (UserPK, FirstName, LastName, Enabled, DepartmentFK) "
+            "VALUES (?, ?, ?, 1, ?)",
+            [
+                (user_pk, "Bench", f"User {user_pk}", department_pk)
+                for user_pk in range(first_user, first_user + department_size)
+            ],
+        )
+
+    controller = _controller(f"add_dashboard_{department_size}")
+
+    def teardown() -> None:
+        controller.store.close()
+        backend.close()
+
+    return Case(
+        lambda: controller.add_dashboard_to_department(department_pk, dashboard_pk),
+        items=department_size,
+        reset=lambda: controller.delete_dashboard_from_department(
+            department_pk, dashboard_pk
+        ),
+        teardown=teardown,
+    )
+
+
+# (departments, items per department and item table)
+CACHE_SIZES = ("50x20", "300x100", "300x1000")
+
+
+def _cache_size(size: str) -> Tuple[int, int]:
+    departments, items = size.split("x")
+    return int(departments), int(items)
+
+
+@benchmark("controller.write_cache", params=CACHE_SIZES, unit="rows")
+def bench_write_cache(size: str) -> Case:
+    departments, items = _cache_size(size)
+    controller = _controller(
+        f"write_cache_{size}", _department_cache(departments, items)
+    )
+    return Case(
+        controller.write_cache,
+        items=departments * items * len(ACCESSED_KEYS),
+        teardown=controller.store.close,
+    )
+
+
+@benchmark(
+    "controller.get_department_information_from_cache", params=CACHE_SIZES, unit="rows"
+)
+def bench_department_information(size: str) -> Case:
+    """Loading the department store as a new Controller does, then reading it."""
+    departments, items = _cache_size(size)
+    controller = _controller(
+        f"load_cache_{size}", _department_cache(departments, items)
+    )
+
+    def run() -> None:
+        controller.cache_dict = controller.store.load()
+        controller.get_department_information_from_cache()
+
+    return Case(
+        run,
+        items=departments * items * len(ACCESSED_KEYS),
+        teardown=controller.store.close,
+    )
+
+
+# Request history
+
+
+def _history_rows(count: int, first_pk: int, rng: random.Random) -> list:
+    time_stamp = datetime(2026, 1, 1).strftime(TIME_STAMP_FORMAT)
+    return [
+        {
+            "Vacation ID": pk,
+            "Employee": f"First{rng.randrange(500)} Last{rng.randrange(500)}",
+            "From Date": "2026-01-05",
+            "To Date": "2026-01-09",
+            "Start Time": "08:00 AM",
+            "Hours": 40.0,
+            "Reason": "Family trip " * rng.randrange(1, 30),
+            "Approved": 1,
+            "Status": rng.choice(("Approved", "Disapproved")),
+            "Time Stamp": time_stamp,
+        }
+        for pk in range(first_pk, first_pk + count)
+    ]
+
+
+@benchmark("request_history.append", params=(1_000, 10_000, 100_000), unit="rows")
+def bench_history_append(length: int) -> Case:
+    """Recording a batch of 100 decisions into a history of ``length`` rows."""
+    rng = random.Random(0)
+    path = os.path.join(_WORKDIR, f"history_{length}.db")
+    history = RequestHistory(path, None)
+    for start in range(0, length, 10_000):
+        history.append(_history_rows(min(10_000, length - start), start + 1, rng))
+
+    # The appended batch is deleted after every run, so each run sees ``length`` rows.
+    conn = sqlite3.connect(path)
+    (last_id,) = conn.execute("SELECT MAX(id) FROM request_history").fetchone()
+
+    def reset() -> None:
+        with conn:
+            conn.execute("DELETE FROM request_history WHERE id > ?", (last_id,))
+
+    def teardown() -> None:
+        conn.close()
+        history.close()
+
+    batch = _history_rows(100, length + 1, rng)
+    return Case(
+        lambda: history.append(batch), items=len(batch), reset=reset, teardown=teardown
+    )
+
+
+@benchmark("request_history.query", params=(1_000, 10_000, 100_000), unit="rows")
+def bench_history_query(length: int) -> Case:
+    """The first page of the history popup, with the disapproved filter."""
+    rng = random.Random(0)
+    history = RequestHistory(os.path.join(_WORKDIR, f"history_query_{length}.db"), None)
+    for start in range(0, length, 10_000):
+        history.append(_history_rows(min(10_000, length - start), start + 1, rng))
+
+    return Case(
+        lambda: len(history.query(status="Disapproved", limit=100)),
+        teardown=history.close,
+    )
+
+
+# GUI models
+
+
+@benchmark("add_view.load_data", params=TIERS, unit="items")
+def bench_add_view_load_data(tier: str) -> Case:
+    """
+    `AddView._load_data` for the largest department, with a cold reference cache:
+    fetching every item, dropping the assigned ones and building the search indexes.
+    """
+    # Imported here, the other benchmarks do not need Tk.
+    from gui.add_popup import AddView
+
+    dataset = _use_tier(tier)
+    controller = _controller(f"add_view_{tier}", dataset.department_cache)
+
+    # The window is never created: only the attributes _load_data uses are set.
+    view = AddView.__new__(AddView)
+    view.controller = controller
+    view.department_pk = max(
+        controller.cache_dict,
+        key=lambda pk: len(controller.cache_dict[pk]["accessed_quickviews"]),
+    )
+    view.user_pk = None
+    view.dashboard_listbox = "dashboards"
+    view.quickview_listbox = "quickviews"
+    view.document_group_listbox = "document_groups"
+
+    def run() -> int:
+        view._load_data()
+        return (
+            len(view.dashboards_dict)
+            + len(view.quickviews_dict)
+            + len(view.document_groups_dict)
+        )
+
+    return Case(
+        run,
+        reset=mie_trak_funcs.REFERENCE_CACHE.invalidate,
+        teardown=controller.store.close,
+    )
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,267 @@
+"""
+A small asv-style benchmark runner with tracked baselines.
+
+Benchmarks register themselves with `benchmark`; each one builds a `Case` per
+parameter (data size, tier, ...). The runner times every case, measures its peak
+Python memory with tracemalloc in a separate run, and compares the results with a
+saved baseline, failing when a case got slower or bigger than the threshold allows.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List
+
+
+DEFAULT_BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+class Case:
+    """
+    One benchmarked operation at one parameter.
+
+    :param run: The timed operation. If it returns an int, that is the number of
+        items it processed and overrides ``items`` for the throughput.
+    :type run: Callable[[], Any]
+    :param items: Items processed per run (rows, users, ...), for the throughput.
+    :type items: int
+    :param reset: Untimed, called after every run to restore the starting state.
+    :type reset: Callable[[], None] | None
+    :param teardown: Called once when the case is done.
+    :type teardown: Callable[[], None] | None
+    """
+
+    def __init__(
+        self,
+        run: Callable[[], Any],
+        items: int = 1,
+        reset: Callable[[], None] | None = None,
+        teardown: Callable[[], None] | None = None,
+    ) -> None:
+        self.run = run
+        self.items = items
+        self.reset = reset
+        self.teardown = teardown
+
+
+class Benchmark:
+    def __init__(
+        self, name: str, setup: Callable[[Any], Case], params: Iterable, unit: str
+    ) -> None:
+        self.name = name
+        self.setup = setup
+        self.params = list(params)
+        self.unit = unit
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str, params: Iterable = (None,), unit: str = "items") -> Callable:
+    """
+    Registers a function building a `Case` for each of ``params``.
+
+    :param name: Dotted name of the benchmark, used in baselines and for --filter.
+    :type name: str
+    :param params: The parameters to run the benchmark at.
+    :type params: Iterable
+    :param unit: What the throughput counts.
+    :type unit: str
+    """
+
+    def decorator(setup: Callable[[Any], Case]) -> Callable[[Any], Case]:
+        BENCHMARKS.append(Benchmark(name, setup, params, unit))
+        return setup
+
+    return decorator
+
+
+def _key(name: str, param: Any) -> str:
+    return name if param is None else f"{name}[{param}]"
+
+
+def run_case(case: Case, repeat: int) -> Dict[str, Any]:
+    """
+    Times ``repeat`` runs of a case after one warm-up run, then measures its peak
+    memory in one more run.
+
+    :return: Median and minimum seconds, items per run, throughput and peak KiB.
+    :rtype: Dict[str, Any]
+    """
+
+    def once() -> tuple[float, int]:
+        start = time.perf_counter()
+        processed = case.run()
+        elapsed = time.perf_counter() - start
+        if case.reset is not None:
+            case.reset()
+        return elapsed, processed if isinstance(processed, int) else case.items
+
+    once()  # warm-up: imports, caches, prepared statements
+    timings, items = [], case.items
+    for _ in range(repeat):
+        elapsed, items = once()
+        timings.append(elapsed)
+
+    # Measured separately, tracing slows Python code down several times.
+    tracemalloc.start()
+    try:
+        case.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    if case.reset is not None:
+        case.reset()
+
+    median = statistics.median(timings)
+    return {
+        "median_s": median,
+        "min_s": min(timings),
+        "items": items,
+        "throughput_per_s": items / median if median else None,
+        "peak_kib": peak / 1024,
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float,
+) -> List[str]:
+    """
+    Returns a description of every case slower, or using more memory, than its
+    baseline by more than ``threshold`` (0.2 = 20%).
+    """
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+
+        for metric, label in (("median_s", "time"), ("peak_kib", "memory")):
+            before, after = base.get(metric), result.get(metric)
+            if before and after and after > before * (1 + threshold):
+                regressions.append(
+                    f"{key}: {label} {after / before - 1:+.0%} ({before:.4g} -> {after:.4g})"
+                )
+    return regressions
+
+
+def _print_result(
+    key: str, unit: str, result: Dict[str, Any], base: Dict | None
+) -> None:
+    change = ""
+    if base and base.get("median_s"):
+        change = f"{result['median_s'] / base['median_s'] - 1:+7.1%}"
+    throughput = result["throughput_per_s"] or 0.0
+    print(
+        f"{key:<58} {result['median_s'] * 1000:10.2f} ms {change:>8}"
+        f"  {throughput:14,.0f} {unit}/s  {result['peak_kib']:10,.0f} KiB",
+        flush=True,
+    )
+
+
+def _environment() -> Dict[str, str]:
+    return {"python": platform.python_version(), "machine": platform.node()}
+
+
+def _check_environment(saved: Dict[str, Any]) -> None:
+    """
+    Warns when the baseline was recorded on another machine or Python version, its
+    timings are then not comparable.
+    """
+    for key, current in _environment().items():
+        recorded = saved.get(key)
+        if recorded != current:
+            print(
+                f"WARNING baseline {key} is {recorded}, this run is {current}: "
+                "record a baseline here with --save-baseline before trusting the comparison."
+            )
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the benchmark suite.")
+    parser.add_argument(
+        "--filter", help="Only run benchmarks whose name contains this."
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Allowed slowdown or memory growth against the baseline (0.2 = 20%%).",
+    )
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_FILE)
+    parser.add_argument(
+        "--require-baseline",
+        action="store_true",
+        help="Fail when there is no baseline to compare with, e.g. in CI.",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Record the results as the new baseline instead of comparing.",
+    )
+    parser.add_argument("--output", help="Also write the results to this JSON file.")
+    args = parser.parse_args(argv)
+
+    baseline: Dict[str, Dict[str, Any]] = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        baseline = saved["results"]
+        _check_environment(saved)
+    elif args.require_baseline and not args.save_baseline:
+        print(
+            f"No baseline at {args.baseline}, run with --save-baseline to record one."
+        )
+        return 1
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for bench in BENCHMARKS:
+        if args.filter and args.filter not in bench.name:
+            continue
+
+        for param in bench.params:
+            key = _key(bench.name, param)
+            case = bench.setup(param)
+            try:
+                results[key] = run_case(case, args.repeat)
+            finally:
+                if case.teardown is not None:
+                    case.teardown()
+            _print_result(key, bench.unit, results[key], baseline.get(key))
+
+    report = {
+        **_environment(),
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+
+    if args.save_baseline:
+        # Keep the cases that were filtered out of this run.
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                report["results"] = {**json.load(f)["results"], **results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(
+            f"No baseline at {args.baseline}, run with --save-baseline to record one."
+        )
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
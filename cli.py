@@ -0,0 +1,208 @@
+"""
+Headless access management: grant, revoke, list and copy dashboards, QuickViews and
+document groups for users and departments without opening the GUI.
+
+Usage (from the project root):
+
+    python cli.py grant --department 12 --department 14 --dashboard 7
+    python cli.py revoke --user 1043 --quickview 3 --quickview 5
+    python cli.py grant --batch grants.csv --report results.csv
+    python cli.py apply changes.jsonl --chunk-size 500
+    python cli.py list --user 1043 --type dashboard
+    python cli.py copy --from-user 1043 --to-user 1050 --to-department 3
+
+Batch files are described in scripts/bulk_access.py. One result per row is written
+to --report (JSONL on stdout by default, CSV for a .csv path) and the run's
+throughput is printed to stderr. Exits with 1 if any row failed or was invalid.
+"""
+
+import argparse
+import json
+import sys
+from typing import List
+from scripts import bulk_access
+from scripts.bulk_access import ITEM_TYPES, AccessChange
+
+
+def _item_options(parser: argparse.ArgumentParser) -> None:
+    for name, item_table in ITEM_TYPES.items():
+        parser.add_argument(
+            f"--{name}",
+            action="append",
+            type=int,
+            default=[],
+            dest=item_table,
+            metavar="PK",
+            help=f"{item_table}PK, can be repeated.",
+        )
+
+
+def _type_option(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--type",
+        action="append",
+        choices=list(ITEM_TYPES),
+        dest="item_types",
+        help="Only this item type, can be repeated. Defaults to every type.",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Manage dashboard, QuickView and document group access in bulk."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_options = argparse.ArgumentParser(add_help=False)
+    run_options.add_argument(
+        "--chunk-size",
+        type=int,
+        default=bulk_access.DEFAULT_CHUNK_SIZE,
+        help="User links written per transaction.",
+    )
+    run_options.add_argument(
+        "--report",
+        default="-",
+        help="Where to write the per-row results, - for stdout.",
+    )
+
+    for action in bulk_access.ACTIONS:
+        command = commands.add_parser(
+            action,
+            parents=[run_options],
+            help=f"{action.capitalize()} items for users or departments.",
+        )
+        command.add_argument(
+            "--user", action="append", type=int, default=[], metavar="PK"
+        )
+        command.add_argument(
+            "--department", action="append", type=int, default=[], metavar="PK"
+        )
+        _item_options(command)
+        command.add_argument(
+            "--batch",
+            action="append",
+            default=[],
+            help=f"CSV or JSONL file of rows to {action}, can be repeated.",
+        )
+
+    apply = commands.add_parser(
+        "apply",
+        parents=[run_options],
+        help="Run a batch file whose rows carry their action.",
+    )
+    apply.add_argument("batch", nargs="+", help="CSV or JSONL batch files.")
+
+    listing = commands.add_parser("list", help="List what a user or department has.")
+    source = listing.add_mutually_exclusive_group(required=True)
+    source.add_argument("--user", type=int, metavar="PK")
+    source.add_argument("--department", type=int, metavar="PK")
+    _type_option(listing)
+    listing.add_argument("--json", action="store_true", help="Print JSON lines.")
+
+    copy = commands.add_parser(
+        "copy",
+        parents=[run_options],
+        help="Grant what a user or department has to other users or departments.",
+    )
+    source = copy.add_mutually_exclusive_group(required=True)
+    source.add_argument("--from-user", type=int, metavar="PK")
+    source.add_argument("--from-department", type=int, metavar="PK")
+    copy.add_argument("--to-user", action="append", type=int, default=[], metavar="PK")
+    copy.add_argument(
+        "--to-department", action="append", type=int, default=[], metavar="PK"
+    )
+    _type_option(copy)
+
+    return parser
+
+
+def _changes_from_args(args: argparse.Namespace) -> List[AccessChange]:
+    targets = [("user", pk) for pk in args.user] + [
+        ("department", pk) for pk in args.department
+    ]
+    changes = [
+        AccessChange(args.command, target, target_pk, item_table, item_pk)
+        for target, target_pk in targets
+        for item_table in ITEM_TYPES.values()
+        for item_pk in getattr(args, item_table)
+    ]
+
+    for path in args.batch:
+        changes.extend(bulk_access.read_batch(path, args.command))
+
+    return changes
+
+
+def _run(controller, changes: List[AccessChange], args: argparse.Namespace) -> int:
+    stats = bulk_access.execute(controller, changes, args.chunk_size)
+
+    if args.report == "-":
+        bulk_access.write_report(changes, sys.stdout)
+    else:
+        file_format = "csv" if args.report.lower().endswith(".csv") else "jsonl"
+        with open(args.report, "w", newline="", encoding="utf-8") as f:
+            bulk_access.write_report(changes, f, file_format)
+
+    print(json.dumps(stats.to_dict(), indent=4), file=sys.stderr)
+
+    return 1 if stats.statuses.get("failed") or stats.statuses.get("invalid") else 0
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if getattr(args, "chunk_size", 1) < 1:
+        parser.error("--chunk-size must be at least 1")
+    if args.command == "copy" and not args.to_user and not args.to_department:
+        parser.error("copy needs at least one --to-user or --to-department")
+
+    item_tables = None
+    if getattr(args, "item_types", None):
+        item_tables = [ITEM_TYPES[name] for name in args.item_types]
+
+    if args.command in bulk_access.ACTIONS:
+        changes = _changes_from_args(args)
+        if not changes:
+            parser.error(
+                f"nothing to {args.command}, give targets and items or --batch"
+            )
+
+    # Imported here so usage errors do not open the department store.
+    from scripts.controller import Controller
+
+    controller = Controller()
+
+    if args.command == "list":
+        target = "user" if args.user is not None else "department"
+        target_pk = args.user if args.user is not None else args.department
+        rows = bulk_access.list_access(controller, target, target_pk, item_tables)
+        for row in rows:
+            if args.json:
+                print(json.dumps(row))
+            else:
+                print(f"{row['item_type']}\t{row['item_pk']}\t{row['label']}")
+        return 0
+
+    if args.command == "copy":
+        source = "user" if args.from_user is not None else "department"
+        source_pk = (
+            args.from_user if args.from_user is not None else args.from_department
+        )
+        targets = [("user", pk) for pk in args.to_user] + [
+            ("department", pk) for pk in args.to_department
+        ]
+        changes = bulk_access.copy_changes(
+            controller, source, source_pk, targets, item_tables
+        )
+    elif args.command == "apply":
+        changes = []
+        for path in args.batch:
+            changes.extend(bulk_access.read_batch(path))
+
+    return _run(controller, changes, args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
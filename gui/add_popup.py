@@ -1,239 +1,305 @@
-import tkinter as tk
-from tkinter import ttk
-from typing import Dict
-from gui.utils import gui_error_handler
-from gui.vacation_request import center_window
-from scripts import mie_trak_funcs
-from base_logger import getlogger
-
-
-LOGGER = getlogger("Add View")
-
-
-class AddView(tk.Toplevel):
-    """
-    Initializes the window for managing dashboards and quickviews.
-
-    This constructor sets up the interface for assigning dashboards and quickviews to
-    either a department or a user. It:
-
-    - Initializes attributes related to the controller, callback function, and entity identifiers.
-    - Configures the window appearance and dimensions.
-    - Retrieves all available dashboards and quickviews from the system.
-    - Removes dashboards and quickviews that have already been assigned to the selected
-      department or user to prevent duplicate assignments.
-    - Calls `build_widgets()` to construct the UI elements.
-
-    Parameters:
-        title (str): The title of the window.
-        controller: The application controller handling business logic.
-        call_back_update: A callback function to update data after modifications.
-        department_pk (int | None, optional): The primary key of the selected department.
-        user_pk (int | None, optional): The primary key of the selected user.
-    """
-
-    def __init__(
-        self,
-        title: str,
-        controller,
-        call_back_update,
-        department_pk: int | None = None,
-        user_pk: int | None = None,
-    ) -> None:
-        super().__init__()
-        self.call_back_update = call_back_update
-        self.controller = controller
-        self.department_pk = department_pk
-        self.user_pk = user_pk
-
-        self._setup_window(title)
-        self._initialize_data()
-        self._remove_assigned_items()
-        self.build_widgets()
-
-    def _setup_window(self, title: str) -> None:
-        """
-        Configures the window settings, including size, title, and background.
-        """
-        self.title(title)
-        center_window(self, width=1000, height=500)
-        self.configure(bg="#f4f4f4")  # Light gray background
-        self.resizable(True, True)
-
-    @gui_error_handler
-    def _initialize_data(self) -> None:
-        """
-        Fetches all dashboards and quickviews from the system.
-        """
-        self.dashboards_dict = mie_trak_funcs.get_all_dashboards()
-        self.quickviews_dict = mie_trak_funcs.get_all_quickviews()
-        self.document_groups_dict = mie_trak_funcs.get_all_document_groups()
-
-    def _remove_assigned_items(self) -> None:
-        """
-        Removes dashboards and quickviews that are already assigned to the selected user or department.
-        """
-        if self.department_pk:
-            self._remove_department_assigned_items()
-        elif self.user_pk:
-            self._remove_user_assigned_items()
-        else:
-            raise ValueError("Either department_pk or user_pk must be provided.")
-
-    def _remove_department_assigned_items(self) -> None:
-        """
-        Removes dashboards and quickviews already assigned to the selected department.
-        """
-        department_data = self.controller.cache_dict.get(self.department_pk, {})
-        accessed_dashboards = department_data.get("accessed_dashboards", {})
-        accessed_quickviews = department_data.get("accessed_quickviews", {})
-
-        for dashboard_pk in accessed_dashboards.keys():
-            self.dashboards_dict.pop(dashboard_pk, None)
-
-        for quickview_pk in accessed_quickviews.keys():
-            self.quickviews_dict.pop(quickview_pk, None)
-
-    @gui_error_handler
-    def _remove_user_assigned_items(self) -> None:
-        """
-        Removes dashboards and quickviews already assigned to the selected user.
-        """
-        user_dashboards = mie_trak_funcs.get_user_dashboards(self.user_pk)
-        user_quickviews = mie_trak_funcs.get_user_quick_view(self.user_pk)
-        user_document_groups = mie_trak_funcs.get_user_document_groups(self.user_pk)
-
-        for dashboard_pk in user_dashboards.keys():
-            self.dashboards_dict.pop(dashboard_pk, None)
-
-        for quickview_pk in user_quickviews.keys():
-            self.quickviews_dict.pop(quickview_pk, None)
-
-        for doc_group_pk in user_document_groups.keys():
-            self.document_groups_dict.pop(doc_group_pk, None)
-
-    def build_widgets(self) -> None:
-        self.columnconfigure(0, weight=1)
-        self.columnconfigure(1, weight=1)
-        self.columnconfigure(2, weight=1)  # Add a third column for document groups
-        self.rowconfigure(1, weight=1)
-
-        dashboard_label = ttk.Label(self, text="Dashboards", font=("Arial", 12, "bold"))
-        dashboard_label.grid(row=0, column=0, pady=(10, 5), padx=10, sticky="w")
-
-        quickview_label = ttk.Label(self, text="Quickviews", font=("Arial", 12, "bold"))
-        quickview_label.grid(row=0, column=1, pady=(10, 5), padx=10, sticky="w")
-
-        document_group_label = ttk.Label(
-            self, text="Document Groups", font=("Arial", 12, "bold")
-        )
-        document_group_label.grid(row=0, column=2, pady=(10, 5), padx=10, sticky="w")
-
-        left_frame = ttk.Frame(self, padding=10)
-        left_frame.grid(row=1, column=0, sticky="nsew", padx=10, pady=5)
-
-        middle_frame = ttk.Frame(self, padding=10)
-        middle_frame.grid(row=1, column=1, sticky="nsew", padx=10, pady=5)
-
-        right_frame = ttk.Frame(self, padding=10)
-        right_frame.grid(row=1, column=2, sticky="nsew", padx=10, pady=5)
-
-        self.dashboard_listbox = tk.Listbox(
-            left_frame, selectmode=tk.MULTIPLE, exportselection=False, height=10
-        )
-        self.dashboard_listbox.pack(fill="both", expand=True)
-
-        self.quickview_listbox = tk.Listbox(
-            middle_frame, selectmode=tk.MULTIPLE, exportselection=False, height=10
-        )
-        self.quickview_listbox.pack(fill="both", expand=True)
-
-        self.document_group_listbox = tk.Listbox(
-            right_frame, selectmode=tk.MULTIPLE, exportselection=False, height=10
-        )
-        self.document_group_listbox.pack(fill="both", expand=True)
-
-        self.populate_list(self.dashboard_listbox, self.dashboards_dict)
-        self.populate_list(self.quickview_listbox, self.quickviews_dict)
-        self.populate_list(self.document_group_listbox, self.document_groups_dict)
-
-        button_frame = ttk.Frame(self)
-        button_frame.grid(
-            row=2, column=0, columnspan=3, pady=10, sticky="sew"
-        )  # Adjust columnspan
-        button_frame.columnconfigure(0, weight=1)
-        button_frame.columnconfigure(1, weight=1)
-
-        confirm_button = ttk.Button(
-            button_frame, text="Confirm", command=self.confirm_selection
-        )
-        confirm_button.grid(row=0, column=0, padx=5, sticky="ew")
-
-        cancel_button = ttk.Button(button_frame, text="Cancel", command=self.destroy)
-        cancel_button.grid(row=0, column=1, padx=5, sticky="ew")
-
-    def populate_list(self, listbox: tk.Listbox, data_dict: Dict[str, str]) -> None:
-        """
-        Populate a given listbox with items.
-        """
-        listbox.delete(0, tk.END)
-        for _, description in data_dict.items():
-            listbox.insert(tk.END, description)
-
-    @gui_error_handler
-    def confirm_selection(self) -> None:
-        """
-        Confirms the selection of dashboards and quickviews, assigning them to the selected user or department.
-
-        This function:
-        - Retrieves the selected dashboards and quickviews from the respective listboxes.
-        - Assigns the selected dashboards and quickviews to either a department or a user based on the provided `department_pk` or `user_pk`.
-        - Calls the appropriate functions to update the database or application state.
-        - Triggers a UI update via `call_back_update` and closes the window.
-
-        If neither `department_pk` nor `user_pk` is provided, the function does nothing.
-        """
-
-        selected_dashboard_indices = self.dashboard_listbox.curselection()
-        selected_quickview_indices = self.quickview_listbox.curselection()
-        selected_document_group_indices = self.document_group_listbox.curselection()
-
-        selected_dashboards = [
-            list(self.dashboards_dict.keys())[i] for i in selected_dashboard_indices
-        ]
-        selected_quickviews = [
-            list(self.quickviews_dict.keys())[i] for i in selected_quickview_indices
-        ]
-        selected_document_groups = [
-            list(self.document_groups_dict.keys())[i]
-            for i in selected_document_group_indices
-        ]
-
-        if self.department_pk:
-            for dashboard_pk in selected_dashboards:
-                self.controller.add_dashboard_to_department(
-                    self.department_pk, dashboard_pk
-                )
-
-            for quickview_pk in selected_quickviews:
-                self.controller.add_quickview_to_department(
-                    self.department_pk, quickview_pk
-                )
-
-            for doc_group_pk in selected_document_groups:
-                self.controller.add_doc_group_to_department(
-                    self.department_pk, doc_group_pk
-                )
-
-        elif self.user_pk:
-            for dashboard_pk in selected_dashboards:
-                mie_trak_funcs.add_dashboard_to_user(dashboard_pk, self.user_pk)
-
-            for quickview_pk in selected_quickviews:
-                mie_trak_funcs.add_quickview_to_user(quickview_pk, self.user_pk)
-
-            for doc_group_pk in selected_document_groups:
-                mie_trak_funcs.add_document_group_to_user(doc_group_pk, self.user_pk)
-
-        self.call_back_update(event=None)  # Update main UI
-        self.destroy()
+import tkinter as tk
+from tkinter import ttk
+from tkinter import messagebox
+from typing import Dict, List
+from gui.utils import gui_error_handler
+from gui.task_runner import TaskRunner
+from gui.virtual_list import VirtualListbox
+from gui.list_model import ListModel
+from gui.search_entry import SearchEntry
+from gui.vacation_request import center_window
+from scripts import mie_trak_funcs
+from scripts.search_index import SearchIndex
+from base_logger import getlogger
+
+
+LOGGER = getlogger("Add View")
+
+
+class AddView(tk.Toplevel):
+    """
+    Initializes the window for managing dashboards and quickviews.
+
+    This constructor sets up the interface for assigning dashboards and quickviews to
+    either a department or a user. It:
+
+    - Initializes attributes related to the controller, callback function, and entity identifiers.
+    - Configures the window appearance and dimensions.
+    - Calls `build_widgets()` to construct the UI elements.
+    - Retrieves all available dashboards and quickviews from the system in the background.
+    - Removes dashboards and quickviews that have already been assigned to the selected
+      department or user to prevent duplicate assignments.
+
+    Parameters:
+        title (str): The title of the window.
+        controller: The application controller handling business logic.
+        call_back_update: A callback function to update data after modifications.
+        task_runner (TaskRunner): Runs the database work off the Tk thread.
+        department_pk (int | None, optional): The primary key of the selected department.
+        user_pk (int | None, optional): The primary key of the selected user.
+    """
+
+    def __init__(
+        self,
+        title: str,
+        controller,
+        call_back_update,
+        task_runner: TaskRunner,
+        department_pk: int | None = None,
+        user_pk: int | None = None,
+    ) -> None:
+        super().__init__()
+        self.call_back_update = call_back_update
+        self.controller = controller
+        self.task_runner = task_runner
+        self.department_pk = department_pk
+        self.user_pk = user_pk
+
+        self.dashboards_dict: Dict[str, str] = {}
+        self.quickviews_dict: Dict[str, str] = {}
+        self.document_groups_dict: Dict[str, str] = {}
+        # Search index of each listbox, built with the data.
+        self.search_indexes: Dict[VirtualListbox, SearchIndex] = {}
+
+        self._setup_window(title)
+        self.build_widgets()
+
+        self.task_runner.submit(self._load_data, on_success=self._show_data)
+
+    def _setup_window(self, title: str) -> None:
+        """
+        Configures the window settings, including size, title, and background.
+        """
+        self.title(title)
+        center_window(self, width=1000, height=500)
+        self.configure(bg="#f4f4f4")  # Light gray background
+        self.resizable(True, True)
+
+    def _load_data(self) -> None:
+        """
+        Runs in the background. Fetches the selectable items, drops the ones already
+        assigned and indexes the rest for the search entries.
+        """
+        self._initialize_data()
+        self._remove_assigned_items()
+        self.search_indexes = {
+            self.dashboard_listbox: SearchIndex(self.dashboards_dict.values()),
+            self.quickview_listbox: SearchIndex(self.quickviews_dict.values()),
+            self.document_group_listbox: SearchIndex(
+                self.document_groups_dict.values()
+            ),
+        }
+
+    def _show_data(self, _) -> None:
+        """
+        Fills the listboxes once the data is loaded and enables confirming.
+        """
+        if not self.winfo_exists():
+            return
+
+        self.populate_list(self.dashboard_listbox, self.dashboards_dict)
+        self.populate_list(self.quickview_listbox, self.quickviews_dict)
+        self.populate_list(self.document_group_listbox, self.document_groups_dict)
+        for listbox, search_entry in self.search_entries.items():
+            self.filter_list(listbox, search_entry.get())
+        self.confirm_button.config(state="normal")
+
+    def _initialize_data(self) -> None:
+        """
+        Fetches all dashboards and quickviews from the system.
+        """
+        self.dashboards_dict = mie_trak_funcs.get_all_dashboards()
+        self.quickviews_dict = mie_trak_funcs.get_all_quickviews()
+        self.document_groups_dict = mie_trak_funcs.get_all_document_groups()
+
+    def _remove_assigned_items(self) -> None:
+        """
+        Removes dashboards and quickviews that are already assigned to the selected user or department.
+        """
+        if self.department_pk:
+            self._remove_department_assigned_items()
+        elif self.user_pk:
+            self._remove_user_assigned_items()
+        else:
+            raise ValueError("Either department_pk or user_pk must be provided.")
+
+    def _remove_department_assigned_items(self) -> None:
+        """
+        Removes items every member of the selected department already holds, using the
+        access derived from the link tables like the main window does.
+
+        Items only some members hold stay selectable, labelled with their coverage,
+        so the grant can be completed for the rest of the department.
+        """
+        department_access = self.controller.get_department_access().get(
+            int(self.department_pk)
+        )
+        if not department_access:
+            return
+
+        items_dicts = {
+            "Dashboard": self.dashboards_dict,
+            "QuickView": self.quickviews_dict,
+            "DocumentGroup": self.document_groups_dict,
+        }
+        for item_table, items in items_dicts.items():
+            for item_pk in department_access["full"][item_table]:
+                items.pop(item_pk, None)
+
+            partial = department_access["partial"][item_table]
+            for item_pk, (label, coverage) in partial.items():
+                if item_pk in items:
+                    items[item_pk] = f"{label} ({coverage:.0%} of members)"
+
+    def _remove_user_assigned_items(self) -> None:
+        """
+        Removes dashboards and quickviews already assigned to the selected user, using the permission matrix.
+        """
+        permissions = self.controller.permissions
+        permissions.ensure_loaded()
+
+        for dashboard_pk in permissions.items_for_user("Dashboard", self.user_pk):
+            self.dashboards_dict.pop(str(dashboard_pk), None)
+
+        for quickview_pk in permissions.items_for_user("QuickView", self.user_pk):
+            self.quickviews_dict.pop(str(quickview_pk), None)
+
+        for doc_group_pk in permissions.items_for_user("DocumentGroup", self.user_pk):
+            self.document_groups_dict.pop(str(doc_group_pk), None)
+
+    def build_widgets(self) -> None:
+        self.columnconfigure(0, weight=1)
+        self.columnconfigure(1, weight=1)
+        self.columnconfigure(2, weight=1)  # Add a third column for document groups
+        self.rowconfigure(1, weight=1)
+
+        dashboard_label = ttk.Label(self, text="Dashboards", font=("Arial", 12, "bold"))
+        dashboard_label.grid(row=0, column=0, pady=(10, 5), padx=10, sticky="w")
+
+        quickview_label = ttk.Label(self, text="Quickviews", font=("Arial", 12, "bold"))
+        quickview_label.grid(row=0, column=1, pady=(10, 5), padx=10, sticky="w")
+
+        document_group_label = ttk.Label(
+            self, text="Document Groups", font=("Arial", 12, "bold")
+        )
+        document_group_label.grid(row=0, column=2, pady=(10, 5), padx=10, sticky="w")
+
+        left_frame = ttk.Frame(self, padding=10)
+        left_frame.grid(row=1, column=0, sticky="nsew", padx=10, pady=5)
+
+        middle_frame = ttk.Frame(self, padding=10)
+        middle_frame.grid(row=1, column=1, sticky="nsew", padx=10, pady=5)
+
+        right_frame = ttk.Frame(self, padding=10)
+        right_frame.grid(row=1, column=2, sticky="nsew", padx=10, pady=5)
+
+        self.dashboard_listbox = VirtualListbox(
+            left_frame, selectmode=tk.MULTIPLE, height=10
+        )
+        self.dashboard_listbox.pack(side="bottom", fill="both", expand=True)
+
+        self.quickview_listbox = VirtualListbox(
+            middle_frame, selectmode=tk.MULTIPLE, height=10
+        )
+        self.quickview_listbox.pack(side="bottom", fill="both", expand=True)
+
+        self.document_group_listbox = VirtualListbox(
+            right_frame, selectmode=tk.MULTIPLE, height=10
+        )
+        self.document_group_listbox.pack(side="bottom", fill="both", expand=True)
+
+        # Type-ahead filter above each list, selections survive refining the search.
+        self.search_entries: Dict[VirtualListbox, SearchEntry] = {}
+        for frame, listbox in (
+            (left_frame, self.dashboard_listbox),
+            (middle_frame, self.quickview_listbox),
+            (right_frame, self.document_group_listbox),
+        ):
+            search_entry = SearchEntry(
+                frame, on_change=lambda query, lb=listbox: self.filter_list(lb, query)
+            )
+            search_entry.pack(side="top", fill="x", pady=(0, 5))
+            self.search_entries[listbox] = search_entry
+
+        button_frame = ttk.Frame(self)
+        button_frame.grid(
+            row=2, column=0, columnspan=3, pady=10, sticky="sew"
+        )  # Adjust columnspan
+        button_frame.columnconfigure(0, weight=1)
+        button_frame.columnconfigure(1, weight=1)
+
+        self.confirm_button = ttk.Button(
+            button_frame,
+            text="Confirm",
+            command=self.confirm_selection,
+            state="disabled",  # enabled once the data is loaded
+        )
+        self.confirm_button.grid(row=0, column=0, padx=5, sticky="ew")
+
+        cancel_button = ttk.Button(button_frame, text="Cancel", command=self.destroy)
+        cancel_button.grid(row=0, column=1, padx=5, sticky="ew")
+
+    def populate_list(self, listbox: VirtualListbox, data_dict: Dict[str, str]) -> None:
+        """
+        Populate a given listbox with items.
+        """
+        listbox.set_model(ListModel.from_dict(data_dict))
+
+    def filter_list(self, listbox: VirtualListbox, query: str) -> None:
+        """
+        Shows only the entries of a listbox matching the search query, best match first.
+        """
+        search_index = self.search_indexes.get(listbox)
+        if search_index is None:
+            return  # Still loading, the query is applied once the data is shown.
+
+        listbox.set_filter(search_index.search(query) if query.strip() else None)
+
+    @gui_error_handler
+    def confirm_selection(self) -> None:
+        """
+        Confirms the selection of dashboards and quickviews, assigning them to the selected user or department.
+
+        This function:
+        - Retrieves the selected dashboards and quickviews from the respective listboxes.
+        - Assigns the whole selection to either a department or a user based on the provided `department_pk` or `user_pk`
+          in a single transaction.
+        - Calls the appropriate functions to update the database or application state.
+        - Triggers a UI update via `call_back_update` and closes the window.
+
+        If neither `department_pk` nor `user_pk` is provided, the function does nothing.
+        The assignment runs in the background, the window closes once it succeeds.
+        """
+
+        selected_items = {
+            "Dashboard": self.dashboard_listbox.selected_pks(),
+            "QuickView": self.quickview_listbox.selected_pks(),
+            "DocumentGroup": self.document_group_listbox.selected_pks(),
+        }
+
+        self.confirm_button.config(state="disabled")
+        self.task_runner.submit(
+            self._assign_items,
+            selected_items,
+            on_success=self._on_assigned,
+            on_error=self._on_assign_error,
+            serial=True,
+        )
+
+    def _assign_items(self, selected_items: Dict[str, List[str]]) -> None:
+        """
+        Runs in the background. Assigns the selection to the department or user.
+        """
+        if self.department_pk:
+            self.controller.add_items_to_department(self.department_pk, selected_items)
+
+        elif self.user_pk:
+            self.controller.add_items_to_user(self.user_pk, selected_items)
+
+    def _on_assigned(self, _) -> None:
+        self.call_back_update(event=None)  # Update main UI
+        self.destroy()
+
+    def _on_assign_error(self, error: Exception) -> None:
+        messagebox.showerror(title="Database Error", message=f"{error}", parent=self)
+        self.confirm_button.config(state="normal")
@@ -1,98 +1,136 @@
-from tkinter import ttk
-import tkinter as tk
-from gui.utils import center_window, gui_error_handler
-from scripts import mie_trak_funcs
-from base_logger import getlogger
-
-
-LOGGER = getlogger("Create Doc Group")
-
-
-class CreateDocGroup(tk.Toplevel):
-    def __init__(self, callback):
-        super().__init__()
-
-        self.title("Create Document Group")
-        center_window(self, width=420, height=700)
-        self.configure(bg="#f4f4f4")
-        self.call_back_update = callback
-
-        self._build_widgets()
-
-    def _build_widgets(self):
-        # Grid Configuration
-        self.columnconfigure(0, weight=1)
-        self.columnconfigure(1, weight=1)
-        self.rowconfigure(1, weight=0)  # Listbox expands
-        self.rowconfigure(2, weight=1)  # Buttons row
-        self.rowconfigure(3, weight=0)
-
-        # Code Entry
-        self.code_label = ttk.Label(self, text="Code:")
-        self.code_label.grid(row=0, column=0, padx=10, pady=5, sticky="ew")
-        self.code_entry = ttk.Entry(self)
-        self.code_entry.grid(row=0, column=1, padx=10, pady=5, sticky="ew")
-
-        # Name Entry
-        self.name_label = ttk.Label(self, text="Name:")
-        self.name_label.grid(row=0, column=2, padx=10, pady=5, sticky="w")
-        self.name_entry = ttk.Entry(self)
-        self.name_entry.grid(row=0, column=3, padx=10, pady=5, sticky="ew")
-
-        # Listbox
-        self.listbox = tk.Listbox(self, selectmode="multiple", exportselection=False)
-
-        # Listbox Heading
-        self.listbox_label = ttk.Label(
-            self, text="Select Users for Document Group", font=("Arial", 10, "bold")
-        )
-        self.listbox_label.grid(
-            row=1, column=0, columnspan=4, padx=10, pady=(5, 0), sticky="w"
-        )
-
-        # Adjust Listbox Row
-        self.listbox.grid(row=2, column=0, columnspan=4, padx=10, pady=5, sticky="nsew")
-
-        self.users = mie_trak_funcs.get_user_data()
-
-        # Populate Listbox
-        for firstname, lastname in self.users.values():
-            self.listbox.insert(tk.END, f"{firstname} {lastname}")
-
-        # Button Frame
-        self.button_frame = tk.Frame(self, bg="#f4f4f4")
-        self.button_frame.grid(row=3, column=0, columnspan=4, pady=10, sticky="ew")
-
-        self.button_frame.columnconfigure(0, weight=1)
-        self.button_frame.columnconfigure(1, weight=1)
-
-        # Confirm Button
-        self.confirm_button = ttk.Button(
-            self.button_frame, text="Confirm", command=self.confirm
-        )
-        self.confirm_button.grid(row=0, column=0, padx=10, sticky="ew")
-
-        # Cancel Button
-        self.cancel_button = ttk.Button(
-            self.button_frame, text="Cancel", command=self.destroy
-        )
-        self.cancel_button.grid(row=0, column=1, padx=10, sticky="ew")
-
-    @gui_error_handler
-    def confirm(self):
-        new_code = self.code_entry.get()
-        new_name = self.name_entry.get()
-
-        selected_user_indices = self.listbox.curselection()
-
-        selected_users_pks = [
-            list(self.users.keys())[idx] for idx in selected_user_indices
-        ]
-
-        inserted_doc_group_pk = mie_trak_funcs.create_document_group(new_code, new_name)
-
-        for userpk in selected_users_pks:
-            mie_trak_funcs.add_document_group_to_user(inserted_doc_group_pk, userpk)
-
-        self.call_back_update(event=None)
-        self.destroy()
+from tkinter import ttk
+import tkinter as tk
+from tkinter import messagebox
+from typing import List
+from gui.utils import center_window, gui_error_handler
+from gui.task_runner import TaskRunner
+from gui.virtual_list import VirtualListbox
+from gui.list_model import ListModel
+from scripts import mie_trak_funcs
+from base_logger import getlogger
+
+
+LOGGER = getlogger("Create Doc Group")
+
+
+class CreateDocGroup(tk.Toplevel):
+    def __init__(self, callback, controller, task_runner: TaskRunner):
+        super().__init__()
+
+        self.title("Create Document Group")
+        center_window(self, width=420, height=700)
+        self.configure(bg="#f4f4f4")
+        self.call_back_update = callback
+        self.controller = controller
+        self.task_runner = task_runner
+        self.users = {}
+
+        self._build_widgets()
+
+        self.task_runner.submit(
+            mie_trak_funcs.get_user_data, on_success=self._show_users
+        )
+
+    def _build_widgets(self):
+        # Grid Configuration
+        self.columnconfigure(0, weight=1)
+        self.columnconfigure(1, weight=1)
+        self.rowconfigure(1, weight=0)  # Listbox expands
+        self.rowconfigure(2, weight=1)  # Buttons row
+        self.rowconfigure(3, weight=0)
+
+        # Code Entry
+        self.code_label = ttk.Label(self, text="Code:")
+        self.code_label.grid(row=0, column=0, padx=10, pady=5, sticky="ew")
+        self.code_entry = ttk.Entry(self)
+        self.code_entry.grid(row=0, column=1, padx=10, pady=5, sticky="ew")
+
+        # Name Entry
+        self.name_label = ttk.Label(self, text="Name:")
+        self.name_label.grid(row=0, column=2, padx=10, pady=5, sticky="w")
+        self.name_entry = ttk.Entry(self)
+        self.name_entry.grid(row=0, column=3, padx=10, pady=5, sticky="ew")
+
+        # Listbox
+        self.listbox = VirtualListbox(self, selectmode="multiple")
+
+        # Listbox Heading
+        self.listbox_label = ttk.Label(
+            self, text="Select Users for Document Group", font=("Arial", 10, "bold")
+        )
+        self.listbox_label.grid(
+            row=1, column=0, columnspan=4, padx=10, pady=(5, 0), sticky="w"
+        )
+
+        # Adjust Listbox Row
+        self.listbox.grid(row=2, column=0, columnspan=4, padx=10, pady=5, sticky="nsew")
+
+        # Button Frame
+        self.button_frame = tk.Frame(self, bg="#f4f4f4")
+        self.button_frame.grid(row=3, column=0, columnspan=4, pady=10, sticky="ew")
+
+        self.button_frame.columnconfigure(0, weight=1)
+        self.button_frame.columnconfigure(1, weight=1)
+
+        # Confirm Button
+        self.confirm_button = ttk.Button(
+            self.button_frame, text="Confirm", command=self.confirm
+        )
+        self.confirm_button.grid(row=0, column=0, padx=10, sticky="ew")
+
+        self.confirm_button.config(state="disabled")  # enabled once users are loaded
+
+        # Cancel Button
+        self.cancel_button = ttk.Button(
+            self.button_frame, text="Cancel", command=self.destroy
+        )
+        self.cancel_button.grid(row=0, column=1, padx=10, sticky="ew")
+
+    def _show_users(self, users):
+        if not self.winfo_exists():
+            return
+
+        self.users = users
+
+        # Populate Listbox
+        self.listbox.set_model(
+            ListModel.from_dict(self.users, label=lambda name: f"{name[0]} {name[1]}")
+        )
+
+        self.confirm_button.config(state="normal")
+
+    @gui_error_handler
+    def confirm(self):
+        new_code = self.code_entry.get()
+        new_name = self.name_entry.get()
+
+        selected_users_pks = self.listbox.selected_pks()
+
+        self.confirm_button.config(state="disabled")
+        self.task_runner.submit(
+            self._create_doc_group,
+            new_code,
+            new_name,
+            selected_users_pks,
+            on_success=self._on_created,
+            on_error=self._on_create_error,
+            serial=True,
+        )
+
+    def _create_doc_group(self, code: str, name: str, user_pks: List[int]) -> int:
+        """Runs in the background. Creates the document group and assigns it to the users."""
+        inserted_doc_group_pk = mie_trak_funcs.create_document_group(code, name)
+
+        self.controller.add_items_to_users(
+            user_pks, {"DocumentGroup": [inserted_doc_group_pk]}
+        )
+
+        return inserted_doc_group_pk
+
+    def _on_created(self, _):
+        self.call_back_update(event=None)
+        self.destroy()
+
+    def _on_create_error(self, error: Exception):
+        messagebox.showerror(title="Database Error", message=f"{error}", parent=self)
+        self.confirm_button.config(state="normal")
@@ -0,0 +1,88 @@
+from typing import Any, Callable, Dict, Iterable, List
+
+
+class ListModel:
+    """
+    The rows behind a `VirtualListbox`: parallel lists of primary keys and labels.
+
+    Row ``i`` of the listbox shows ``labels[i]`` and stands for ``pks[i]``, so a
+    selection resolves to its primary keys by indexing instead of rebuilding the key
+    list of a dictionary per selected row. The listbox updates both lists together
+    when entries are inserted or deleted.
+
+    :param pks: The primary key of every row.
+    :type pks: Iterable
+    :param labels: The text shown for every row, aligned with ``pks``.
+    :type labels: Iterable[str]
+    """
+
+    __slots__ = ("pks", "labels", "_rows")
+
+    def __init__(self, pks: Iterable = (), labels: Iterable[str] = ()) -> None:
+        self.pks: List[Any] = list(pks)
+        self.labels: List[str] = list(labels)
+        if len(self.pks) != len(self.labels):
+            raise ValueError(
+                f"{len(self.pks)} primary keys for {len(self.labels)} labels"
+            )
+        self._rows: Dict[Any, int] | None = None  # pk -> row, built on first lookup
+
+    @classmethod
+    def from_dict(
+        cls, data: Dict[Any, Any], label: Callable[[Any], str] = str
+    ) -> "ListModel":
+        """
+        Builds the model of a ``{pk: value}`` dictionary, in its order.
+
+        :param data: The rows, as returned by the `mie_trak_funcs` getters.
+        :type data: Dict[Any, Any]
+        :param label: Turns a value into the text shown for it.
+        :type label: Callable[[Any], str]
+        :rtype: ListModel
+        """
+        return cls(data.keys(), map(label, data.values()))
+
+    @classmethod
+    def from_labels(cls, labels: Iterable[str]) -> "ListModel":
+        """
+        Builds a model whose rows are their own keys, for plain lists of texts.
+        """
+        labels = list(labels)
+        return cls(labels, labels)
+
+    def __len__(self) -> int:
+        return len(self.pks)
+
+    def pk(self, row: int) -> Any:
+        return self.pks[row]
+
+    def pks_at(self, rows: Iterable[int]) -> List[Any]:
+        """
+        Returns the primary keys of ``rows``, e.g. the listbox `curselection`.
+        """
+        pks = self.pks
+        return [pks[row] for row in rows]
+
+    def row_of(self, pk: Any) -> int | None:
+        """
+        Returns the row of ``pk``, None when it is not in the list.
+        """
+        if self._rows is None:
+            self._rows = {pk: row for row, pk in enumerate(self.pks)}
+        return self._rows.get(pk)
+
+    def insert(self, row: int, pks: Iterable, labels: Iterable[str]) -> None:
+        pks, labels = list(pks), list(labels)
+        if len(pks) != len(labels):
+            raise ValueError(f"{len(pks)} primary keys for {len(labels)} labels")
+        self.pks[row:row] = pks
+        self.labels[row:row] = labels
+        self._rows = None
+
+    def delete(self, start: int, stop: int) -> None:
+        """
+        Deletes the rows from ``start`` to ``stop`` inclusive.
+        """
+        del self.pks[start : stop + 1]
+        del self.labels[start : stop + 1]
+        self._rows = None
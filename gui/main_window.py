@@ -1,423 +1,529 @@
-import tkinter as tk
-from tkinter import ttk
-from tkinter import messagebox
-from typing import Dict
-from gui.utils import gui_error_handler
-from gui.vacation_request import VacationRequestsWindow
-from gui.add_popup import AddView
-from gui.login_window import LoginWindow
-from gui.utils import center_window
-from gui.create_doc_group import CreateDocGroup
-from scripts.controller import Controller
-from scripts import mie_trak_funcs
-from base_logger import getlogger
-
-
-LOGGER = getlogger("Main Window")
-
-
-class MainWindow(tk.Tk):
-    """Main application window for a simple Tkinter GUI."""
-
-    def __init__(self):
-        """
-        Initializes the main window of the application.
-
-        If the user is not logged in, a login window is displayed, and the main window remains hidden.
-        If login is successful, the main window is configured with various UI components.
-        """
-        super().__init__()
-        self.title("Simple Tkinter GUI")
-        self.configure(bg="#f4f4f4")  # Light grey background
-        center_window(self)
-
-        self.withdraw()
-
-        # Display the login window
-        self.login_status = False
-        self.login_window = LoginWindow(self.login_callback)
-        center_window(self.login_window, width=350, height=275)
-        self.login_window.focus()
-        self.wait_window(self.login_window)  # Wait until the login window is closed
-
-        if self.login_status:
-            self.deiconify()  # Show the main window if login was successful
-            self._configure_layout()
-            self._create_widgets()
-            self.controller = Controller()
-        else:
-            self.destroy()  # Close the application if login fails
-
-    def login_callback(self):
-        self.login_status = True
-
-    def _configure_layout(self):
-        """Configures the grid layout and styles for the main window."""
-        self.columnconfigure(0, weight=1)
-        self.columnconfigure(1, weight=1)
-        self.rowconfigure(1, weight=1)
-        self.rowconfigure(2, weight=0)
-
-        style = ttk.Style()
-        style.configure("TButton", padding=6, relief="flat", font=("Arial", 10))
-        style.configure("TLabel", background="#f4f4f4", font=("Arial", 12))
-        style.configure("TCombobox", padding=5)
-
-    def _create_widgets(self):
-        """Creates and places all widgets in the main window."""
-
-        # Header frame
-        header_frame = tk.Frame(
-            self, bg="#ffffff", padx=20, pady=20, relief="ridge", bd=2
-        )
-        header_frame.grid(
-            row=0, column=0, columnspan=2, sticky="nsew", padx=15, pady=15
-        )
-
-        self.heading = tk.Label(
-            header_frame, text="Doc Control", font=("Arial", 16, "bold"), bg="#ffffff"
-        )
-        self.heading.pack(pady=10)
-
-        # User selection frame
-        self.subframe1 = tk.Frame(self, bg="#f4f4f4")
-        self.subframe1.grid(row=1, column=0, padx=15, pady=5, sticky="nsew")
-        self.subframe1.columnconfigure(0, weight=1)
-        self.subframe1.rowconfigure(1, weight=1)
-
-        # Dashboard access frame
-        self.subframe2 = tk.Frame(self, bg="#f4f4f4")
-        self.subframe2.grid(row=1, column=1, padx=15, pady=5, sticky="nsew")
-        self.subframe2.columnconfigure(0, weight=1)
-        self.subframe2.rowconfigure(1, weight=1)
-
-        # Labels
-        self.users_label = ttk.Label(
-            self.subframe1, text="Users", font=("Arial", 12, "bold")
-        )
-        self.users_label.pack()
-
-        self.dashboards_label = ttk.Label(
-            self.subframe2, text="Accessed Dashboards", font=("Arial", 12, "bold")
-        )
-        self.dashboards_label.pack()
-
-        # Dropdown selection for users or departments
-        self.combo1 = ttk.Combobox(
-            self.subframe1, values=["User", "Department"], state="readonly"
-        )
-        self.combo1.pack(pady=5)
-        self.combo1.bind("<<ComboboxSelected>>", self.update_with_users_or_department)
-
-        # Dropdown selection for dashboards or quick views
-        self.combo2 = ttk.Combobox(
-            self.subframe2,
-            values=["Dashboards", "QuickViews", "DocumentGroups"],
-            state="readonly",
-        )
-        self.combo2.pack(pady=5)
-        self.combo2.bind("<<ComboboxSelected>>", self.display_accessed_items)
-        self.combo2.set("Dashboards")  # Default selection
-
-        # Listbox for users or departments
-        self.user_department_listbox = tk.Listbox(
-            self.subframe1, exportselection=False, relief="solid", bd=1
-        )
-        self.user_department_listbox.pack(pady=5, fill="both", expand=True)
-        self.user_department_listbox.bind(
-            "<<ListboxSelect>>", self.display_accessed_items
-        )
-
-        # Listbox for dashboards or quick views
-        self.listbox2 = tk.Listbox(
-            self.subframe2, relief="solid", bd=1, selectmode="multiple"
-        )
-        self.listbox2.pack(pady=5, fill="both", expand=True)
-
-        # Button frame for vacation requests
-        self.button_frame = tk.Frame(self, bg="#f4f4f4")
-        self.button_frame.grid(row=2, column=0, padx=15, pady=5, sticky="nsew")
-        self.button_frame.columnconfigure(0, weight=1)
-        self.button_frame.columnconfigure(1, weight=1)
-        self.button_frame.grid_propagate(False)  # FIX:
-
-        self.vacation_request_button = ttk.Button(
-            self.button_frame,
-            text="Vacation Requests",
-            command=self.open_vacation_request_tab,
-        )
-        self.vacation_request_button.grid(row=0, column=0, padx=10, sticky="EW")
-        #
-        self.create_doc_group_button = ttk.Button(
-            self.button_frame,
-            text="Create Doc Group",
-            command=self.open_create_doc_group_view,
-        )
-        self.create_doc_group_button.grid(row=0, column=1, padx=10, sticky="EW")
-
-        # Button frame for adding/deleting items
-        self.vac_req_btn_frame = tk.Frame(self, bg="#f4f4f4")
-        self.vac_req_btn_frame.grid(row=2, column=1, padx=15, pady=5, sticky="nsew")
-        self.vac_req_btn_frame.columnconfigure(0, weight=1)
-        self.vac_req_btn_frame.columnconfigure(1, weight=1)
-
-        self.add_button = ttk.Button(
-            self.vac_req_btn_frame, text="Add", command=self.add_item
-        )
-        self.add_button.grid(row=0, column=0, padx=10, sticky="EW")
-
-        self.delete_button = ttk.Button(
-            self.vac_req_btn_frame, text="Delete", command=self.delete_item
-        )
-        self.delete_button.grid(row=0, column=1, padx=10, sticky="EW")
-
-    @gui_error_handler
-    def update_with_users_or_department(self, event):
-        """
-        Updates the listbox with users or departments based on the selected option.
-
-        If "User" is selected, it populates the list with user names retrieved from `mie_trak_funcs.get_user_data()`.
-        If "Department" is selected, it populates the list with department names retrieved from `mie_trak_funcs.get_all_departments()`.
-
-        :param event: Event triggered when a selection is made in the user/department dropdown.
-        """
-        self.user_department_listbox.delete(0, tk.END)
-        selection = self.combo1.get()
-
-        if selection == "User":
-            self.users_label.config(text="User")
-
-            self.user_data = mie_trak_funcs.get_user_data()
-            for _, user_info in self.user_data.items():
-                self.user_department_listbox.insert(
-                    tk.END, f"{user_info[0]} {user_info[1]}"
-                )
-        elif selection == "Department":
-            self.users_label.config(text="Department")
-
-            self.department_data = mie_trak_funcs.get_all_departments()
-            for _, name in self.department_data.items():
-                self.user_department_listbox.insert(tk.END, f"{name}")
-
-    @gui_error_handler
-    def display_accessed_items(self, event):
-        """
-        Displays the dashboards or quick views accessed by the selected user or department.
-
-        If a user is selected, retrieves dashboards or quick views associated with the user.
-        If a department is selected, retrieves dashboards or quick views associated with the department from cache (department data.json).
-        Updates `self.listbox2` with the retrieved data.
-
-        :param event: Event triggered when a selection is made in the user/department dropdown or listbox.
-        """
-        self.listbox2.delete(0, tk.END)
-
-        selection = self.user_department_listbox.curselection()
-        if not selection:
-            messagebox.showerror(
-                title="Selection Invalid",
-                message="Please select a User/Department from the list to view accessed itmes",
-            )
-            return
-
-        db_or_qv: str = self.combo2.get()
-        user_or_department = "User" if self.combo1.get() == "User" else "Department"
-
-        self.dashboards_label.config(text=db_or_qv)
-
-        if user_or_department == "User":
-            userpk = list(self.user_data.keys())[selection[0]]
-
-            if db_or_qv == "Dashboards":
-                self.data_to_display = mie_trak_funcs.get_user_dashboards(userpk)
-
-            elif db_or_qv == "QuickViews":
-                self.data_to_display = mie_trak_funcs.get_user_quick_view(userpk)
-
-            elif db_or_qv == "DocumentGroups":
-                self.data_to_display = mie_trak_funcs.get_user_document_groups(userpk)
-
-            else:
-                self.data_to_display = {}
-
-        elif user_or_department == "Department":
-            department_data: Dict = (
-                self.controller.get_department_information_from_cache()
-            )
-            selected_department_pk = list(department_data.keys())[selection[0]]
-
-            accessed_key = f"accessed_{db_or_qv.casefold()}"
-
-            self.data_to_display = department_data.get(selected_department_pk, {}).get(
-                accessed_key, {}
-            )
-
-        else:
-            # message: invalid department
-            self.data_to_display = {}
-
-        # NOTE: self.data_to_dislpay gets reassigned everytime the user clicks on the box on the right.
-        # We then use this data to get the PK of the selections when the user wants to delete something.
-        # refer delete_item function.
-
-        if self.data_to_display:
-            for _, name in self.data_to_display.items():
-                self.listbox2.insert(tk.END, name)
-        else:
-            self.listbox2.insert(tk.END, "N/A")
-
-    def add_item(self):
-        """
-        Opens a window to add a new dashboard or quick view for a selected user or department.
-
-        Retrieves the selected user or department and passes the relevant data to the `AddView` class,
-        allowing the user to add dashboards or quick views.
-
-        Displays an error message if no user or department is selected before clicking the add button.
-        """
-        user_or_department_type = self.combo1.get()
-        department_or_user_selection_index = self.user_department_listbox.curselection()
-
-        if not user_or_department_type or not department_or_user_selection_index:
-            messagebox.showerror(
-                title="Selection Error",
-                message="Please select User/Department first and then make a selection from the list before clicking add.",
-            )
-            return
-
-        department_or_user_selection_index = department_or_user_selection_index[0]
-
-        if user_or_department_type == "User":
-            user_pk = list(self.user_data.keys())[department_or_user_selection_index]
-            AddView(
-                "User",
-                self.controller,
-                self.display_accessed_items,
-                user_pk=user_pk,
-            )
-
-        elif user_or_department_type == "Department":
-            department_data_dict = (
-                self.controller.get_department_information_from_cache()
-            )
-
-            department_pk = list(department_data_dict.keys())[
-                department_or_user_selection_index
-            ]
-            department_name = department_data_dict.get(department_pk, {}).get(
-                "name", {}
-            )
-
-            if not department_name:
-                messagebox.showerror(
-                    title="Department Name Error",
-                    message="Department Name could not be resolved, contact developer.",
-                )
-                return
-
-            AddView(
-                department_name,
-                self.controller,
-                self.display_accessed_items,
-                department_pk=department_pk,
-            )
-
-    @gui_error_handler
-    def delete_item(self):
-        """
-        Deletes the selected dashboard(s) or quickview(s) for a user or department.
-
-        This function first validates user input, ensuring that a user/department type and
-        a selection from the list are provided. It then checks whether dashboards or quickviews
-        have been selected for deletion.
-
-        Depending on the user selection:
-        - If the selected type is "User", it removes the selected dashboards or quickviews
-          from the specified user.
-        - If the selected type is "Department", it removes the selected dashboards or
-          quickviews from the specified department and removes the key from cache.
-
-        Finally, it refreshes the displayed data to reflect the changes.
-        """
-        user_or_department_type = self.combo1.get()
-        department_or_user_selection_index = self.user_department_listbox.curselection()
-
-        if not user_or_department_type or not department_or_user_selection_index:
-            messagebox.showerror(
-                title="Selection Error",
-                message="Please select User/Department first and then make a selection from the list before clicking delete.",
-            )
-            return
-
-        db_or_qv = self.combo2.get()
-        selected_dashboards_or_qv_indices = self.listbox2.curselection()
-
-        if not selected_dashboards_or_qv_indices or not db_or_qv:
-            messagebox.showerror(
-                title="Selection Error",
-                message="Must select dashboards or quickviews to delete",
-            )
-            return
-
-        selection_pks = [  # could be dashboards, quickview or doc groups pks
-            list(self.data_to_display.keys())[idx]
-            for idx in selected_dashboards_or_qv_indices
-        ]
-
-        if user_or_department_type == "User":
-            user_pk = list(self.user_data.keys())[department_or_user_selection_index[0]]
-
-            if db_or_qv == "Dashboards":
-                for dashboard_pk in selection_pks:
-                    mie_trak_funcs.delete_dashboard_from_user(user_pk, dashboard_pk)
-
-            elif db_or_qv == "QuickViews":
-                for quickview_pk in selection_pks:
-                    mie_trak_funcs.delete_quickview_from_user(user_pk, quickview_pk)
-
-            elif db_or_qv == "DocumentGroups":
-                for document_group_pk in selection_pks:
-                    mie_trak_funcs.delete_document_group_from_user(
-                        user_pk, document_group_pk
-                    )
-
-        elif user_or_department_type == "Department":
-            department_data_dict = (
-                self.controller.get_department_information_from_cache()
-            )
-            department_pk = list(department_data_dict.keys())[
-                department_or_user_selection_index[0]
-            ]  # user selected
-
-            if db_or_qv == "Dashboards":
-                for pk in selection_pks:
-                    self.controller.delete_dashboard_from_department(department_pk, pk)
-
-            elif db_or_qv == "QuickViews":
-                for pk in selection_pks:
-                    self.controller.delete_quickview_from_department(department_pk, pk)
-
-            elif db_or_qv == "DocumentGroups":
-                for pk in selection_pks:
-                    self.controller.delete_doc_group_from_department(department_pk, pk)
-
-        # refresh data
-        self.display_accessed_items(None)
-
-    def open_vacation_request_tab(self):
-        """
-        Opens the vacation request management tab.
-
-        This function retrieves all vacation requests, then opens a new window displaying them.
-        It temporarily hides the main window, brings the vacation request window into focus,
-        and waits for it to close before restoring the main window.
-        """
-        data = mie_trak_funcs.get_all_vacation_requests()
-        self.withdraw()
-        self.vacation_request_window = VacationRequestsWindow(self, data)
-        self.vacation_request_window.focus()
-        self.wait_window(self.vacation_request_window)
-        self.deiconify()
-
-    def open_create_doc_group_view(self):
-        CreateDocGroup(self.display_accessed_items)
+import tkinter as tk
+from tkinter import ttk
+from tkinter import messagebox
+from typing import Dict
+from gui.utils import gui_error_handler
+from gui.vacation_request import VacationRequestsWindow
+from gui.add_popup import AddView
+from gui.login_window import LoginWindow
+from gui.utils import center_window
+from gui.create_doc_group import CreateDocGroup
+from gui.task_runner import TaskRunner
+from gui.virtual_list import VirtualListbox
+from gui.list_model import ListModel
+from gui.search_entry import SearchEntry
+from scripts.controller import Controller, close_email_outbox
+from scripts import mie_trak_funcs
+from scripts.request_history import RequestHistory
+from scripts.search_index import SearchIndex
+from base_logger import getlogger
+
+
+LOGGER = getlogger("Main Window")
+
+# Item table behind each option of the dashboards/quickviews combobox.
+ITEM_TABLES = {
+    "Dashboards": "Dashboard",
+    "QuickViews": "QuickView",
+    "DocumentGroups": "DocumentGroup",
+}
+
+
+class MainWindow(tk.Tk):
+    """Main application window for a simple Tkinter GUI."""
+
+    def __init__(self):
+        """
+        Initializes the main window of the application.
+
+        If the user is not logged in, a login window is displayed, and the main window remains hidden.
+        If login is successful, the main window is configured with various UI components.
+        """
+        super().__init__()
+        self.title("Simple Tkinter GUI")
+        self.configure(bg="#f4f4f4")  # Light grey background
+        center_window(self)
+
+        self.withdraw()
+
+        # Display the login window
+        self.login_status = False
+        self.login_window = LoginWindow(self.login_callback)
+        center_window(self.login_window, width=350, height=275)
+        self.login_window.focus()
+        self.wait_window(self.login_window)  # Wait until the login window is closed
+
+        if self.login_status:
+            self.deiconify()  # Show the main window if login was successful
+            self.task_runner = TaskRunner(self)
+            self._configure_layout()
+            self._create_widgets()
+            self.controller = Controller()
+            self.request_history = (
+                None  # Opened with the first vacation request window.
+            )
+            self.protocol("WM_DELETE_WINDOW", self.on_close)
+        else:
+            self.destroy()  # Close the application if login fails
+
+    def login_callback(self):
+        self.login_status = True
+
+    def on_close(self):
+        """Stops the background workers and closes the application."""
+        self.task_runner.shutdown()
+        close_email_outbox()
+        self.destroy()
+
+    def _configure_layout(self):
+        """Configures the grid layout and styles for the main window."""
+        self.columnconfigure(0, weight=1)
+        self.columnconfigure(1, weight=1)
+        self.rowconfigure(1, weight=1)
+        self.rowconfigure(2, weight=0)
+
+        style = ttk.Style()
+        style.configure("TButton", padding=6, relief="flat", font=("Arial", 10))
+        style.configure("TLabel", background="#f4f4f4", font=("Arial", 12))
+        style.configure("TCombobox", padding=5)
+
+    def _create_widgets(self):
+        """Creates and places all widgets in the main window."""
+
+        # Header frame
+        header_frame = tk.Frame(
+            self, bg="#ffffff", padx=20, pady=20, relief="ridge", bd=2
+        )
+        header_frame.grid(
+            row=0, column=0, columnspan=2, sticky="nsew", padx=15, pady=15
+        )
+
+        self.heading = tk.Label(
+            header_frame, text="Doc Control", font=("Arial", 16, "bold"), bg="#ffffff"
+        )
+        self.heading.pack(pady=10)
+
+        # User selection frame
+        self.subframe1 = tk.Frame(self, bg="#f4f4f4")
+        self.subframe1.grid(row=1, column=0, padx=15, pady=5, sticky="nsew")
+        self.subframe1.columnconfigure(0, weight=1)
+        self.subframe1.rowconfigure(1, weight=1)
+
+        # Dashboard access frame
+        self.subframe2 = tk.Frame(self, bg="#f4f4f4")
+        self.subframe2.grid(row=1, column=1, padx=15, pady=5, sticky="nsew")
+        self.subframe2.columnconfigure(0, weight=1)
+        self.subframe2.rowconfigure(1, weight=1)
+
+        # Labels
+        self.users_label = ttk.Label(
+            self.subframe1, text="Users", font=("Arial", 12, "bold")
+        )
+        self.users_label.pack()
+
+        self.dashboards_label = ttk.Label(
+            self.subframe2, text="Accessed Dashboards", font=("Arial", 12, "bold")
+        )
+        self.dashboards_label.pack()
+
+        # Dropdown selection for users or departments
+        self.combo1 = ttk.Combobox(
+            self.subframe1, values=["User", "Department"], state="readonly"
+        )
+        self.combo1.pack(pady=5)
+        self.combo1.bind("<<ComboboxSelected>>", self.update_with_users_or_department)
+
+        # Dropdown selection for dashboards or quick views
+        self.combo2 = ttk.Combobox(
+            self.subframe2,
+            values=["Dashboards", "QuickViews", "DocumentGroups"],
+            state="readonly",
+        )
+        self.combo2.pack(pady=5)
+        self.combo2.bind("<<ComboboxSelected>>", self.display_accessed_items)
+        self.combo2.set("Dashboards")  # Default selection
+
+        # Type-ahead filter for the users or departments
+        self.user_department_search = SearchEntry(
+            self.subframe1, on_change=self._filter_users_or_departments
+        )
+        self.user_department_search.pack(pady=5, fill="x")
+        self.user_department_index = (
+            None  # Built in the background once the list loads.
+        )
+
+        # Listbox for users or departments
+        self.user_department_listbox = VirtualListbox(
+            self.subframe1, relief="solid", bd=1
+        )
+        self.user_department_listbox.pack(pady=5, fill="both", expand=True)
+        self.user_department_listbox.bind(
+            "<<ListboxSelect>>", self.display_accessed_items
+        )
+
+        # Listbox for dashboards or quick views
+        self.listbox2 = VirtualListbox(
+            self.subframe2, relief="solid", bd=1, selectmode="multiple"
+        )
+        self.listbox2.pack(pady=5, fill="both", expand=True)
+
+        # Button frame for vacation requests
+        self.button_frame = tk.Frame(self, bg="#f4f4f4")
+        self.button_frame.grid(row=2, column=0, padx=15, pady=5, sticky="nsew")
+        self.button_frame.columnconfigure(0, weight=1)
+        self.button_frame.columnconfigure(1, weight=1)
+        self.button_frame.grid_propagate(False)  # FIX:
+
+        self.vacation_request_button = ttk.Button(
+            self.button_frame,
+            text="Vacation Requests",
+            command=self.open_vacation_request_tab,
+        )
+        self.vacation_request_button.grid(row=0, column=0, padx=10, sticky="EW")
+        #
+        self.create_doc_group_button = ttk.Button(
+            self.button_frame,
+            text="Create Doc Group",
+            command=self.open_create_doc_group_view,
+        )
+        self.create_doc_group_button.grid(row=0, column=1, padx=10, sticky="EW")
+
+        # Button frame for adding/deleting items
+        self.vac_req_btn_frame = tk.Frame(self, bg="#f4f4f4")
+        self.vac_req_btn_frame.grid(row=2, column=1, padx=15, pady=5, sticky="nsew")
+        self.vac_req_btn_frame.columnconfigure(0, weight=1)
+        self.vac_req_btn_frame.columnconfigure(1, weight=1)
+
+        self.add_button = ttk.Button(
+            self.vac_req_btn_frame, text="Add", command=self.add_item
+        )
+        self.add_button.grid(row=0, column=0, padx=10, sticky="EW")
+
+        self.delete_button = ttk.Button(
+            self.vac_req_btn_frame, text="Delete", command=self.delete_item
+        )
+        self.delete_button.grid(row=0, column=1, padx=10, sticky="EW")
+
+        # Busy indicator, only visible while database work runs in the background
+        self.busy_bar = ttk.Progressbar(self, mode="indeterminate")
+        self.busy_bar.grid(
+            row=3, column=0, columnspan=2, padx=15, pady=(0, 10), sticky="ew"
+        )
+        self.task_runner.add_busy_listener(self._set_busy)
+
+    def _set_busy(self, busy: bool):
+        """Shows and animates the busy indicator while background work is pending."""
+        if busy:
+            self.busy_bar.grid()
+            self.busy_bar.start(15)
+        else:
+            self.busy_bar.stop()
+            self.busy_bar.grid_remove()
+
+    @gui_error_handler
+    def update_with_users_or_department(self, event):
+        """
+        Updates the listbox with users or departments based on the selected option.
+
+        If "User" is selected, it populates the list with user names retrieved from `mie_trak_funcs.get_user_data()`.
+        If "Department" is selected, it populates the list with department names retrieved from `mie_trak_funcs.get_all_departments()`
+        and derives the access of every department from the link tables.
+
+        :param event: Event triggered when a selection is made in the user/department dropdown.
+        """
+        self.user_department_listbox.delete(0, tk.END)
+        self.listbox2.delete(0, tk.END)
+        self.user_department_index = None
+        self.task_runner.cancel("accessed_items")
+        self.task_runner.cancel("user_department_index")
+        selection = self.combo1.get()
+
+        if selection == "User":
+            self.users_label.config(text="User")
+
+            self.task_runner.submit(
+                mie_trak_funcs.get_user_data,
+                on_success=self._show_users,
+                key="users_or_departments",
+            )
+        elif selection == "Department":
+            self.users_label.config(text="Department")
+
+            self.task_runner.submit(
+                mie_trak_funcs.get_all_departments,
+                on_success=self._show_departments,
+                key="users_or_departments",
+            )
+            self.task_runner.submit(
+                self.controller.get_department_access,
+                refresh=True,
+                key="department_access",
+            )
+
+    def _show_users(self, user_data: Dict):
+        self.user_data = user_data
+        self._show_users_or_departments(
+            ListModel.from_dict(
+                self.user_data, label=lambda user_info: f"{user_info[0]} {user_info[1]}"
+            )
+        )
+
+    def _show_departments(self, department_data: Dict):
+        self.department_data = department_data
+        self._show_users_or_departments(ListModel.from_dict(self.department_data))
+
+    def _show_users_or_departments(self, model: ListModel):
+        """Fills the listbox and indexes the labels for the search entry in the background."""
+        self.user_department_listbox.set_model(model)
+        self.task_runner.submit(
+            SearchIndex,
+            model.labels,
+            on_success=self._set_user_department_index,
+            key="user_department_index",
+        )
+
+    def _set_user_department_index(self, index: SearchIndex):
+        self.user_department_index = index
+        # Apply what was typed while the index was being built.
+        self._filter_users_or_departments(self.user_department_search.get())
+
+    def _filter_users_or_departments(self, query: str):
+        """Shows only the users or departments matching the search entry, best match first."""
+        if self.user_department_index is None:
+            return
+
+        if query.strip():
+            self.user_department_listbox.set_filter(
+                self.user_department_index.search(query)
+            )
+        else:
+            self.user_department_listbox.set_filter(None)
+
+    @gui_error_handler
+    def display_accessed_items(self, event):
+        """
+        Displays the dashboards or quick views accessed by the selected user or department.
+
+        If a user is selected, retrieves dashboards or quick views associated with the user.
+        If a department is selected, shows the items held by every member of the department, followed by the
+        items held by only some members with the share of members holding them.
+        The lookup runs in the background, a newer click supersedes a pending one.
+        Updates `self.listbox2` with the retrieved data.
+
+        :param event: Event triggered when a selection is made in the user/department dropdown or listbox.
+        """
+        self.listbox2.delete(0, tk.END)
+
+        selection = self.user_department_listbox.curselection()
+        if not selection:
+            messagebox.showerror(
+                title="Selection Invalid",
+                message="Please select a User/Department from the list to view accessed itmes",
+            )
+            return
+
+        db_or_qv: str = self.combo2.get()
+        user_or_department = "User" if self.combo1.get() == "User" else "Department"
+
+        self.dashboards_label.config(text=db_or_qv)
+
+        if user_or_department == "User":
+            userpk = self.user_department_listbox.model.pk(selection[0])
+
+            self.task_runner.submit(
+                self._fetch_user_items,
+                userpk,
+                db_or_qv,
+                on_success=self._show_accessed_items,
+                key="accessed_items",
+            )
+
+        else:
+            department_pk = self.user_department_listbox.model.pk(selection[0])
+
+            self.task_runner.submit(
+                self._fetch_department_items,
+                department_pk,
+                db_or_qv,
+                on_success=self._show_accessed_items,
+                key="accessed_items",
+            )
+
+    def _fetch_user_items(self, userpk: int, db_or_qv: str) -> Dict:
+        """Runs in the background. Looks up the items of one type accessed by a user in the permission matrix."""
+        item_table = ITEM_TABLES.get(db_or_qv)
+        if not item_table:
+            return {}
+
+        return self.controller.get_user_items(userpk, item_table)
+
+    def _fetch_department_items(self, department_pk: int, db_or_qv: str) -> Dict:
+        """Runs in the background. Fetches the items of one type accessed by a department, derived from the link tables."""
+        item_table = ITEM_TABLES.get(db_or_qv)
+        department_access = self.controller.get_department_access().get(department_pk)
+
+        if not item_table or not department_access:
+            return {}
+
+        items = dict(department_access["full"][item_table])
+
+        partial = sorted(
+            department_access["partial"][item_table].items(),
+            key=lambda item: item[1][1],
+            reverse=True,
+        )
+        for item_pk, (label, coverage) in partial:
+            items[item_pk] = f"{label} ({coverage:.0%} of members)"
+
+        return items
+
+    def _show_accessed_items(self, data_to_display: Dict):
+        # The model keeps the PK of every row, delete_item resolves the selection with it.
+        if data_to_display:
+            self.listbox2.set_model(ListModel.from_dict(data_to_display))
+        else:
+            self.listbox2.set_model(ListModel([None], ["N/A"]))
+
+    def add_item(self):
+        """
+        Opens a window to add a new dashboard or quick view for a selected user or department.
+
+        Retrieves the selected user or department and passes the relevant data to the `AddView` class,
+        allowing the user to add dashboards or quick views.
+
+        Displays an error message if no user or department is selected before clicking the add button.
+        """
+        user_or_department_type = self.combo1.get()
+        department_or_user_selection_index = self.user_department_listbox.curselection()
+
+        if not user_or_department_type or not department_or_user_selection_index:
+            messagebox.showerror(
+                title="Selection Error",
+                message="Please select User/Department first and then make a selection from the list before clicking add.",
+            )
+            return
+
+        department_or_user_selection_index = department_or_user_selection_index[0]
+
+        if user_or_department_type == "User":
+            user_pk = self.user_department_listbox.model.pk(
+                department_or_user_selection_index
+            )
+            AddView(
+                "User",
+                self.controller,
+                self.display_accessed_items,
+                self.task_runner,
+                user_pk=user_pk,
+            )
+
+        elif user_or_department_type == "Department":
+            department_pk = self.user_department_listbox.model.pk(
+                department_or_user_selection_index
+            )
+            department_name = self.department_data.get(department_pk)
+
+            if not department_name:
+                messagebox.showerror(
+                    title="Department Name Error",
+                    message="Department Name could not be resolved, contact developer.",
+                )
+                return
+
+            AddView(
+                department_name,
+                self.controller,
+                self.display_accessed_items,
+                self.task_runner,
+                department_pk=str(department_pk),  # department cache keys are strings
+            )
+
+    @gui_error_handler
+    def delete_item(self):
+        """
+        Deletes the selected dashboard(s) or quickview(s) for a user or department.
+
+        This function first validates user input, ensuring that a user/department type and
+        a selection from the list are provided. It then checks whether dashboards or quickviews
+        have been selected for deletion.
+
+        Depending on the user selection:
+        - If the selected type is "User", it removes the selected dashboards or quickviews
+          from the specified user.
+        - If the selected type is "Department", it removes the selected dashboards or
+          quickviews from the specified department and removes the key from cache.
+
+        Finally, it refreshes the displayed data to reflect the changes.
+        """
+        user_or_department_type = self.combo1.get()
+        department_or_user_selection_index = self.user_department_listbox.curselection()
+
+        if not user_or_department_type or not department_or_user_selection_index:
+            messagebox.showerror(
+                title="Selection Error",
+                message="Please select User/Department first and then make a selection from the list before clicking delete.",
+            )
+            return
+
+        db_or_qv = self.combo2.get()
+        # could be dashboards, quickview or doc groups pks, the "N/A" placeholder has none
+        selection_pks = [pk for pk in self.listbox2.selected_pks() if pk is not None]
+
+        if not selection_pks or not db_or_qv:
+            messagebox.showerror(
+                title="Selection Error",
+                message="Must select dashboards or quickviews to delete",
+            )
+            return
+
+        item_table = ITEM_TABLES.get(db_or_qv)
+
+        if user_or_department_type == "User" and item_table:
+            user_pk = self.user_department_listbox.model.pk(
+                department_or_user_selection_index[0]
+            )
+
+            self.task_runner.submit(
+                self.controller.delete_items_from_user,
+                user_pk,
+                item_table,
+                selection_pks,
+                on_success=lambda _: self.display_accessed_items(None),  # refresh data
+                serial=True,
+            )
+
+        elif user_or_department_type == "Department" and item_table:
+            department_pk = self.user_department_listbox.model.pk(
+                department_or_user_selection_index[0]
+            )  # user selected
+
+            self.task_runner.submit(
+                self.controller.delete_items_from_department,
+                department_pk,
+                item_table,
+                selection_pks,
+                on_success=lambda _: self.display_accessed_items(None),  # refresh data
+                serial=True,
+            )
+
+    def open_vacation_request_tab(self):
+        """
+        Opens the vacation request management tab.
+
+        The window loads its requests in the background, a page at a time.
+        It temporarily hides the main window, brings the vacation request window into focus,
+        and waits for it to close before restoring the main window.
+        """
+        if self.request_history is None:
+            self.request_history = RequestHistory()
+
+        self.withdraw()
+        self.vacation_request_window = VacationRequestsWindow(
+            self, self.task_runner, self.request_history
+        )
+        self.vacation_request_window.focus()
+        self.wait_window(self.vacation_request_window)
+        self.deiconify()
+
+    def open_create_doc_group_view(self):
+        CreateDocGroup(self.display_accessed_items, self.controller, self.task_runner)
@@ -0,0 +1,57 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable
+
+
+class SearchEntry(ttk.Entry):
+    """
+    An entry that reports what the user typed once they pause.
+
+    Every keystroke restarts a short timer, ``on_change`` is only called with the
+    current text when it expires, so a fast typist triggers one search per pause
+    instead of one per character. Escape clears the entry.
+
+    :param master: The parent widget.
+    :param on_change: Called on the Tk thread with the text of the entry.
+    :type on_change: Callable[[str], None]
+    :param delay_ms: How long the text has to stay unchanged before ``on_change`` runs.
+    :type delay_ms: int
+    """
+
+    def __init__(
+        self,
+        master,
+        on_change: Callable[[str], None],
+        delay_ms: int = 150,
+        **entry_kwargs,
+    ) -> None:
+        self.variable = tk.StringVar(master)
+        super().__init__(master, textvariable=self.variable, **entry_kwargs)
+        self.on_change = on_change
+        self.delay_ms = delay_ms
+        self._after_id = None
+        self._last_text = ""
+
+        self.variable.trace_add("write", self._schedule)
+        self.bind("<Escape>", lambda _: self.clear())
+        self.bind("<Destroy>", self._on_destroy, add="+")
+
+    def clear(self) -> None:
+        self.variable.set("")
+
+    def _schedule(self, *_) -> None:
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+        self._after_id = self.after(self.delay_ms, self._fire)
+
+    def _fire(self) -> None:
+        self._after_id = None
+        text = self.variable.get()
+        if text != self._last_text:
+            self._last_text = text
+            self.on_change(text)
+
+    def _on_destroy(self, event) -> None:
+        if event.widget is self and self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
@@ -0,0 +1,202 @@
+import queue
+import tkinter as tk
+from tkinter import messagebox
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+from base_logger import getlogger
+
+
+LOGGER = getlogger("Task Runner")
+
+
+class _Task:
+    __slots__ = ("func", "args", "kwargs", "on_success", "on_error", "key", "serial")
+
+    def __init__(self, func, args, kwargs, on_success, on_error, key, serial):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.on_success = on_success
+        self.on_error = on_error
+        self.key = key
+        self.serial = serial
+
+
+class TaskRunner:
+    """
+    Runs blocking work (database calls, email) off the Tk main thread.
+
+    Work is submitted to a thread pool and its result is handed back on the Tk thread
+    by polling a completion queue with ``after()``, so callbacks can touch widgets.
+    Tasks submitted with the same ``key`` supersede each other: an older task that has
+    not started yet is cancelled, and the result of one that already ran is dropped.
+
+    Writes should be submitted with ``serial=True`` so they run one at a time on a
+    dedicated thread and never interleave with each other.
+
+    :param root: Any widget of the application, used to schedule polling.
+    :type root: tk.Misc
+    :param max_workers: Threads available for concurrent reads.
+    :type max_workers: int
+    :param poll_interval_ms: Milliseconds between completion queue polls while work is pending.
+    :type poll_interval_ms: int
+    """
+
+    def __init__(
+        self, root: tk.Misc, max_workers: int = 4, poll_interval_ms: int = 16
+    ) -> None:
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="db-read")
+        self._serial_executor = ThreadPoolExecutor(1, thread_name_prefix="db-write")
+        self._completed: queue.SimpleQueue = queue.SimpleQueue()
+        self._tasks: Dict[Future, _Task] = {}
+        self._latest: Dict[str, Future] = {}
+        self._busy_listeners: List[Callable[[bool], None]] = []
+        self._busy = False
+        self._poll_id = None
+
+    def submit(
+        self,
+        func: Callable,
+        *args,
+        on_success: Callable[[Any], None] | None = None,
+        on_error: Callable[[Exception], None] | None = None,
+        key: str | None = None,
+        serial: bool = False,
+        **kwargs,
+    ) -> Future:
+        """
+        Runs ``func(*args, **kwargs)`` in the background.
+
+        :param func: The blocking callable to run.
+        :param on_success: Called on the Tk thread with the return value.
+        :param on_error: Called on the Tk thread with the raised exception. Defaults to a
+            retry/cancel dialog for database errors and an error dialog otherwise.
+        :param key: Tasks sharing a key supersede each other, only the latest result is delivered.
+        :param serial: Run on the single writer thread instead of the shared pool.
+        :return: The future of the submitted work.
+        :rtype: Future
+        """
+        task = _Task(func, args, kwargs, on_success, on_error, key, serial)
+        return self._submit(task)
+
+    def cancel(self, key: str) -> None:
+        """
+        Drops the pending task registered under ``key``, if any.
+        """
+        future = self._latest.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def add_busy_listener(self, listener: Callable[[bool], None]) -> None:
+        """
+        Registers a callback notified on the Tk thread when work starts or all work finishes.
+        """
+        self._busy_listeners.append(listener)
+        listener(self._busy)
+
+    def shutdown(self) -> None:
+        """
+        Stops polling and releases the worker threads without waiting for running work.
+        """
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._serial_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, task: _Task) -> Future:
+        if task.key is not None:
+            self.cancel(task.key)
+
+        executor = self._serial_executor if task.serial else self._executor
+        future = executor.submit(task.func, *task.args, **task.kwargs)
+
+        self._tasks[future] = task
+        if task.key is not None:
+            self._latest[task.key] = future
+
+        # done callbacks run on the worker thread, only hand the future over here.
+        future.add_done_callback(self._completed.put)
+
+        self._set_busy(True)
+        self._schedule_poll()
+        return future
+
+    def _schedule_poll(self) -> None:
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.poll_interval_ms, self._poll)
+
+    def _poll(self) -> None:
+        self._poll_id = None
+
+        finished = []
+        while True:
+            try:
+                future = self._completed.get_nowait()
+            except queue.Empty:
+                break
+
+            task = self._tasks.pop(future, None)
+            if task is not None:
+                finished.append((future, task))
+
+        # Reschedule before delivering, a callback may open a modal window and
+        # block this call until it closes.
+        if self._tasks:
+            self._schedule_poll()
+        else:
+            self._set_busy(False)
+
+        for future, task in finished:
+            self._deliver(future, task)
+
+    def _deliver(self, future: Future, task: _Task) -> None:
+        if future.cancelled():
+            return
+
+        if task.key is not None:
+            if self._latest.get(task.key) is not future:
+                return  # superseded by a newer task with the same key
+            del self._latest[task.key]
+
+        error = future.exception()
+        if error is not None:
+            if task.on_error is not None:
+                task.on_error(error)
+            else:
+                self._default_error(task, error)
+            return
+
+        if task.on_success is not None:
+            task.on_success(future.result())
+
+    def _default_error(self, task: _Task, error: BaseException) -> None:
+        """
+        Mirrors `gui_error_handler`: database errors offer a retry, anything else is shown.
+        """
+        if isinstance(error, RuntimeError):  # Raised by `with_db_conn`
+            retry = messagebox.askretrycancel(
+                title="Database Error",
+                message=f"{error}\n\nWould you like to retry?",
+            )
+            if retry:
+                self._submit(task)
+            return
+
+        LOGGER.error(f"Background task {task.func.__name__} failed: {error}")
+        messagebox.showerror(
+            title="Unexpected Error",
+            message=f"An unexpected error occurred:\n\n{error}",
+        )
+
+    def _set_busy(self, busy: bool) -> None:
+        if busy == self._busy:
+            return
+
+        self._busy = busy
+        for listener in self._busy_listeners:
+            listener(busy)
@@ -1,340 +1,696 @@
-import tkinter as tk
-from tkinter import simpledialog
-from tkinter import ttk, messagebox
-from datetime import datetime
-from scripts import mie_trak_funcs
-from scripts.controller import send_email
-from scripts.request_history import RequestHistory
-from base_logger import getlogger
-from typing import Dict, List
-from gui.utils import gui_error_handler, center_window
-
-
-LOGGER = getlogger("VR Window")
-
-
-class VacationRequestsWindow(tk.Toplevel):
-    """
-    A popup window for managing vacation requests, including approval and disapproval.
-    """
-
-    def __init__(self, master, data: List[Dict]):
-        """
-        Initialize the VacationRequestsWindow.
-
-        :param master: The parent widget.
-        :param data: A list of dictionaries containing vacation request details.
-        """
-        super().__init__(master)
-        self.title("Vacation Requests")
-        center_window(self, width=1500)
-
-        self.data = data
-        self.history = RequestHistory()
-
-        self.build_widgets()
-        self.refresh_data()
-
-    def build_widgets(self):
-        """
-        Create and configure widgets for the vacation requests window.
-        """
-        self.heading_label = ttk.Label(
-            self, text="Vacation Requests", font=("Arial", 14, "bold")
-        )
-        self.heading_label.pack(pady=10)
-
-        columns = (
-            "Vacation ID",
-            "Employee",
-            "From Date",
-            "To Date",
-            "Start Time",
-            "Hours",
-            "Reason",
-            "Approved",
-        )
-        self.tree = ttk.Treeview(
-            self, columns=columns, show="headings", height=10, selectmode="extended"
-        )
-
-        for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, anchor="center", width=100)
-
-        self.tree.pack(padx=10, pady=10, fill="both", expand=True)
-
-        button_frame = tk.Frame(self)
-        button_frame.pack(pady=10)
-
-        self.approve_button = ttk.Button(
-            button_frame, text="Approve", command=self.approve_request
-        )
-        self.approve_button.grid(row=0, column=0, padx=10)
-
-        self.disapprove_button = ttk.Button(
-            button_frame, text="Disapprove", command=self.disapprove_request
-        )
-        self.disapprove_button.grid(row=0, column=1, padx=10)
-
-        self.history_button = ttk.Button(
-            button_frame, text="View Past Requests", command=self.open_history_popup
-        )
-        self.history_button.grid(row=0, column=2, padx=10)
-
-        self.tree.bind("<Double-1>", self.on_double_click)
-        self.reason_window_open = False
-
-    def on_double_click(self, event):
-        """
-        Opens a tkinter messagebox with the reason.
-
-        TODO: have a tk.toplevel here so that we can refocus if the window is already open.
-
-        """
-        if self.reason_window_open:
-            return
-
-        selection = self.tree.selection()[0]
-
-        all_items = self.tree.get_children()
-        selected_item_index = all_items.index(selection)
-
-        item = self.data[selected_item_index]
-
-        self.reason_window_open = True
-
-        messagebox.showinfo(
-            title=f"{item['Employee']}: Leave Request Reason",
-            message=item["Reason"],
-        )
-
-        self.reason_window_open = False
-
-    def open_history_popup(self):
-        """
-        Open the history popup displaying past vacation requests.
-        """
-        HistoryPopup(self, self.history)
-
-    def get_selected_request(self):
-        """
-        Retrieve the selected vacation requests from the table.
-
-        :return: List of selected indices if confirmed, otherwise None.
-        """
-        selected_items = self.tree.selection()
-
-        if not selected_items:
-            messagebox.showwarning("No Selection", "Please select a request first.")
-            return
-
-        all_items = self.tree.get_children()
-        selected_indices = [all_items.index(item) for item in selected_items]
-
-        selected_data = [self.data[idx] for idx in selected_indices]
-        confirmation_message = "\n".join(
-            f"Employee: {item['Employee']}, Date: {item['From Date']} to {item['To Date']}, Reason: {item['Reason']}\n\n"
-            for item in selected_data
-        )
-
-        confirm = messagebox.askyesno(
-            "Confirm Selection",
-            f"Are you sure you want to proceed?\n\n{confirmation_message}",
-        )
-        return selected_indices if confirm else None
-
-    @gui_error_handler
-    def approve_request(self):
-        """
-        Approve selected vacation requests and update the history.
-        """
-        selected_indices = self.get_selected_request()
-        if selected_indices:
-            to_approve_requests = [self.data[idx] for idx in selected_indices]
-
-            for row in to_approve_requests:
-                try:
-                    mie_trak_funcs.approve_vacation_request(row.get("Vacation ID"))
-                except Exception as e:
-                    retry = messagebox.askretrycancel(
-                        "Error while approving request", f"An error occurred: {e}"
-                    )
-                    if retry:
-                        self.approve_request()
-                    return
-
-                row["Time Stamp"] = datetime.now().strftime("%Y-%m-%d %I:%M %p")
-                row["Status"] = "Approved"
-                self.history.approved_requests.append(row)
-
-            self.history.write_cache()
-            self.refresh_data()
-
-    @gui_error_handler
-    def disapprove_request(self):
-        """
-        Disapprove selected vacation requests, notify the user, and update history.
-        """
-        selected_indices = self.get_selected_request()
-        if selected_indices:
-            to_disapprove_requests = [self.data[idx] for idx in selected_indices]
-
-            for row in to_disapprove_requests:
-                user_email = mie_trak_funcs.get_user_email_from_vacation_pk(
-                    row["Vacation ID"]
-                )
-                user_body = simpledialog.askstring(
-                    "Disapprove Request", "Add a note to send to the user"
-                )
-                if not user_body:
-                    user_body = "No Note attached"
-                    send = messagebox.askyesno(
-                        "Confirm send email",
-                        f"Confirm email to send.\nBody:\n {user_body}",
-                    )
-                    if send:
-                        send_email(
-                            to=user_email,
-                            subject="Vacation Request Update",
-                            body=user_body,
-                        )
-
-                row["Time Stamp"] = datetime.now().strftime("%Y-%m-%d %I:%M %p")
-                row["Status"] = "Disapproved"
-
-                row["Note"] = f"{row['Time Stamp']}\n{user_body}"
-
-                mie_trak_funcs.update_vacation_request_reason(
-                    row.get("Vacation ID"), row.get("Note")
-                )
-                self.history.disapproved_requests.append(row)
-
-            self.history.write_cache()
-            self.refresh_data()
-
-    @gui_error_handler
-    def refresh_data(self):
-        """
-        Refresh the table data, removing disapproved requests from the view.
-        """
-        self.data = mie_trak_funcs.get_all_vacation_requests()
-        self.tree.delete(*self.tree.get_children())
-
-        disapproved_vacation_pks = [
-            val.get("Vacation ID") for val in self.history.disapproved_requests
-        ]
-        new_data = []
-
-        for row in self.data:
-            if row["Vacation ID"] not in disapproved_vacation_pks:
-                self.tree.insert(
-                    "",
-                    "end",
-                    values=(
-                        row["Vacation ID"],
-                        row["Employee"],
-                        row["From Date"],
-                        row["To Date"],
-                        row["Start Time"],
-                        row["Hours"],
-                        row["Reason"],
-                        row["Approved"],
-                    ),
-                )
-                new_data.append(row)
-
-        self.data = new_data
-
-
-class HistoryPopup(tk.Toplevel):
-    """
-    A popup window displaying past requests with filtering options.
-    """
-
-    def __init__(self, master, history):
-        """
-        Initialize the HistoryPopup window.
-
-        :param master: The parent widget.
-        :param history: An instance of RequestHistory containing past requests.
-        """
-        super().__init__(master)
-        self.title("Past Requests")
-        center_window(self, width=1000, height=500)
-
-        self.history = history
-        self.filter_var = tk.StringVar()
-
-        self.build_widgets()
-        self.update_table()
-
-    def build_widgets(self):
-        """
-        Create and configure all widgets for the popup.
-        """
-        self.heading_label = ttk.Label(
-            self, text="Past Requests", font=("Arial", 14, "bold")
-        )
-        self.heading_label.pack(pady=10)
-
-        self.filter_combobox = ttk.Combobox(
-            self,
-            textvariable=self.filter_var,
-            values=["All", "Approved", "Disapproved"],
-        )
-        self.filter_combobox.current(0)
-        self.filter_combobox.pack(pady=5)
-        self.filter_combobox.bind("<<ComboboxSelected>>", self.update_table)
-
-        columns = (
-            "Vacation ID",
-            "Employee",
-            "From Date",
-            "To Date",
-            "Status",
-            "Updated at",
-            "Note",
-        )
-        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=10)
-
-        for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, anchor="center", width=150)
-
-        self.tree.pack(padx=10, pady=10, fill="both", expand=True)
-
-        self.close_button = ttk.Button(self, text="Close", command=self.destroy)
-        self.close_button.pack(pady=10)
-
-    def update_table(self, event=None):
-        """
-        Update the table based on the selected filter option.
-
-        :param event: The event triggering the update (optional).
-        """
-        selected_filter = self.filter_var.get()
-
-        if selected_filter == "Approved":
-            data = self.history.approved_requests
-        elif selected_filter == "Disapproved":
-            data = self.history.disapproved_requests
-        else:
-            data = self.history.approved_requests + self.history.disapproved_requests
-
-        self.tree.delete(*self.tree.get_children())
-
-        for row in data:
-            self.tree.insert(
-                "",
-                "end",
-                values=(  # to add default values maybe
-                    row.get("Vacation ID", None),
-                    row.get("Employee", None),
-                    row.get("From Date", None),
-                    row.get("To Date", None),
-                    row.get("Status", None),
-                    row.get("Time Stamp", None),
-                    row.get("Note", None),
-                ),
-            )
+import tkinter as tk
+from tkinter import simpledialog
+from tkinter import ttk, messagebox
+from datetime import datetime
+from scripts import mie_trak_funcs
+from scripts.controller import send_email
+from scripts.request_history import RequestHistory
+from base_logger import getlogger
+from typing import Dict, List
+from gui.utils import gui_error_handler, center_window
+from gui.task_runner import TaskRunner
+
+
+LOGGER = getlogger("VR Window")
+
+# Milliseconds between background checks for new or changed requests.
+POLL_INTERVAL_MS = 30_000
+
+
+class VacationRequestsWindow(tk.Toplevel):
+    """
+    A popup window for managing vacation requests, including approval and disapproval.
+
+    Pending requests are read a page at a time, the next page being fetched when the
+    table is scrolled near its end.
+    """
+
+    PAGE_SIZE = 100
+
+    def __init__(
+        self,
+        master,
+        task_runner: TaskRunner,
+        history: RequestHistory | None = None,
+    ):
+        """
+        Initialize the VacationRequestsWindow.
+
+        :param master: The parent widget.
+        :param task_runner: Runs the database work off the Tk thread.
+        :param history: The request history, opened here when None.
+        """
+        super().__init__(master)
+        self.title("Vacation Requests")
+        center_window(self, width=1500)
+
+        self.task_runner = task_runner
+        self.history = history if history is not None else RequestHistory()
+        self.filters: Dict = {}
+        # Shown requests keyed by VacationRequestPK, which is also their Treeview iid.
+        self.rows: Dict[int, Dict] = {}
+        self._poll_id = None
+
+        self.build_widgets()
+        self.reload()
+        self._schedule_poll()
+
+        self.bind("<Destroy>", self._on_destroy)
+
+    def build_widgets(self):
+        """
+        Create and configure widgets for the vacation requests window.
+        """
+        self.heading_label = ttk.Label(
+            self, text="Vacation Requests", font=("Arial", 14, "bold")
+        )
+        self.heading_label.pack(pady=10)
+
+        filter_frame = tk.Frame(self)
+        filter_frame.pack(pady=5)
+
+        ttk.Label(filter_frame, text="Employee:").grid(row=0, column=0, padx=5)
+        self.employee_var = tk.StringVar()
+        self.employee_entry = ttk.Entry(filter_frame, textvariable=self.employee_var)
+        self.employee_entry.grid(row=0, column=1, padx=5)
+        self.employee_entry.bind("<Return>", self.apply_filters)
+
+        self.filter_button = ttk.Button(
+            filter_frame, text="Search", command=self.apply_filters
+        )
+        self.filter_button.grid(row=0, column=2, padx=5)
+
+        self.count_label = ttk.Label(filter_frame, text="")
+        self.count_label.grid(row=0, column=3, padx=15)
+
+        columns = (
+            "Vacation ID",
+            "Employee",
+            "From Date",
+            "To Date",
+            "Start Time",
+            "Hours",
+            "Reason",
+            "Approved",
+        )
+        tree_frame = tk.Frame(self)
+        tree_frame.pack(padx=10, pady=10, fill="both", expand=True)
+
+        self.tree = ttk.Treeview(
+            tree_frame,
+            columns=columns,
+            show="headings",
+            height=10,
+            selectmode="extended",
+        )
+
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, anchor="center", width=100)
+
+        self.scrollbar = ttk.Scrollbar(
+            tree_frame, orient="vertical", command=self.tree.yview
+        )
+        self.tree.configure(yscrollcommand=self._on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        button_frame = tk.Frame(self)
+        button_frame.pack(pady=10)
+
+        self.approve_button = ttk.Button(
+            button_frame, text="Approve", command=self.approve_request
+        )
+        self.approve_button.grid(row=0, column=0, padx=10)
+
+        self.disapprove_button = ttk.Button(
+            button_frame, text="Disapprove", command=self.disapprove_request
+        )
+        self.disapprove_button.grid(row=0, column=1, padx=10)
+
+        self.history_button = ttk.Button(
+            button_frame, text="View Past Requests", command=self.open_history_popup
+        )
+        self.history_button.grid(row=0, column=2, padx=10)
+
+        self.tree.bind("<Double-1>", self.on_double_click)
+        self.reason_window_open = False
+
+    def on_double_click(self, event):
+        """
+        Opens a tkinter messagebox with the reason, reading the full text first if the
+        table only holds its beginning.
+
+        TODO: have a tk.toplevel here so that we can refocus if the window is already open.
+
+        """
+        if self.reason_window_open:
+            return
+
+        selection = self.tree.selection()
+        if not selection:
+            return
+
+        item = self.rows[int(selection[0])]
+
+        if item.get("Reason Truncated"):
+            self.reason_window_open = True
+            self.task_runner.submit(
+                mie_trak_funcs.get_vacation_request_reason,
+                item["Vacation ID"],
+                on_success=lambda reason: self._show_reason(item, reason),
+                on_error=self._on_reason_error,
+                key="vacation_request_reason",
+            )
+        else:
+            self._show_reason(item, item["Reason"])
+
+    def _show_reason(self, item: Dict, reason: str):
+        self.reason_window_open = True
+
+        messagebox.showinfo(
+            title=f"{item['Employee']}: Leave Request Reason",
+            message=reason,
+        )
+
+        self.reason_window_open = False
+
+    def _on_reason_error(self, error: Exception):
+        self.reason_window_open = False
+        messagebox.showerror(title="Database Error", message=str(error))
+
+    def open_history_popup(self):
+        """
+        Open the history popup displaying past vacation requests.
+        """
+        HistoryPopup(self, self.history)
+
+    def get_selected_request(self):
+        """
+        Retrieve the selected vacation requests from the table.
+
+        :return: List of the selected rows if confirmed, otherwise None.
+        """
+        selected_items = self.tree.selection()
+
+        if not selected_items:
+            messagebox.showwarning("No Selection", "Please select a request first.")
+            return
+
+        selected_data = [self.rows[int(iid)] for iid in selected_items]
+        confirmation_message = "\n".join(
+            f"Employee: {item['Employee']}, Date: {item['From Date']} to {item['To Date']}, Reason: {item['Reason']}\n\n"
+            for item in selected_data
+        )
+
+        confirm = messagebox.askyesno(
+            "Confirm Selection",
+            f"Are you sure you want to proceed?\n\n{confirmation_message}",
+        )
+        return selected_data if confirm else None
+
+    @gui_error_handler
+    def approve_request(self):
+        """
+        Approve selected vacation requests and update the history.
+        """
+        to_approve_requests = self.get_selected_request()
+        if to_approve_requests:
+            self.task_runner.submit(
+                self._approve_requests,
+                to_approve_requests,
+                on_success=lambda _: self._after_update(to_approve_requests),
+                serial=True,
+            )
+
+    def _approve_requests(self, to_approve_requests: List[Dict]):
+        """
+        Runs in the background. Approves the requests in one transaction and records them in the history.
+
+        Rows already approved are skipped, so a retry after a failure is safe.
+        """
+        rows = {
+            row["Vacation ID"]: row
+            for row in to_approve_requests
+            if row.get("Status") != "Approved"
+        }
+        if not rows:
+            return
+
+        approved_pks = mie_trak_funcs.approve_vacation_requests(list(rows))
+        self._load_full_reasons([rows[pk] for pk in approved_pks])
+
+        time_stamp = datetime.now().strftime("%Y-%m-%d %I:%M %p")
+        approved = []
+        for pk in approved_pks:
+            row = rows[pk]
+            row["Time Stamp"] = time_stamp
+            row["Status"] = "Approved"
+            approved.append(row)
+
+        skipped = len(rows) - len(approved)
+        if skipped:
+            LOGGER.info(f"{skipped} requests were already approved elsewhere")
+
+        if approved:
+            self.history.append(approved)
+
+    @gui_error_handler
+    def disapprove_request(self):
+        """
+        Disapprove selected vacation requests, notify the user, and update history.
+        """
+        to_disapprove_requests = self.get_selected_request()
+        if to_disapprove_requests:
+            # Collect every note up front, the database and email work then runs in the background.
+            notes = []
+            for row in to_disapprove_requests:
+                user_body = simpledialog.askstring(
+                    "Disapprove Request", "Add a note to send to the user"
+                )
+                send = False
+                if not user_body:
+                    user_body = "No Note attached"
+                    send = messagebox.askyesno(
+                        "Confirm send email",
+                        f"Confirm email to send.\nBody:\n {user_body}",
+                    )
+                notes.append((row, user_body, send))
+
+            self.task_runner.submit(
+                self._disapprove_requests,
+                notes,
+                on_success=lambda _: self._after_update(to_disapprove_requests),
+                serial=True,
+            )
+
+    def _disapprove_requests(self, notes: List[tuple[Dict, str, bool]]):
+        """
+        Runs in the background. Notifies the users, notes the requests and records them in the history.
+
+        Rows disapproved before a failure are kept in the history and skipped on retry.
+        """
+        # Read before the reasons are overwritten with the notes below.
+        self._load_full_reasons(
+            [row for row, _, _ in notes if row.get("Status") != "Disapproved"]
+        )
+
+        disapproved = []
+        try:
+            for row, user_body, send in notes:
+                if row.get("Status") == "Disapproved":
+                    continue
+
+                if send:
+                    user_email = mie_trak_funcs.get_user_email_from_vacation_pk(
+                        row["Vacation ID"]
+                    )
+                    send_email(
+                        to=user_email,
+                        subject="Vacation Request Update",
+                        body=user_body,
+                    )
+
+                time_stamp = datetime.now().strftime("%Y-%m-%d %I:%M %p")
+                note = f"{time_stamp}\n{user_body}"
+
+                mie_trak_funcs.update_vacation_request_reason(
+                    row.get("Vacation ID"), note
+                )
+
+                row["Time Stamp"] = time_stamp
+                row["Status"] = "Disapproved"
+                row["Note"] = note
+                disapproved.append(row)
+        finally:
+            if disapproved:
+                self.history.append(disapproved)
+
+    def _load_full_reasons(self, rows: List[Dict]) -> None:
+        """
+        Runs in the background. Replaces the reason previews of the rows with the full
+        text, so the history keeps the whole reason.
+        """
+        truncated = [row["Vacation ID"] for row in rows if row.get("Reason Truncated")]
+        if not truncated:
+            return
+
+        reasons = mie_trak_funcs.get_vacation_request_reasons(truncated)
+        for row in rows:
+            reason = reasons.get(row["Vacation ID"])
+            if row.get("Reason Truncated") and reason is not None:
+                row["Reason"] = reason
+                row["Reason Truncated"] = False
+
+    def apply_filters(self, event=None):
+        """
+        Reloads the table with the requests of the employees matching the filter.
+        """
+        employee = self.employee_var.get().strip()
+        self.filters = {"employee": employee} if employee else {}
+        self.reload()
+
+    def reload(self):
+        """
+        Clears the table and reads the first page and the count in the background.
+        """
+        self.task_runner.cancel("vacation_requests_refresh")
+        self.task_runner.cancel("vacation_requests_page")
+
+        self.tree.delete(*self.tree.get_children())
+        self.rows = {}
+        # Every pending PK seen so far, loaded or not.
+        self.pending_pks = set()
+        self.high_water_pk = 0
+        # Keyset of the next page, None once everything is loaded.
+        self.next_page = None
+        self.loading_page = True
+        self.count_label.config(text="Loading...")
+
+        self.task_runner.submit(
+            mie_trak_funcs.get_vacation_requests_page,
+            self.filters,
+            self.history.disapproved_pks(),
+            limit=self.PAGE_SIZE,
+            on_success=self._show_page,
+            on_error=self._on_page_error,
+            key="vacation_requests_page",
+        )
+        self.task_runner.submit(
+            mie_trak_funcs.count_vacation_requests,
+            self.filters,
+            self.history.disapproved_pks(),
+            on_success=self._show_count,
+            key="vacation_requests_count",
+        )
+
+    def load_next_page(self):
+        """
+        Reads the page after the last loaded one in the background.
+        """
+        if self.loading_page or self.next_page is None:
+            return
+
+        self.loading_page = True
+        self.task_runner.submit(
+            mie_trak_funcs.get_vacation_requests_page,
+            self.filters,
+            self.history.disapproved_pks(),
+            after=self.next_page,
+            limit=self.PAGE_SIZE,
+            on_success=self._show_page,
+            on_error=self._on_page_error,
+            key="vacation_requests_page",
+        )
+
+    def _show_page(self, page: Dict):
+        if not self.winfo_exists():
+            return
+
+        self.loading_page = False
+        self.next_page = page["next"]
+
+        disapproved_vacation_pks = self.history.disapproved_pks()
+        for row in page["rows"]:
+            pk = row["Vacation ID"]
+            self.pending_pks.add(pk)
+            if pk not in self.rows and pk not in disapproved_vacation_pks:
+                self.tree.insert("", "end", iid=str(pk), values=self._row_values(row))
+                self.rows[pk] = row
+
+        self.high_water_pk = max(self.pending_pks | {self.high_water_pk})
+
+    def _show_count(self, count: int):
+        if self.winfo_exists():
+            self.count_label.config(text=f"{count} pending requests")
+
+    def _on_page_error(self, error: Exception):
+        self.loading_page = False
+        self.count_label.config(text="Could not load requests")
+        LOGGER.error(f"Could not load vacation requests: {error}")
+
+    def _on_scroll(self, first: str, last: str):
+        self.scrollbar.set(first, last)
+        if float(last) > 0.9:
+            self.load_next_page()
+
+    def refresh_data(self):
+        """
+        Fetch new or changed requests in the background and patch them into the table.
+        """
+        if self.loading_page and not self.rows:
+            return  # The first page is still loading.
+
+        self.task_runner.submit(
+            mie_trak_funcs.get_vacation_request_updates,
+            self.high_water_pk,
+            set(self.pending_pks),
+            self.history.disapproved_pks(),
+            self.filters,
+            # Requests further down are read when paging gets there.
+            min_pk=min(self.rows, default=0) if self.next_page is not None else 0,
+            on_success=self._apply_updates,
+            on_error=self._on_refresh_error,
+            key="vacation_requests_refresh",
+        )
+
+    def _apply_updates(self, update: Dict):
+        """
+        Removes rows that are no longer pending and inserts the new ones in PK order.
+        Disapproved requests stay pending in Mie Trak. The query already leaves them out,
+        the check here covers requests disapproved while a refresh was running.
+        """
+        if not self.winfo_exists():
+            return
+
+        pending = update["pending"]
+        self._remove_rows([pk for pk in self.rows if pk not in pending])
+
+        disapproved_vacation_pks = self.history.disapproved_pks()
+        for row in update["rows"]:
+            pk = row["Vacation ID"]
+            if pk in disapproved_vacation_pks or pk not in pending:
+                continue
+
+            if pk in self.rows:
+                self.tree.item(str(pk), values=self._row_values(row))
+            else:
+                self.tree.insert(
+                    "",
+                    self._insert_index(pk),
+                    iid=str(pk),
+                    values=self._row_values(row),
+                )
+            self.rows[pk] = row
+
+        self.pending_pks = set(pending)
+        self.high_water_pk = max(self.pending_pks | {self.high_water_pk})
+        self.count_label.config(text=f"{len(self.pending_pks)} pending requests")
+
+    def _after_update(self, rows: List[Dict]):
+        """
+        Drops the rows that were just approved or disapproved, then checks for new requests.
+        """
+        if not self.winfo_exists():
+            return
+
+        self._remove_rows([row["Vacation ID"] for row in rows if row.get("Status")])
+        self.refresh_data()
+
+    def _remove_rows(self, pks: List[int]):
+        for pk in pks:
+            if self.rows.pop(pk, None) is not None:
+                self.tree.delete(str(pk))
+
+    def _insert_index(self, pk: int) -> int:
+        """
+        Position keeping the table sorted by descending PK, new requests land on top.
+        """
+        index = 0
+        for iid in self.tree.get_children():
+            if int(iid) < pk:
+                break
+            index += 1
+        return index
+
+    @staticmethod
+    def _row_values(row: Dict) -> tuple:
+        return (
+            row["Vacation ID"],
+            row["Employee"],
+            row["From Date"],
+            row["To Date"],
+            row["Start Time"],
+            row["Hours"],
+            row["Reason"],
+            row["Approved"],
+        )
+
+    def _schedule_poll(self):
+        self._poll_id = self.after(POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self):
+        self.refresh_data()
+        self._schedule_poll()
+
+    def _on_refresh_error(self, error: Exception):
+        # Background polls retry on the next interval instead of prompting.
+        LOGGER.error(f"Could not refresh vacation requests: {error}")
+
+    def _on_destroy(self, event):
+        if event.widget is not self:
+            return
+
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+        for key in (
+            "vacation_requests_refresh",
+            "vacation_requests_page",
+            "vacation_requests_count",
+        ):
+            self.task_runner.cancel(key)
+
+
+class HistoryPopup(tk.Toplevel):
+    """
+    A popup window displaying past requests with filtering options, one page at a time.
+    """
+
+    PAGE_SIZE = 100
+
+    def __init__(self, master, history):
+        """
+        Initialize the HistoryPopup window.
+
+        :param master: The parent widget.
+        :param history: An instance of RequestHistory containing past requests.
+        """
+        super().__init__(master)
+        self.title("Past Requests")
+        center_window(self, width=1000, height=500)
+
+        self.history = history
+        self.filter_var = tk.StringVar()
+        # "History ID" each shown page starts before, None for the newest page.
+        self.page_starts: List[int | None] = [None]
+        self.next_start: int | None = None
+
+        self.build_widgets()
+        self.update_table()
+
+    def build_widgets(self):
+        """
+        Create and configure all widgets for the popup.
+        """
+        self.heading_label = ttk.Label(
+            self, text="Past Requests", font=("Arial", 14, "bold")
+        )
+        self.heading_label.pack(pady=10)
+
+        self.filter_combobox = ttk.Combobox(
+            self,
+            textvariable=self.filter_var,
+            values=["All", "Approved", "Disapproved"],
+        )
+        self.filter_combobox.current(0)
+        self.filter_combobox.pack(pady=5)
+        self.filter_combobox.bind("<<ComboboxSelected>>", self.update_table)
+
+        columns = (
+            "Vacation ID",
+            "Employee",
+            "From Date",
+            "To Date",
+            "Status",
+            "Updated at",
+            "Note",
+        )
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=10)
+
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, anchor="center", width=150)
+
+        self.tree.pack(padx=10, pady=10, fill="both", expand=True)
+
+        page_frame = tk.Frame(self)
+        page_frame.pack(pady=5)
+
+        self.previous_button = ttk.Button(
+            page_frame, text="Previous", command=self.previous_page
+        )
+        self.previous_button.grid(row=0, column=0, padx=10)
+
+        self.page_label = ttk.Label(page_frame, text="")
+        self.page_label.grid(row=0, column=1, padx=10)
+
+        self.next_button = ttk.Button(page_frame, text="Next", command=self.next_page)
+        self.next_button.grid(row=0, column=2, padx=10)
+
+        self.close_button = ttk.Button(self, text="Close", command=self.destroy)
+        self.close_button.pack(pady=10)
+
+    def _selected_status(self) -> str | None:
+        selected_filter = self.filter_var.get()
+        return (
+            selected_filter if selected_filter in ("Approved", "Disapproved") else None
+        )
+
+    def update_table(self, event=None):
+        """
+        Show the newest page for the selected filter option.
+
+        :param event: The event triggering the update (optional).
+        """
+        self.page_starts = [None]
+        self.show_page()
+
+    def next_page(self):
+        if self.next_start is not None:
+            self.page_starts.append(self.next_start)
+            self.show_page()
+
+    def previous_page(self):
+        if len(self.page_starts) > 1:
+            self.page_starts.pop()
+            self.show_page()
+
+    def show_page(self):
+        """
+        Reads the current page from the history and fills the table with it.
+        """
+        status = self._selected_status()
+        # One extra row tells whether there is a next page.
+        data = self.history.query(
+            status=status, limit=self.PAGE_SIZE + 1, before_id=self.page_starts[-1]
+        )
+        has_next = len(data) > self.PAGE_SIZE
+        data = data[: self.PAGE_SIZE]
+        self.next_start = data[-1]["History ID"] if has_next else None
+
+        self.tree.delete(*self.tree.get_children())
+
+        for row in data:
+            self.tree.insert(
+                "",
+                "end",
+                values=(  # to add default values maybe
+                    row.get("Vacation ID", None),
+                    row.get("Employee", None),
+                    row.get("From Date", None),
+                    row.get("To Date", None),
+                    row.get("Status", None),
+                    row.get("Time Stamp", None),
+                    row.get("Note", None),
+                ),
+            )
+
+        first = (len(self.page_starts) - 1) * self.PAGE_SIZE
+        total = self.history.count(status)
+        self.page_label.config(
+            text=f"{first + 1 if data else 0}-{first + len(data)} of {total}"
+        )
+        has_previous = len(self.page_starts) > 1
+        self.previous_button.state(["!disabled" if has_previous else "disabled"])
+        self.next_button.state(["!disabled" if has_next else "disabled"])
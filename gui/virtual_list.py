@@ -0,0 +1,314 @@
+import tkinter as tk
+import tkinter.font as tkfont
+from tkinter import ttk
+from typing import Any, Iterable, List, Tuple
+from gui.list_model import ListModel
+
+
+class VirtualListbox(ttk.Frame):
+    """
+    A scrollable listbox that only renders the rows currently in view.
+
+    The entries live in a `ListModel` (labels and the primary keys they stand for)
+    and the inner `tk.Listbox` only ever holds the
+    visible window of them, refilled with a single ``insert`` call whenever the view
+    scrolls or resizes. Loading tens of thousands of entries therefore costs no more
+    than loading a screenful. Selection is tracked against the backing list, so it
+    survives scrolling and `curselection` returns indices into the full list.
+    `set_filter` shows a subset of the entries in a given order (search results)
+    without touching the backing list or the selection.
+
+    It exposes the subset of the `tk.Listbox` API this application uses (`insert`,
+    `delete`, `curselection`, `get`, `size`, ...), and generates ``<<ListboxSelect>>``
+    on itself when the user changes the selection.
+
+    :param master: The parent widget.
+    :param selectmode: "browse", "single", "multiple" or "extended", as for `tk.Listbox`.
+    :type selectmode: str
+    :param listbox_kwargs: Passed on to the inner `tk.Listbox` (relief, bd, height, ...).
+    """
+
+    def __init__(self, master, selectmode: str = tk.BROWSE, **listbox_kwargs) -> None:
+        super().__init__(master)
+        listbox_kwargs.pop("exportselection", None)
+
+        self.selectmode = selectmode
+        self.model = ListModel()
+        self._items: List[str] = self.model.labels  # The labels of the model, shared.
+        self._selected: set = set()
+        # Backing indices shown, in order, or None to show every entry.
+        self._filter: List[int] | None = None
+        self._rendered: List[int] = []
+        self._offset = 0
+        self._visible_rows = int(listbox_kwargs.get("height", 10))
+
+        self.listbox = tk.Listbox(
+            self,
+            selectmode=selectmode,
+            exportselection=False,
+            activestyle="none",
+            **listbox_kwargs,
+        )
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.listbox.pack(side="left", fill="both", expand=True)
+
+        self.listbox.bind("<<ListboxSelect>>", self._on_select)
+        self.listbox.bind("<Configure>", self._on_configure)
+        self.listbox.bind("<MouseWheel>", self._on_mousewheel)
+        self.listbox.bind("<Button-4>", lambda _: self._scroll_by(-3))
+        self.listbox.bind("<Button-5>", lambda _: self._scroll_by(3))
+        self.listbox.bind("<Up>", lambda _: self._on_arrow(-1))
+        self.listbox.bind("<Down>", lambda _: self._on_arrow(1))
+        self.listbox.bind("<Prior>", lambda _: self._scroll_by(-self._visible_rows))
+        self.listbox.bind("<Next>", lambda _: self._scroll_by(self._visible_rows))
+
+    # tk.Listbox compatible API
+
+    def set_items(self, items: Iterable[str]) -> None:
+        """
+        Replaces every entry at once and clears the selection. The entries are their
+        own keys, use `set_model` to attach primary keys.
+        """
+        self.set_model(ListModel.from_labels(items))
+
+    def set_model(self, model: ListModel) -> None:
+        """
+        Replaces every entry with the rows of ``model`` and clears the selection.
+        """
+        self.model = model
+        self._items = model.labels
+        self._selected.clear()
+        self._filter = None
+        self._offset = 0
+        self._render()
+
+    def insert(self, index, *items: str) -> None:
+        """
+        Inserts entries, keyed by their text, before ``index`` ("end" appends).
+        Selected indices after the insertion point move with their entries. Clears
+        the filter.
+        """
+        position = self._index(index, allow_end=True)
+        self._filter = None
+        self.model.insert(position, items, items)
+        self._selected = {
+            i + len(items) if i >= position else i for i in self._selected
+        }
+        self._render()
+
+    def delete(self, first, last=None) -> None:
+        """
+        Deletes the entries from ``first`` to ``last`` inclusive ("end" for the last
+        entry). Clears the filter.
+        """
+        start = self._index(first)
+        stop = start if last is None else self._index(last)
+        if start >= len(self._items) or stop < start:
+            return
+
+        count = stop - start + 1
+        self.model.delete(start, stop)
+        self._filter = None
+        self._selected = {
+            i - count if i > stop else i
+            for i in self._selected
+            if not start <= i <= stop
+        }
+        self._render()
+
+    def get(self, first, last=None):
+        """
+        Returns one entry, or a tuple of entries from ``first`` to ``last`` inclusive.
+        """
+        start = self._index(first)
+        if last is None:
+            return self._items[start]
+        return tuple(self._items[start : self._index(last) + 1])
+
+    def size(self) -> int:
+        return len(self._items)
+
+    def curselection(self) -> Tuple[int, ...]:
+        """
+        Returns the selected indices into the full list, in order.
+        """
+        return tuple(sorted(self._selected))
+
+    def selected_pks(self) -> List[Any]:
+        """
+        Returns the primary keys of the selected entries, in list order.
+        """
+        return self.model.pks_at(self.curselection())
+
+    def selection_set(self, first, last=None) -> None:
+        start = self._index(first)
+        stop = start if last is None else self._index(last)
+        self._selected.update(range(start, min(stop, len(self._items) - 1) + 1))
+        self._render()
+
+    def selection_clear(self, first=0, last=tk.END) -> None:
+        start = self._index(first)
+        stop = self._index(last)
+        self._selected = {i for i in self._selected if not start <= i <= stop}
+        self._render()
+
+    def see(self, index) -> None:
+        """
+        Scrolls the entry at ``index`` into view, if the filter shows it.
+        """
+        position = self._shown_position(self._index(index))
+        if position is not None:
+            self._see_position(position)
+
+    def set_filter(self, indices: Iterable[int] | None) -> None:
+        """
+        Shows only the entries at ``indices``, in that order, or every entry when None.
+
+        Indices keep referring to the full list: `curselection` may return entries
+        that are filtered out, so a multiple selection survives refining a search.
+
+        :param indices: Indices into the full list, e.g. `SearchIndex.search` results.
+        :type indices: Iterable[int] | None
+        """
+        self._filter = None if indices is None else list(indices)
+        self._offset = 0
+        self._render()
+
+    def yview(self, *args) -> None:
+        """
+        Scrollbar command, understands "moveto" and "scroll" like `tk.Listbox.yview`.
+        """
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._set_offset(round(float(args[1]) * self._shown_count()))
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if args[2] == "pages":
+                amount *= self._visible_rows
+            self._scroll_by(amount)
+
+    # Rendering
+
+    def _shown_count(self) -> int:
+        return len(self._items) if self._filter is None else len(self._filter)
+
+    def _shown_indices(self, start: int, stop: int) -> List[int]:
+        """
+        Backing indices of the shown rows ``start`` to ``stop`` (exclusive).
+        """
+        if self._filter is None:
+            return list(range(start, min(stop, len(self._items))))
+        return self._filter[start:stop]
+
+    def _shown_position(self, index: int) -> int | None:
+        """
+        Row at which the entry ``index`` is shown, None when it is filtered out.
+        """
+        if self._filter is None:
+            return index
+        try:
+            return self._filter.index(index)
+        except ValueError:
+            return None
+
+    def _render(self) -> None:
+        total = self._shown_count()
+        self._offset = max(0, min(self._offset, total - self._visible_rows))
+        # One extra row fills a partly visible last line.
+        self._rendered = self._shown_indices(
+            self._offset, self._offset + self._visible_rows + 1
+        )
+
+        self.listbox.delete(0, tk.END)
+        if self._rendered:
+            self.listbox.insert(tk.END, *(self._items[i] for i in self._rendered))
+
+        for row, index in enumerate(self._rendered):
+            if index in self._selected:
+                self.listbox.selection_set(row)
+
+        if total:
+            self.scrollbar.set(
+                self._offset / total,
+                min(1.0, (self._offset + self._visible_rows) / total),
+            )
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _set_offset(self, offset: int) -> None:
+        offset = max(0, min(offset, self._shown_count() - self._visible_rows))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _see_position(self, position: int) -> None:
+        if position < self._offset:
+            self._set_offset(position)
+        elif position >= self._offset + self._visible_rows:
+            self._set_offset(position - self._visible_rows + 1)
+
+    def _scroll_by(self, rows: int) -> str:
+        self._set_offset(self._offset + rows)
+        return "break"
+
+    def _on_mousewheel(self, event) -> str:
+        # Windows reports multiples of 120 per notch, macOS small deltas.
+        notches = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._scroll_by(-3 * notches)
+
+    def _on_arrow(self, step: int):
+        """
+        Moves the selection in browse mode, scrolling when it leaves the window.
+        """
+        total = self._shown_count()
+        if self.selectmode not in (tk.BROWSE, tk.SINGLE) or not total:
+            return None
+
+        current = self._shown_position(min(self._selected)) if self._selected else None
+        if current is None:
+            current = self._offset - step
+        target = max(0, min(current + step, total - 1))
+        self._selected = set(self._shown_indices(target, target + 1))
+        self._see_position(target)
+        self._render()
+        self.event_generate("<<ListboxSelect>>")
+        return "break"
+
+    def _on_configure(self, event) -> None:
+        font = tkfont.Font(font=self.listbox.cget("font"))
+        line_height = font.metrics("linespace") + 2 * int(
+            self.listbox.cget("selectborderwidth")
+        )
+        border = 2 * (
+            int(self.listbox.cget("borderwidth"))
+            + int(self.listbox.cget("highlightthickness"))
+        )
+        rows = max(1, (event.height - border) // max(1, line_height))
+
+        if rows != self._visible_rows:
+            self._visible_rows = rows
+            self._render()
+
+    def _on_select(self, _event) -> None:
+        """
+        Mirrors the selection of the rendered rows into the backing selection.
+        """
+        rendered = self._rendered
+        selected_now = {rendered[i] for i in self.listbox.curselection()}
+
+        if self.selectmode in (tk.BROWSE, tk.SINGLE):
+            if not selected_now:
+                return
+            self._selected = selected_now
+        else:
+            self._selected.difference_update(rendered)
+            self._selected.update(selected_now)
+
+        self.event_generate("<<ListboxSelect>>")
+
+    def _index(self, index, allow_end: bool = False) -> int:
+        if index == tk.END or index == "end":
+            return len(self._items) if allow_end else max(len(self._items) - 1, 0)
+        return int(index)
@@ -1,6 +1,6 @@
-from gui.main_window import MainWindow
-
-
-if __name__ == "__main__":
-    app = MainWindow()
-    app.mainloop()
+from gui.main_window import MainWindow
+
+
+if __name__ == "__main__":
+    app = MainWindow()
+    app.mainloop()
@@ -0,0 +1,515 @@
+"""
+Batch grants and revokes of dashboards, QuickViews and document groups.
+
+A batch is a list of `AccessChange` rows, one (target, item) pair each, read from
+a CSV or JSONL file or built from the command line (see cli.py). `execute` expands
+department rows to their members, groups all rows into (UserPK, item PK) pairs per
+action and item table, and applies the pairs in chunked transactions, so a batch
+costs a handful of set-based statements instead of one round trip per user.
+
+Batch file columns (CSV header or JSONL keys):
+
+- ``action``: "grant" or "revoke", optional when the command sets it.
+- ``target``: "user" or "department".
+- ``target_pk``: UserPK or DepartmentPK.
+- ``item_type``: "dashboard", "quickview" or "doc-group" (the table names work too).
+- ``item_pk``: Primary key of the item.
+"""
+
+import csv
+import json
+import os
+import time
+from typing import Any, Dict, List
+from scripts import mie_trak_funcs
+from scripts.department_store import ACCESSED_KEYS
+from base_logger import getlogger
+
+
+LOGGER = getlogger("Bulk Access")
+
+ACTIONS = ("grant", "revoke")
+TARGETS = ("user", "department")
+
+# Item type names accepted on the command line and in batch files.
+ITEM_TYPES = {
+    "dashboard": "Dashboard",
+    "quickview": "QuickView",
+    "doc-group": "DocumentGroup",
+}
+
+# (UserPK, item PK) pairs written per transaction.
+DEFAULT_CHUNK_SIZE = 1000
+
+USER_ITEMS_FUNCS = {
+    "Dashboard": mie_trak_funcs.get_user_dashboards,
+    "QuickView": mie_trak_funcs.get_user_quick_view,
+    "DocumentGroup": mie_trak_funcs.get_user_document_groups,
+}
+
+_ALL_ITEMS_FUNCS = {
+    "Dashboard": mie_trak_funcs.get_all_dashboards,
+    "QuickView": mie_trak_funcs.get_all_quickviews,
+    "DocumentGroup": mie_trak_funcs.get_all_document_groups,
+}
+
+REPORT_FIELDS = (
+    "line",
+    "action",
+    "target",
+    "target_pk",
+    "item_type",
+    "item_pk",
+    "status",
+    "changed",
+    "unchanged",
+    "error",
+)
+
+
+def parse_item_type(value: str) -> str:
+    """
+    Resolves an item type name ("dashboard", "doc_group", "DocumentGroup", ...) to its table.
+
+    :raises ValueError: If the name is not an item type.
+    """
+    normalized = (
+        str(value).strip().lower().replace("_", "").replace("-", "").replace(" ", "")
+    )
+    for name, item_table in ITEM_TYPES.items():
+        if normalized in (name.replace("-", ""), item_table.lower()):
+            return item_table
+
+    raise ValueError(f"Unknown item type: {value!r}")
+
+
+class AccessChange:
+    """
+    One row of a batch: grant or revoke one item for a user or a whole department.
+
+    After `execute`, ``status`` is "granted", "revoked", "unchanged" (nothing to do),
+    "failed" (its transaction was rolled back) or "invalid", and ``changed`` and
+    ``unchanged`` count the link rows of the row's users that were or were not touched.
+
+    :param action: "grant" or "revoke".
+    :param target: "user" or "department".
+    :param target_pk: UserPK or DepartmentPK.
+    :param item_table: One of "Dashboard", "QuickView" or "DocumentGroup".
+    :param item_pk: Primary key of the item.
+    :param line: Line of the batch file the row was read from.
+    """
+
+    def __init__(
+        self,
+        action: str,
+        target: str,
+        target_pk: int,
+        item_table: str,
+        item_pk: int,
+        line: int | None = None,
+    ) -> None:
+        self.action = action
+        self.target = target
+        self.target_pk = target_pk
+        self.item_table = item_table
+        self.item_pk = item_pk
+        self.line = line
+
+        self.status = "pending"
+        self.changed = 0
+        self.unchanged = 0
+        self.error: str | None = None
+
+    @classmethod
+    def from_row(
+        cls, row: Dict[str, Any], line: int | None = None, action: str | None = None
+    ) -> "AccessChange":
+        """
+        Builds a change from a batch file row. A row that cannot be parsed is returned
+        as an "invalid" change carrying the error, so it is still reported.
+
+        :param row: The row, keyed by the batch file columns.
+        :param line: Line of the batch file, for the report.
+        :param action: Action of rows without an ``action`` column.
+        """
+        row = {str(key).strip().lower(): value for key, value in row.items() if key}
+        try:
+            row_action = str(row.get("action") or action or "").strip().lower()
+            if row_action not in ACTIONS:
+                raise ValueError(f"Unknown action: {row_action!r}")
+
+            target = str(row.get("target") or "").strip().lower()
+            if target not in TARGETS:
+                raise ValueError(f"Unknown target: {target!r}")
+
+            return cls(
+                row_action,
+                target,
+                int(row["target_pk"]),
+                parse_item_type(row.get("item_type", "")),
+                int(row["item_pk"]),
+                line,
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            error = f"Missing column: {e}" if isinstance(e, KeyError) else str(e)
+            change = cls(
+                row.get("action") or action,
+                row.get("target"),
+                row.get("target_pk"),
+                row.get("item_type"),
+                row.get("item_pk"),
+                line,
+            )
+            change.invalidate(error)
+            return change
+
+    def invalidate(self, error: str) -> None:
+        self.status = "invalid"
+        self.error = error
+
+    def fail(self, error: str) -> None:
+        self.status = "failed"
+        self.error = error
+
+    def to_dict(self) -> Dict[str, Any]:
+        item_types = {item_table: name for name, item_table in ITEM_TYPES.items()}
+        return {
+            "line": self.line,
+            "action": self.action,
+            "target": self.target,
+            "target_pk": self.target_pk,
+            "item_type": item_types.get(self.item_table, self.item_table),
+            "item_pk": self.item_pk,
+            "status": self.status,
+            "changed": self.changed,
+            "unchanged": self.unchanged,
+            "error": self.error,
+        }
+
+
+def read_batch(path: str, action: str | None = None) -> List[AccessChange]:
+    """
+    Reads a batch file, JSONL if its extension is .jsonl or .ndjson and CSV otherwise.
+
+    :param path: Path of the batch file.
+    :type path: str
+    :param action: Action of rows without an ``action`` column.
+    :type action: str | None
+    :return: One change per row, in file order.
+    :rtype: List[AccessChange]
+    """
+    changes = []
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        if os.path.splitext(path)[1].lower() in (".jsonl", ".ndjson"):
+            for line, text in enumerate(f, start=1):
+                if not text.strip():
+                    continue
+                try:
+                    row = json.loads(text)
+                    if not isinstance(row, dict):
+                        raise ValueError("Expected a JSON object")
+                except ValueError as e:
+                    change = AccessChange(action, None, None, None, None, line)
+                    change.invalidate(f"Invalid JSON: {e}")
+                    changes.append(change)
+                    continue
+                changes.append(AccessChange.from_row(row, line, action))
+        else:
+            reader = csv.DictReader(f)
+            for row in reader:
+                changes.append(AccessChange.from_row(row, reader.line_num, action))
+
+    return changes
+
+
+def write_report(changes: List[AccessChange], f, file_format: str = "jsonl") -> None:
+    """
+    Writes one result per change to an open text file, as "jsonl" or "csv".
+    """
+    if file_format == "csv":
+        writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(change.to_dict() for change in changes)
+    else:
+        for change in changes:
+            f.write(json.dumps(change.to_dict()) + "\n")
+
+
+class BatchStats:
+    """
+    Outcome and throughput of one `execute` call.
+    """
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.statuses: Dict[str, int] = {}
+        self.pairs = 0
+        self.changed = 0
+        self.transactions = 0
+        self.elapsed = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "statuses": self.statuses,
+            "pairs": self.pairs,
+            "links_changed": self.changed,
+            "transactions": self.transactions,
+            "elapsed_s": round(self.elapsed, 3),
+            "rows_per_s": round(self.rows / self.elapsed, 1) if self.elapsed else None,
+            "pairs_per_s": round(self.pairs / self.elapsed, 1)
+            if self.elapsed
+            else None,
+        }
+
+
+def _validate(changes: List[AccessChange]) -> Dict[int, List[int]]:
+    """
+    Marks grants of unknown users, departments or items invalid, so no link row points
+    at nothing. Revokes are not checked, there is nothing to delete for them anyway.
+
+    :return: The UserPKs of every department.
+    """
+    user_departments = mie_trak_funcs.get_user_departments()
+    members: Dict[int, List[int]] = {}
+    for userpk, department_pk in user_departments.items():
+        if department_pk is not None:
+            members.setdefault(department_pk, []).append(userpk)
+
+    grants = [c for c in changes if c.status == "pending" and c.action == "grant"]
+    departments = (
+        mie_trak_funcs.get_all_departments()
+        if any(c.target == "department" for c in grants)
+        else {}
+    )
+    items = {
+        item_table: _ALL_ITEMS_FUNCS[item_table]()
+        for item_table in {c.item_table for c in grants}
+    }
+
+    for change in grants:
+        if change.target == "user" and change.target_pk not in user_departments:
+            change.invalidate(f"Unknown user: {change.target_pk}")
+        elif change.target == "department" and change.target_pk not in departments:
+            change.invalidate(f"Unknown department: {change.target_pk}")
+        elif str(change.item_pk) not in items[change.item_table]:
+            change.invalidate(f"Unknown {change.item_table}: {change.item_pk}")
+
+    return members
+
+
+def _segments(
+    changes: List[AccessChange], members: Dict[int, List[int]]
+) -> List[tuple[List[int], Dict]]:
+    """
+    Splits the pending rows, in batch order, into segments without opposite actions
+    on the same user link. A new segment starts at the first row granting a link an
+    earlier row of the segment revokes, or the other way around, so running the
+    segments one after the other gives the same result as running the rows in order.
+
+    :return: Per segment, the indexes of its rows and
+        ``{(action, item_table): {(UserPK, item PK): indexes of the rows wanting it}}``.
+    """
+    segments = []
+    rows: List[int] = []
+    groups: Dict[tuple[str, str], Dict[tuple[int, int], List[int]]] = {}
+    actions: Dict[tuple[str, int, int], str] = {}
+
+    for index, change in enumerate(changes):
+        if change.status != "pending":
+            continue
+
+        if change.target == "user":
+            user_pks = [change.target_pk]
+        else:
+            user_pks = members.get(change.target_pk, [])
+
+        links = [(change.item_table, userpk, change.item_pk) for userpk in user_pks]
+        if any(actions.get(link, change.action) != change.action for link in links):
+            segments.append((rows, groups))
+            rows, groups, actions = [], {}, {}
+
+        rows.append(index)
+        owners = groups.setdefault((change.action, change.item_table), {})
+        for link in links:
+            actions[link] = change.action
+            owners.setdefault(link[1:], []).append(index)
+
+    segments.append((rows, groups))
+    return segments
+
+
+def _execute_segment(
+    controller,
+    changes: List[AccessChange],
+    rows: List[int],
+    groups: Dict[tuple[str, str], Dict[tuple[int, int], List[int]]],
+    chunk_size: int,
+    stats: BatchStats,
+) -> None:
+    """
+    Writes the links of one segment from `_segments`, sets the result of its rows and
+    records its department rows in the department store.
+    """
+    for (action, item_table), owners in groups.items():
+        write = (
+            controller.add_user_links
+            if action == "grant"
+            else controller.delete_user_links
+        )
+        pairs = list(owners)
+        stats.pairs += len(pairs)
+
+        for i in range(0, len(pairs), chunk_size):
+            chunk = pairs[i : i + chunk_size]
+            try:
+                changed = set(write(item_table, chunk))
+            except RuntimeError as e:
+                for pair in chunk:
+                    for index in owners[pair]:
+                        changes[index].fail(str(e))
+                continue
+
+            stats.transactions += 1
+            stats.changed += len(changed)
+            for pair in chunk:
+                for index in owners[pair]:
+                    if pair in changed:
+                        changes[index].changed += 1
+                    else:
+                        changes[index].unchanged += 1
+
+    department_items: Dict[tuple[str, str], Dict[int, List[int]]] = {}
+    for index in rows:
+        change = changes[index]
+        if change.status != "pending":
+            continue
+
+        if change.changed:
+            change.status = "granted" if change.action == "grant" else "revoked"
+        else:
+            change.status = "unchanged"
+
+        if change.target == "department":
+            items = department_items.setdefault((change.action, change.item_table), {})
+            items.setdefault(change.target_pk, []).append(change.item_pk)
+
+    for (action, item_table), items in department_items.items():
+        if action == "grant":
+            controller.record_department_grants(item_table, items)
+        else:
+            controller.forget_department_grants(item_table, items)
+
+
+def execute(
+    controller, changes: List[AccessChange], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> BatchStats:
+    """
+    Applies a batch and sets the result of every change.
+
+    Rows take effect in batch order. The batch is split into segments where no user
+    link is both granted and revoked (see `_segments`), normally a single one. Within
+    a segment the (UserPK, item PK) pairs of all rows are deduplicated per action and
+    item table and written ``chunk_size`` pairs per transaction with
+    `Controller.add_user_links` or `Controller.delete_user_links`. A failed transaction
+    only fails the rows with pairs in it, the other chunks still run. Department rows
+    are recorded in the department store once their segment is written.
+
+    :param controller: The controller whose store and permission matrix are kept in sync.
+    :type controller: scripts.controller.Controller
+    :param changes: The batch.
+    :type changes: List[AccessChange]
+    :param chunk_size: Pairs written per transaction.
+    :type chunk_size: int
+    :return: Counts and throughput of the run.
+    :rtype: BatchStats
+    """
+    start = time.perf_counter()
+    stats = BatchStats()
+    members = _validate(changes) if any(c.status == "pending" for c in changes) else {}
+
+    for rows, groups in _segments(changes, members):
+        _execute_segment(controller, changes, rows, groups, chunk_size, stats)
+
+    stats.rows = len(changes)
+    for change in changes:
+        stats.statuses[change.status] = stats.statuses.get(change.status, 0) + 1
+    stats.elapsed = time.perf_counter() - start
+
+    LOGGER.info(
+        f"Applied {stats.rows} rows ({stats.pairs} user links) in "
+        f"{stats.transactions} transactions and {stats.elapsed:.2f}s: {stats.statuses}"
+    )
+
+    return stats
+
+
+def list_access(
+    controller, target: str, target_pk: int, item_tables: List[str] | None = None
+) -> List[Dict[str, Any]]:
+    """
+    Lists what a user or a department has access to.
+
+    Users are read from the link tables, departments from the department store.
+
+    :param controller: The controller holding the department store.
+    :type controller: scripts.controller.Controller
+    :param target: "user" or "department".
+    :type target: str
+    :param target_pk: UserPK or DepartmentPK.
+    :type target_pk: int
+    :param item_tables: Only list these item tables, all of them when None.
+    :type item_tables: List[str] | None
+    :return: ``{"item_type", "item_pk", "label"}`` rows.
+    :rtype: List[Dict[str, Any]]
+    """
+    item_types = {item_table: name for name, item_table in ITEM_TYPES.items()}
+    department = controller.cache_dict.get(str(target_pk), {})
+
+    rows = []
+    for item_table in item_tables or ACCESSED_KEYS:
+        if target == "user":
+            items = USER_ITEMS_FUNCS[item_table](target_pk)
+        else:
+            items = department.get(ACCESSED_KEYS[item_table], {})
+
+        rows.extend(
+            {"item_type": item_types[item_table], "item_pk": int(pk), "label": label}
+            for pk, label in items.items()
+        )
+
+    return rows
+
+
+def copy_changes(
+    controller,
+    source: str,
+    source_pk: int,
+    targets: List[tuple[str, int]],
+    item_tables: List[str] | None = None,
+) -> List[AccessChange]:
+    """
+    Builds the grants giving every target what the source user or department has.
+
+    :param controller: The controller holding the department store.
+    :type controller: scripts.controller.Controller
+    :param source: "user" or "department".
+    :type source: str
+    :param source_pk: UserPK or DepartmentPK to copy from.
+    :type source_pk: int
+    :param targets: ("user" or "department", PK) to copy to.
+    :type targets: List[tuple[str, int]]
+    :param item_tables: Only copy these item tables, all of them when None.
+    :type item_tables: List[str] | None
+    :return: One grant per target and item, to pass to `execute`.
+    :rtype: List[AccessChange]
+    """
+    items = list_access(controller, source, source_pk, item_tables)
+
+    return [
+        AccessChange(
+            "grant", target, target_pk, ITEM_TYPES[item["item_type"]], item["item_pk"]
+        )
+        for target, target_pk in targets
+        for item in items
+    ]
@@ -0,0 +1,269 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+from base_logger import getlogger
+
+
+LOGGER = getlogger("Conn Pool")
+
+
+class PoolTimeoutError(RuntimeError):
+    """Raised when no connection could be checked out before the timeout."""
+
+
+class _PooledConnection:
+    """
+    Bookkeeping wrapper around a raw DB-API connection held by the pool.
+    """
+
+    __slots__ = ("raw", "created_at", "last_used", "last_checked")
+
+    def __init__(self, raw: Any) -> None:
+        now = time.monotonic()
+        self.raw = raw
+        self.created_at = now
+        self.last_used = now
+        self.last_checked = now
+
+
+class ConnectionPool:
+    """
+    A bounded, thread-safe pool of DB-API connections.
+
+    Connections are created lazily through ``factory`` up to ``max_size`` and are
+    handed out to one thread at a time. A thread that already holds a connection
+    and asks for another (e.g. a decorated function calling another decorated
+    function) gets the same connection back instead of a second checkout.
+
+    Idle connections older than ``idle_timeout`` seconds are closed instead of being
+    reused, and connections idle longer than ``health_check_interval`` seconds are
+    pinged with ``health_check_query`` before being handed out.
+
+    :param factory: Zero-argument callable returning a new DB-API connection.
+    :type factory: Callable[[], Any]
+    :param max_size: Maximum number of open connections.
+    :type max_size: int
+    :param idle_timeout: Seconds an idle connection is kept before being closed.
+    :type idle_timeout: float
+    :param health_check_interval: Idle seconds after which a connection is pinged on checkout.
+    :type health_check_interval: float
+    :param checkout_timeout: Seconds to wait for a free connection when the pool is exhausted.
+    :type checkout_timeout: float
+    :param health_check_query: Query used to check that a connection is still alive.
+    :type health_check_query: str
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        max_size: int = 4,
+        idle_timeout: float = 300.0,
+        health_check_interval: float = 30.0,
+        checkout_timeout: float = 30.0,
+        health_check_query: str = "SELECT 1",
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self.factory = factory
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.checkout_timeout = checkout_timeout
+        self.health_check_query = health_check_query
+
+        self._idle: List[_PooledConnection] = []
+        self._open_count = 0
+        self._closed = False
+        self._condition = threading.Condition(threading.Lock())
+        self._local = threading.local()
+
+        self._stats = {"created": 0, "reused": 0, "discarded": 0, "waits": 0}
+
+    @contextmanager
+    def connection(self):
+        """
+        Checks out a connection for the current thread.
+
+        On a clean exit the connection is rolled back (anything that should persist
+        must already be committed) and returned to the pool. If the body raises, the
+        connection is rolled back and re-validated on its next checkout, or discarded
+        if the rollback itself fails.
+
+        :return: A raw DB-API connection.
+        """
+        held: Optional[_PooledConnection] = getattr(self._local, "conn", None)
+        if held is not None:
+            self._local.depth += 1
+            try:
+                yield held.raw
+            finally:
+                self._local.depth -= 1
+            return
+
+        pooled = self._checkout()
+        self._local.conn = pooled
+        self._local.depth = 1
+        failed = False
+
+        try:
+            yield pooled.raw
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._local.conn = None
+            self._local.depth = 0
+            self._checkin(pooled, failed)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns counters describing pool usage.
+
+        :return: Created/reused/discarded connection counts, waits and the current open/idle sizes.
+        :rtype: Dict[str, int]
+        """
+        with self._condition:
+            return {
+                **self._stats,
+                "open": self._open_count,
+                "idle": len(self._idle),
+            }
+
+    def close_all(self) -> None:
+        """
+        Closes every idle connection and refuses further checkouts.
+
+        Connections currently checked out are closed when they are returned.
+        """
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open_count -= len(idle)
+            self._condition.notify_all()
+
+        for pooled in idle:
+            self._close(pooled)
+
+    def _checkout(self) -> _PooledConnection:
+        deadline = time.monotonic() + self.checkout_timeout
+
+        while True:
+            stale: List[_PooledConnection] = []
+            candidate: Optional[_PooledConnection] = None
+            create = False
+
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed.")
+
+                now = time.monotonic()
+                while self._idle:
+                    pooled = (
+                        self._idle.pop()
+                    )  # LIFO keeps the warmest connection in use
+                    if now - pooled.last_used > self.idle_timeout:
+                        stale.append(pooled)
+                        self._open_count -= 1
+                        continue
+                    candidate = pooled
+                    break
+
+                if candidate is None:
+                    if self._open_count < self.max_size:
+                        self._open_count += 1
+                        create = True
+                    elif not stale:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise PoolTimeoutError(
+                                f"Timed out after {self.checkout_timeout}s waiting for a database connection."
+                            )
+                        self._stats["waits"] += 1
+                        self._condition.wait(remaining)
+                        continue
+
+            for pooled in stale:
+                self._close(pooled)
+
+            if create:
+                return self._create()
+
+            if candidate is None:
+                continue
+
+            if self._is_healthy(candidate):
+                with self._condition:
+                    self._stats["reused"] += 1
+                return candidate
+
+            self._discard(candidate)
+
+    def _checkin(self, pooled: _PooledConnection, failed: bool) -> None:
+        try:
+            pooled.raw.rollback()
+        except Exception as e:
+            LOGGER.warning(f"Discarding connection after failed rollback: {e}")
+            self._discard(pooled)
+            return
+
+        pooled.last_used = time.monotonic()
+        if failed:
+            pooled.last_checked = 0.0  # force a health check on the next checkout
+
+        with self._condition:
+            if not self._closed:
+                self._idle.append(pooled)
+                self._condition.notify()
+                return
+            self._open_count -= 1
+
+        self._close(pooled)
+
+    def _create(self) -> _PooledConnection:
+        try:
+            raw = self.factory()
+        except BaseException:
+            with self._condition:
+                self._open_count -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self._stats["created"] += 1
+        return _PooledConnection(raw)
+
+    def _is_healthy(self, pooled: _PooledConnection) -> bool:
+        now = time.monotonic()
+        if now - pooled.last_checked < self.health_check_interval:
+            return True
+
+        try:
+            cursor = pooled.raw.cursor()
+            try:
+                cursor.execute(self.health_check_query)
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            pooled.raw.rollback()
+        except Exception as e:
+            LOGGER.warning(f"Pooled connection failed health check: {e}")
+            return False
+
+        pooled.last_checked = now
+        return True
+
+    def _discard(self, pooled: _PooledConnection) -> None:
+        with self._condition:
+            self._open_count -= 1
+            self._stats["discarded"] += 1
+            self._condition.notify()
+        self._close(pooled)
+
+    @staticmethod
+    def _close(pooled: _PooledConnection) -> None:
+        try:
+            pooled.raw.close()
+        except Exception:
+            pass
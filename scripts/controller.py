@@ -1,229 +1,581 @@
-import win32com.client
-import pythoncom
-import pywintypes
-from typing import Dict
-import json
-from scripts import mie_trak_funcs
-from base_logger import getlogger
-
-
-DEPARTMENT_DATA_FILE = (
-    r"C:\PythonProjects\QuickViewDashboardAccess\data\department_data.json"
-)
-LOGGER = getlogger("Controller")
-
-
-class Controller:
-    """
-    Manages department-related data, including caching and dashboard/QuickView assignments.
-
-    This class provides functionality to read and write cached department information,
-    assign and remove dashboards and QuickViews for all users in a department, and
-    update the cache accordingly.
-    """
-
-    def __init__(self) -> None:
-        """
-        Initializes the Controller and loads department information from the cache.
-        """
-        self.cache_dict = self.get_department_information_from_cache()
-
-    def get_department_information_from_cache(self) -> Dict:
-        """
-        Loads department information from a cached JSON file.
-
-        :return: A dictionary containing department information.
-        :raises ValueError: If the cache file cannot be read.
-        """
-        try:
-            with open(DEPARTMENT_DATA_FILE, "r") as jsonfile:
-                return json.load(jsonfile)
-        except Exception as e:
-            LOGGER.critical(e)
-            raise ValueError
-
-    def write_cache(self) -> None:
-        """
-        Writes the current cache data to a JSON file.
-
-        :raises ValueError: If the cache file cannot be written.
-        """
-        try:
-            with open(DEPARTMENT_DATA_FILE, "w") as jsonfile:
-                json.dump(self.cache_dict, jsonfile, indent=4)
-                LOGGER.info("Cache Updated")
-        except Exception as e:
-            LOGGER.critical(e)
-            raise ValueError
-
-    def add_dashboard_to_department(self, departmentpk: int, dashboardpk: int):
-        """
-        Adds a dashboard to all users in a department.
-
-        :param departmentpk: Primary key of the department.
-        :type departmentpk: int
-        :param dashboardpk: Primary key of the dashboard.
-        :type dashboardpk: int
-        """
-        department_users = mie_trak_funcs.get_users_in_department(departmentpk).keys()
-
-        for userpk in department_users:
-            mie_trak_funcs.add_dashboard_to_user(str(dashboardpk), userpk)
-
-        dashboard_description = mie_trak_funcs.get_entry_from_table(
-            "Dashboard", dashboardpk
-        ).get("Description")
-
-        if dashboard_description:
-            self.cache_dict[str(departmentpk)]["accessed_dashboards"].setdefault(
-                dashboardpk, dashboard_description
-            )
-            LOGGER.info(
-                f"Added Dashboard: {dashboardpk} to Department: {departmentpk}."
-            )
-            self.write_cache()
-
-    def delete_dashboard_from_department(self, departmentpk: int, dashboardpk: int):
-        """
-        Removes a dashboard from all users in a department.
-
-        :param departmentpk: Primary key of the department.
-        :type departmentpk: int
-        :param dashboardpk: Primary key of the dashboard.
-        :type dashboardpk: int
-        """
-        department_users = mie_trak_funcs.get_users_in_department(departmentpk).keys()
-
-        for userpk in department_users:
-            mie_trak_funcs.delete_dashboard_from_user(userpk, dashboardpk)
-
-        self.cache_dict[str(departmentpk)]["accessed_dashboards"].pop(
-            str(dashboardpk), None
-        )
-        LOGGER.info(
-            f"Deleted Dashboard: {dashboardpk} from department: {departmentpk}."
-        )
-        self.write_cache()
-
-    def add_quickview_to_department(self, departmentpk: int, quickviewpk: int):
-        """
-        Adds a QuickView to all users in a department.
-
-        :param departmentpk: Primary key of the department.
-        :type departmentpk: int
-        :param quickviewpk: Primary key of the QuickView.
-        :type quickviewpk: int
-        """
-        department_users = mie_trak_funcs.get_users_in_department(departmentpk).keys()
-
-        for userpk in department_users:
-            mie_trak_funcs.add_quickview_to_user(str(quickviewpk), userpk)
-
-        quickview_name = mie_trak_funcs.get_entry_from_table(
-            "QuickView", quickviewpk
-        ).get("Description")
-
-        if quickview_name:
-            self.cache_dict[str(departmentpk)].setdefault("accessed_quickviews", {})
-
-            self.cache_dict[str(departmentpk)]["accessed_quickviews"].setdefault(
-                quickviewpk, quickview_name
-            )
-            LOGGER.info(
-                f"Added Quickview: {quickviewpk} to Department: {departmentpk}."
-            )
-            self.write_cache()
-
-    def delete_quickview_from_department(
-        self, departmentpk: int, quickviewpk: int
-    ) -> None:
-        """
-        Removes a QuickView from all users in a department.
-
-        :param cursor: Database cursor.
-        :type cursor: pyodbc.Cursor
-        :param departmentpk: Primary key of the department.
-        :type departmentpk: int
-        :param quickviewpk: Primary key of the QuickView.
-        :type quickviewpk: int
-        """
-        department_users = mie_trak_funcs.get_users_in_department(departmentpk).keys()
-
-        for userpk in department_users:
-            mie_trak_funcs.delete_quickview_from_user(userpk, quickviewpk)
-
-        self.cache_dict[str(departmentpk)]["accessed_quickviews"].pop(
-            str(quickviewpk), None
-        )
-        LOGGER.info(
-            f"Deleted QuickView: {quickviewpk} from department: {departmentpk}."
-        )
-        self.write_cache()
-
-    def add_doc_group_to_department(self, departmentpk: int, doc_group_pk: int):
-        department_users = mie_trak_funcs.get_users_in_department(departmentpk).keys()
-
-        for userpk in department_users:
-            mie_trak_funcs.add_document_group_to_user(doc_group_pk, userpk)
-
-        doc_group_code = mie_trak_funcs.get_entry_from_table(
-            "DocumentGroup", doc_group_pk
-        ).get("Code")
-
-        if doc_group_code:
-            self.cache_dict[str(departmentpk)].setdefault("accessed_documentgroups", {})
-
-            self.cache_dict[str(departmentpk)]["accessed_documentgroups"].setdefault(
-                doc_group_pk, doc_group_code
-            )
-
-            LOGGER.info(
-                f"Added Quickview: PK: {doc_group_pk} CODE: {doc_group_code} to Department: {departmentpk}."
-            )
-
-            self.write_cache()
-
-    def delete_doc_group_from_department(self, departmentpk: int, doc_group_pk: int):
-        department_users = mie_trak_funcs.get_users_in_department(departmentpk).keys()
-
-        for userpk in department_users:
-            mie_trak_funcs.delete_document_group_from_user(userpk, doc_group_pk)
-
-        doc_group_code = self.cache_dict[str(departmentpk)][
-            "accessed_documentgroups"
-        ].get(doc_group_pk, None)
-
-        self.cache_dict[str(departmentpk)]["accessed_documentgroups"].pop(
-            str(doc_group_pk), None
-        )
-
-        LOGGER.info(
-            f"Deleted DocumentGroup PK: {doc_group_pk} CODE: {doc_group_code} from department: {departmentpk}."
-        )
-
-        self.write_cache()
-
-
-def send_email(to: str, subject: str, body: str):
-    try:
-        pythoncom.CoInitialize()  # understand why.
-
-        try:
-            outlook = win32com.client.GetActiveObject("Outlook.Application")
-            LOGGER.info("Outlook application running...")
-        except pywintypes.com_error:
-            outlook = win32com.client.Dispatch("Outlook.Application")
-
-        mail = outlook.CreateItem(0)
-        mail.Subject = subject
-        mail.To = to
-        mail.Body = body
-
-        try:
-            mail.Send()
-            LOGGER.info(f"Email Sent to - {to}")
-        except pywintypes.com_error as e:
-            LOGGER.critical(f"Failed to send email: {e}")
-
-    except Exception as e:
-        LOGGER.error(f"Unexpected error: {e}")
+import threading
+from typing import Dict, List
+from scripts import mie_trak_funcs
+from scripts.email_outbox import EmailOutbox, OutlookTransport
+from scripts.department_access import derive_department_access
+from scripts.department_store import ACCESSED_KEYS, DepartmentStore
+from scripts.permission_matrix import PermissionMatrix
+from base_logger import getlogger
+
+
+# Legacy JSON cache, only read once to seed DEPARTMENT_STORE_FILE.
+DEPARTMENT_DATA_FILE = (
+    r"C:\PythonProjects\QuickViewDashboardAccess\data\department_data.json"
+)
+DEPARTMENT_STORE_FILE = (
+    r"C:\PythonProjects\QuickViewDashboardAccess\data\department_access.db"
+)
+EMAIL_OUTBOX_FILE = (
+    r"C:\PythonProjects\QuickViewDashboardAccess\data\email_outbox.jsonl"
+)
+LOGGER = getlogger("Controller")
+
+# Cached lookup of every item (PK -> label) of each item table.
+ALL_ITEMS_FUNCS = {
+    "Dashboard": mie_trak_funcs.get_all_dashboards,
+    "QuickView": mie_trak_funcs.get_all_quickviews,
+    "DocumentGroup": mie_trak_funcs.get_all_document_groups,
+}
+
+
+class Controller:
+    """
+    Manages department-related data, including caching and dashboard/QuickView assignments.
+
+    This class provides functionality to read and write cached department information,
+    assign and remove dashboards and QuickViews for all users in a department, and
+    update the cache accordingly. User access is answered from an in-memory
+    `PermissionMatrix` that every write made through the controller keeps up to date.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes the Controller and loads department information from the department store.
+
+        The store is created from department_data.json the first time it is opened.
+        """
+        self.store = DepartmentStore(DEPARTMENT_STORE_FILE, DEPARTMENT_DATA_FILE)
+        self.cache_dict = self.store.load()
+        self.permissions = PermissionMatrix()
+
+        self._department_access = None
+        # Bumped by every invalidation, a derivation started before one is not kept.
+        self._department_access_generation = 0
+        self._department_access_lock = threading.Lock()
+        # Lets a single derivation run at a time, the GUI asks from several threads.
+        self._derive_lock = threading.Lock()
+
+    def get_department_access(self, refresh: bool = False) -> Dict[int, Dict]:
+        """
+        Returns department access derived from the link tables, see `derive_department_access`.
+
+        The derivation is kept until `refresh` is set or a write made through the
+        Controller invalidates it. Safe to call from several threads: one derivation
+        runs at a time and one that overlaps a write is returned but not kept.
+
+        :param refresh: Derive again even if a result is kept.
+        :type refresh: bool
+        :return: Derived access keyed by DepartmentPK.
+        :rtype: Dict[int, Dict]
+        """
+        department_access = self._department_access
+        if not refresh and department_access is not None:
+            return department_access
+
+        with self._derive_lock:
+            with self._department_access_lock:
+                if not refresh and self._department_access is not None:
+                    return self._department_access  # Derived while waiting.
+                generation = self._department_access_generation
+
+            department_access = derive_department_access()
+
+            with self._department_access_lock:
+                if self._department_access_generation == generation:
+                    self._department_access = department_access
+
+        return department_access
+
+    def _invalidate_department_access(self) -> None:
+        """
+        Drops the derived department access after a write to the link tables.
+        """
+        with self._department_access_lock:
+            self._department_access = None
+            self._department_access_generation += 1
+
+    def get_user_items(self, userpk: int, item_table: str) -> Dict[str, str]:
+        """
+        Returns the items of one table a user has access to, served from the permission matrix.
+
+        :param userpk: Primary key of the user.
+        :type userpk: int
+        :param item_table: One of "Dashboard", "QuickView" or "DocumentGroup".
+        :type item_table: str
+        :return: Mapping of item primary key to label.
+        :rtype: Dict[str, str]
+        """
+        self.permissions.ensure_loaded()
+        all_items = ALL_ITEMS_FUNCS[item_table]()
+
+        labels = {}
+        for item_pk in self.permissions.items_for_user(item_table, userpk):
+            label = all_items.get(str(item_pk))
+            if label:
+                labels[str(item_pk)] = label
+
+        return labels
+
+    def add_items_to_user(
+        self, userpk: int, items: Dict[str, List[int]]
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Adds a selection of dashboards, QuickViews and document groups to a user.
+
+        :param userpk: Primary key of the user.
+        :type userpk: int
+        :param items: Item primary keys keyed by item table ("Dashboard", "QuickView", "DocumentGroup").
+        :type items: Dict[str, List[int]]
+        :return: Inserted and skipped (already linked) pair counts keyed by item table.
+        :rtype: Dict[str, Dict[str, int]]
+        """
+        return self.add_items_to_users([userpk], items)
+
+    def add_items_to_users(
+        self, user_pks: List[int], items: Dict[str, List[int]]
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Adds a selection of dashboards, QuickViews and document groups to many users.
+
+        :param user_pks: Primary keys of the users.
+        :type user_pks: List[int]
+        :param items: Item primary keys keyed by item table ("Dashboard", "QuickView", "DocumentGroup").
+        :type items: Dict[str, List[int]]
+        :return: Inserted and skipped (already linked) pair counts keyed by item table.
+        :rtype: Dict[str, Dict[str, int]]
+        """
+        result = mie_trak_funcs.add_items_to_users(user_pks, items)
+        self._invalidate_department_access()
+
+        for item_table, item_pks in items.items():
+            self.permissions.grant(item_table, user_pks, item_pks)
+
+        return result
+
+    def delete_items_from_user(
+        self, userpk: int, item_table: str, item_pks: List[int]
+    ) -> int:
+        """
+        Removes many items of one type from a user.
+
+        :param userpk: Primary key of the user.
+        :type userpk: int
+        :param item_table: One of "Dashboard", "QuickView" or "DocumentGroup".
+        :type item_table: str
+        :param item_pks: Primary keys of the items to remove.
+        :type item_pks: List[int]
+        :return: Number of link rows deleted.
+        :rtype: int
+        """
+        deleted = mie_trak_funcs.delete_items_from_users(item_table, item_pks, [userpk])
+        self._invalidate_department_access()
+        self.permissions.revoke(item_table, [userpk], item_pks)
+
+        return deleted
+
+    def add_user_links(
+        self, item_table: str, pairs: List[tuple[int, int]]
+    ) -> List[tuple[int, int]]:
+        """
+        Grants items with `mie_trak_funcs.add_user_links`, keeping the permission
+        matrix and the department access in sync.
+
+        :return: The pairs that were inserted.
+        :rtype: List[tuple[int, int]]
+        """
+        inserted = mie_trak_funcs.add_user_links(item_table, pairs)
+        self._invalidate_department_access()
+
+        for userpk, item_pk in pairs:
+            self.permissions.grant(item_table, [userpk], [item_pk])
+
+        return inserted
+
+    def delete_user_links(
+        self, item_table: str, pairs: List[tuple[int, int]]
+    ) -> List[tuple[int, int]]:
+        """
+        Revokes items with `mie_trak_funcs.delete_user_links`, keeping the permission
+        matrix and the department access in sync.
+
+        :return: The pairs that were deleted.
+        :rtype: List[tuple[int, int]]
+        """
+        deleted = mie_trak_funcs.delete_user_links(item_table, pairs)
+        self._invalidate_department_access()
+
+        for userpk, item_pk in pairs:
+            self.permissions.revoke(item_table, [userpk], [item_pk])
+
+        return deleted
+
+    def record_department_grants(
+        self, item_table: str, department_items: Dict[int, List[int]]
+    ) -> None:
+        """
+        Records in the department store that departments were granted items.
+
+        Only updates the store, the link rows are written by `add_user_links`.
+
+        :param item_table: One of "Dashboard", "QuickView" or "DocumentGroup".
+        :type item_table: str
+        :param department_items: Granted item primary keys keyed by DepartmentPK.
+        :type department_items: Dict[int, List[int]]
+        """
+        item_pks = {int(pk) for pks in department_items.values() for pk in pks}
+        labels = mie_trak_funcs.get_item_labels(item_table, list(item_pks))
+
+        for departmentpk, pks in department_items.items():
+            items = {str(pk): labels[str(pk)] for pk in pks if str(pk) in labels}
+            if items:
+                self._record_department_items(departmentpk, item_table, items)
+
+    def forget_department_grants(
+        self, item_table: str, department_items: Dict[int, List[int]]
+    ) -> None:
+        """
+        Records in the department store that items were revoked from departments.
+
+        Only updates the store, the link rows are deleted by `delete_user_links`.
+
+        :param item_table: One of "Dashboard", "QuickView" or "DocumentGroup".
+        :type item_table: str
+        :param department_items: Revoked item primary keys keyed by DepartmentPK.
+        :type department_items: Dict[int, List[int]]
+        """
+        for departmentpk, pks in department_items.items():
+            self._forget_department_items(departmentpk, item_table, pks)
+
+    def _department_members(self, departmentpk: int) -> List[int]:
+        """
+        Returns the UserPKs of a department, only queried when the permission matrix needs patching.
+        """
+        if self.permissions.loaded_at is None:
+            return []
+        return list(mie_trak_funcs.get_users_in_department(departmentpk).keys())
+
+    def get_department_information_from_cache(self) -> Dict:
+        """
+        Returns department information.
+
+        Served from memory, the department store is only read when the Controller is created.
+
+        :return: A dictionary containing department information.
+        """
+        return self.cache_dict
+
+    def write_cache(self) -> None:
+        """
+        Writes the whole cache to the department store.
+
+        Changes made through the Controller are already persisted one row at a time,
+        this is only needed after editing `cache_dict` by hand.
+
+        :raises ValueError: If the store cannot be written.
+        """
+        try:
+            self.store.replace_all(self.cache_dict)
+            LOGGER.info("Cache Updated")
+        except Exception as e:
+            LOGGER.critical(e)
+            raise ValueError
+
+    def _record_department_items(
+        self, departmentpk: int, item_table: str, items: Dict[str, str]
+    ) -> None:
+        """
+        Adds items to a department in the cache and persists only those rows.
+        """
+        if str(departmentpk) not in self.cache_dict:
+            name = mie_trak_funcs.get_department_name(departmentpk)
+            self.cache_dict[str(departmentpk)] = {"name": name}
+            self.store.put_department(departmentpk, name)
+
+        accessed_items = self.cache_dict[str(departmentpk)].setdefault(
+            ACCESSED_KEYS[item_table], {}
+        )
+        new_items = {
+            str(pk): label
+            for pk, label in items.items()
+            if str(pk) not in accessed_items
+        }
+        accessed_items.update(new_items)
+        self.store.put_items(departmentpk, item_table, new_items)
+
+    def _forget_department_items(
+        self, departmentpk: int, item_table: str, item_pks: List
+    ) -> Dict[str, str]:
+        """
+        Removes items from a department in the cache and persists only those rows.
+        """
+        accessed_items = self.cache_dict.get(str(departmentpk), {}).get(
+            ACCESSED_KEYS[item_table], {}
+        )
+        removed = {str(pk): accessed_items.pop(str(pk), None) for pk in item_pks}
+        self.store.remove_items(departmentpk, item_table, removed.keys())
+
+        return removed
+
+    def add_dashboard_to_department(
+        self, departmentpk: int, dashboardpk: int
+    ) -> Dict[str, List[int]]:
+        """
+        Adds a dashboard to all users in a department.
+
+        :param departmentpk: Primary key of the department.
+        :type departmentpk: int
+        :param dashboardpk: Primary key of the dashboard.
+        :type dashboardpk: int
+        :return: UserPKs that were granted the dashboard ("inserted") and that already had it ("skipped").
+        :rtype: Dict[str, List[int]]
+        """
+        result = mie_trak_funcs.add_dashboard_to_department(dashboardpk, departmentpk)
+        self._invalidate_department_access()
+        self.permissions.grant(
+            "Dashboard", result["inserted"] + result["skipped"], [dashboardpk]
+        )
+
+        dashboard_description = mie_trak_funcs.get_entry_from_table(
+            "Dashboard", dashboardpk
+        ).get("Description")
+
+        if dashboard_description:
+            self._record_department_items(
+                departmentpk, "Dashboard", {dashboardpk: dashboard_description}
+            )
+            LOGGER.info(
+                f"Added Dashboard: {dashboardpk} to Department: {departmentpk}. "
+                f"Inserted: {len(result['inserted'])} Skipped: {len(result['skipped'])}"
+            )
+
+        return result
+
+    def delete_dashboard_from_department(self, departmentpk: int, dashboardpk: int):
+        """
+        Removes a dashboard from all users in a department.
+
+        :param departmentpk: Primary key of the department.
+        :type departmentpk: int
+        :param dashboardpk: Primary key of the dashboard.
+        :type dashboardpk: int
+        """
+        self.delete_items_from_department(departmentpk, "Dashboard", [dashboardpk])
+
+    def add_quickview_to_department(
+        self, departmentpk: int, quickviewpk: int
+    ) -> Dict[str, List[int]]:
+        """
+        Adds a QuickView to all users in a department.
+
+        :param departmentpk: Primary key of the department.
+        :type departmentpk: int
+        :param quickviewpk: Primary key of the QuickView.
+        :type quickviewpk: int
+        :return: UserPKs that were granted the QuickView ("inserted") and that already had it ("skipped").
+        :rtype: Dict[str, List[int]]
+        """
+        result = mie_trak_funcs.add_quickview_to_department(quickviewpk, departmentpk)
+        self._invalidate_department_access()
+        self.permissions.grant(
+            "QuickView", result["inserted"] + result["skipped"], [quickviewpk]
+        )
+
+        quickview_name = mie_trak_funcs.get_entry_from_table(
+            "QuickView", quickviewpk
+        ).get("Description")
+
+        if quickview_name:
+            self._record_department_items(
+                departmentpk, "QuickView", {quickviewpk: quickview_name}
+            )
+            LOGGER.info(
+                f"Added Quickview: {quickviewpk} to Department: {departmentpk}. "
+                f"Inserted: {len(result['inserted'])} Skipped: {len(result['skipped'])}"
+            )
+
+        return result
+
+    def delete_quickview_from_department(
+        self, departmentpk: int, quickviewpk: int
+    ) -> None:
+        """
+        Removes a QuickView from all users in a department.
+
+        :param cursor: Database cursor.
+        :type cursor: pyodbc.Cursor
+        :param departmentpk: Primary key of the department.
+        :type departmentpk: int
+        :param quickviewpk: Primary key of the QuickView.
+        :type quickviewpk: int
+        """
+        self.delete_items_from_department(departmentpk, "QuickView", [quickviewpk])
+
+    def add_doc_group_to_department(
+        self, departmentpk: int, doc_group_pk: int
+    ) -> Dict[str, List[int]]:
+        result = mie_trak_funcs.add_document_group_to_department(
+            doc_group_pk, departmentpk
+        )
+        self._invalidate_department_access()
+        self.permissions.grant(
+            "DocumentGroup", result["inserted"] + result["skipped"], [doc_group_pk]
+        )
+
+        doc_group_code = mie_trak_funcs.get_entry_from_table(
+            "DocumentGroup", doc_group_pk
+        ).get("Code")
+
+        if doc_group_code:
+            self._record_department_items(
+                departmentpk, "DocumentGroup", {doc_group_pk: doc_group_code}
+            )
+
+            LOGGER.info(
+                f"Added DocumentGroup: PK: {doc_group_pk} CODE: {doc_group_code} to Department: {departmentpk}. "
+                f"Inserted: {len(result['inserted'])} Skipped: {len(result['skipped'])}"
+            )
+
+        return result
+
+    def delete_doc_group_from_department(self, departmentpk: int, doc_group_pk: int):
+        self.delete_items_from_department(departmentpk, "DocumentGroup", [doc_group_pk])
+
+    def add_items_to_department(
+        self, departmentpk: int, items: Dict[str, List[int]]
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Adds a whole selection of dashboards, QuickViews and document groups to all users in a department.
+
+        All link rows are inserted in a single transaction and only the new cache rows are written.
+
+        :param departmentpk: Primary key of the department.
+        :type departmentpk: int
+        :param items: Item primary keys keyed by item table ("Dashboard", "QuickView", "DocumentGroup").
+        :type items: Dict[str, List[int]]
+        :return: Inserted and skipped (already linked) pair counts keyed by item table.
+        :rtype: Dict[str, Dict[str, int]]
+        """
+        result = mie_trak_funcs.add_items_to_department(items, departmentpk)
+        self._invalidate_department_access()
+
+        members = self._department_members(departmentpk)
+        for item_table, item_pks in items.items():
+            self.permissions.grant(item_table, members, item_pks)
+
+        for item_table, item_pks in items.items():
+            if not item_pks:
+                continue
+
+            labels = mie_trak_funcs.get_item_labels(item_table, item_pks)
+            self._record_department_items(departmentpk, item_table, labels)
+
+            LOGGER.info(
+                f"Added {item_table}: {list(labels)} to Department: {departmentpk}. "
+                f"Inserted: {result[item_table]['inserted']} Skipped: {result[item_table]['skipped']}"
+            )
+
+        return result
+
+    def delete_items_from_department(
+        self, departmentpk: int, item_table: str, item_pks: List[int]
+    ) -> int:
+        """
+        Removes many items of one type from all users in a department.
+
+        All link rows are deleted in a single transaction and only the affected cache rows are written.
+
+        :param departmentpk: Primary key of the department.
+        :type departmentpk: int
+        :param item_table: One of "Dashboard", "QuickView" or "DocumentGroup".
+        :type item_table: str
+        :param item_pks: Primary keys of the items to remove.
+        :type item_pks: List[int]
+        :return: Number of link rows deleted.
+        :rtype: int
+        """
+        deleted = mie_trak_funcs.delete_items_from_department(
+            item_table, item_pks, departmentpk
+        )
+        self._invalidate_department_access()
+        self.permissions.revoke(
+            item_table, self._department_members(departmentpk), item_pks
+        )
+
+        removed = self._forget_department_items(departmentpk, item_table, item_pks)
+
+        LOGGER.info(
+            f"Deleted {item_table}: {removed} from department: {departmentpk}. "
+            f"Link rows deleted: {deleted}"
+        )
+
+        return deleted
+
+
+_EMAIL_OUTBOX: EmailOutbox | None = None
+_EMAIL_OUTBOX_LOCK = threading.Lock()
+
+
+def configure_email_outbox(transport=None, **outbox_kwargs) -> EmailOutbox:
+    """
+    Replaces the email outbox, e.g. to send through `SmtpTransport` or `FileTransport`
+    instead of Outlook. Messages still queued in the journal are sent by the new outbox.
+
+    :param transport: Transport to send with, Outlook when None.
+    :param outbox_kwargs: Forwarded to `EmailOutbox`.
+    :return: The started outbox.
+    :rtype: EmailOutbox
+    :raises RuntimeError: If the current outbox is still sending after being stopped.
+    """
+    global _EMAIL_OUTBOX
+
+    with _EMAIL_OUTBOX_LOCK:
+        if _EMAIL_OUTBOX is not None and not _EMAIL_OUTBOX.stop():
+            raise RuntimeError("The current email outbox is still sending, try again")
+
+        _EMAIL_OUTBOX = _start_email_outbox(transport, **outbox_kwargs)
+        return _EMAIL_OUTBOX
+
+
+def _start_email_outbox(transport=None, **outbox_kwargs) -> EmailOutbox:
+    outbox_kwargs.setdefault("journal_path", EMAIL_OUTBOX_FILE)
+    outbox = EmailOutbox(transport=transport or OutlookTransport(), **outbox_kwargs)
+    outbox.start()
+    return outbox
+
+
+def close_email_outbox(timeout: float | None = 5.0) -> None:
+    """
+    Gives the outbox up to ``timeout`` seconds to send what is due. Anything left
+    stays in the journal and is sent on the next start.
+    """
+    global _EMAIL_OUTBOX
+
+    with _EMAIL_OUTBOX_LOCK:
+        # A worker still sending is kept, so no second one is started on its journal.
+        if _EMAIL_OUTBOX is not None and _EMAIL_OUTBOX.stop(timeout):
+            _EMAIL_OUTBOX = None
+
+
+def send_email(to: str, subject: str, body: str) -> str | None:
+    """
+    Queues an email in the outbox and returns immediately, a background thread sends it.
+
+    Failing to queue the email is logged and never raised, so it can not fail the
+    action that sends it.
+
+    :return: Id of the queued message, None if it could not be queued.
+    :rtype: str | None
+    """
+    global _EMAIL_OUTBOX
+
+    try:
+        with _EMAIL_OUTBOX_LOCK:
+            if _EMAIL_OUTBOX is None:
+                _EMAIL_OUTBOX = _start_email_outbox()
+            outbox = _EMAIL_OUTBOX
+
+        return outbox.enqueue(to, subject, body)
+
+    except Exception as e:
+        LOGGER.error(f"Failed to queue email to {to}: {e}")
+        return None
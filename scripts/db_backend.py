@@ -0,0 +1,415 @@
+import re
+import sqlite3
+import struct
+from datetime import date, time
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+
+def _convert_time2(value: bytes | None) -> time | None:
+    """
+    Output converter for SQL Server TIME columns, which pyodbc can not convert itself.
+    """
+    if value is None:
+        return None
+    hour, minute, second, _, fraction = struct.unpack("<4hI", value)
+    return time(hour, minute, second, fraction // 1000)
+
+
+class DatabaseBackend:
+    """
+    Where `mie_trak_funcs` gets its connections from.
+
+    A backend opens DB-API connections that accept the T-SQL the module is written
+    in, and names the driver exceptions `with_db_conn` turns into `RuntimeError`:
+    ``operational_errors`` for "could not reach the database" (reported as a VPN
+    problem) and ``errors`` for everything else the driver raises.
+    """
+
+    name = "abstract"
+
+    @property
+    def operational_errors(self) -> Tuple[type, ...]:
+        return ()
+
+    @property
+    def errors(self) -> Tuple[type, ...]:
+        return ()
+
+    def connect(self) -> Any:
+        raise NotImplementedError
+
+
+class PyodbcBackend(DatabaseBackend):
+    """
+    The MIE Trak SQL Server, reached through pyodbc.
+
+    :param dsn: The ODBC connection string.
+    :type dsn: str
+    """
+
+    name = "pyodbc"
+
+    def __init__(self, dsn: str) -> None:
+        self.dsn = dsn
+
+    @property
+    def operational_errors(self) -> Tuple[type, ...]:
+        import pyodbc
+
+        return (pyodbc.OperationalError,)
+
+    @property
+    def errors(self) -> Tuple[type, ...]:
+        import pyodbc
+
+        return (pyodbc.Error,)
+
+    def connect(self) -> Any:
+        import pyodbc
+
+        conn = pyodbc.connect(self.dsn)
+        # Newer drivers return TIME as a binary struct, parse it in the driver layer
+        # instead of per row. The legacy "SQL Server" driver returns strings and skips this.
+        conn.add_output_converter(getattr(pyodbc, "SQL_SS_TIME2", -154), _convert_time2)
+        return conn
+
+
+class SqliteDialect:
+    """
+    Rewrites the T-SQL used by `mie_trak_funcs` into SQLite.
+
+    Only the constructs the module uses are handled:
+
+    - ``OUTPUT INSERTED.Column`` becomes ``RETURNING Column``.
+    - ``SELECT TOP (?)`` / ``TOP n`` becomes ``LIMIT``, moving the parameter to the end.
+    - ``#Temp`` tables become ``temp.Temp`` and ``IF OBJECT_ID(...) DROP TABLE``
+      becomes ``DROP TABLE IF EXISTS``.
+    - ``+`` next to a string literal or ``CHAR(n)`` becomes ``||``.
+    - ``ISNULL``, ``LEN``, ``LEFT`` and ``GETDATE()`` become their SQLite equivalents.
+
+    ``[User]`` style quoting and ``CHAR(n)`` work in SQLite as they are.
+    Translations are cached per statement text, for the life of the dialect.
+    """
+
+    _DROP_TEMP = re.compile(
+        r"IF\s+OBJECT_ID\(\s*'tempdb\.\.#(\w+)'\s*\)\s+IS\s+NOT\s+NULL\s+DROP\s+TABLE\s+#\1",
+        re.IGNORECASE,
+    )
+    # String literals are matched too, so a "#" inside one is left alone.
+    _TEMP_TABLE = re.compile(r"('(?:[^']|'')*')|#(\w+)")
+    _OUTPUT = re.compile(r"\bOUTPUT\s+INSERTED\.(\w+)", re.IGNORECASE)
+    _TOP = re.compile(r"\bSELECT\s+TOP\s*(?:\(\s*(\?|\d+)\s*\)|(\d+))", re.IGNORECASE)
+    _CONCAT = re.compile(
+        r"('(?:[^']|'')*'|\bCHAR\(\d+\))\s*\+\s*(?=['?\w(])"
+        r"|(?<=[\w)?])\s*\+\s*(?=('|\bCHAR\(\d+\)))",
+        re.IGNORECASE,
+    )
+    _FUNCTIONS = (
+        (re.compile(r"\bISNULL\s*\(", re.IGNORECASE), "ifnull("),
+        (re.compile(r"\bLEN\s*\(", re.IGNORECASE), "length("),
+        (re.compile(r"\bLEFT\s*\(", re.IGNORECASE), "tsql_left("),
+        (re.compile(r"\bGETDATE\s*\(\s*\)", re.IGNORECASE), "CURRENT_TIMESTAMP"),
+    )
+
+    def __init__(self) -> None:
+        self._translations: Dict[str, Tuple[str, int | None]] = {}
+
+    def translate(self, sql: str) -> Tuple[str, int | None]:
+        """
+        Returns the SQLite statement and, when a ``TOP (?)`` was moved to a ``LIMIT ?``
+        at the end, the index of the parameter that has to move with it.
+
+        :param sql: A T-SQL statement.
+        :type sql: str
+        :rtype: Tuple[str, int | None]
+        """
+        translation = self._translations.get(sql)
+        if translation is None:
+            translation = self._translations[sql] = self._translate(sql)
+        return translation
+
+    def _translate(self, sql: str) -> Tuple[str, int | None]:
+        sql = self._DROP_TEMP.sub(r"DROP TABLE IF EXISTS temp.\1", sql)
+        sql = self._TEMP_TABLE.sub(self._temp_table, sql)
+
+        for pattern, replacement in self._FUNCTIONS:
+            sql = pattern.sub(replacement, sql)
+        sql = self._CONCAT.sub(self._concat, sql)
+
+        sql, tail, moved = self._take_top(sql)
+
+        returning = self._OUTPUT.findall(sql)
+        if returning:
+            sql = self._OUTPUT.sub("", sql)
+            tail += " RETURNING " + ", ".join(returning)
+
+        if tail:
+            sql = sql.rstrip().rstrip(";") + tail
+        return sql, moved
+
+    @staticmethod
+    def _temp_table(match: re.Match) -> str:
+        return match.group(1) or f"temp.{match.group(2)}"
+
+    @staticmethod
+    def _concat(match: re.Match) -> str:
+        if match.group(1):
+            return f"{match.group(1)} || "
+        return " || "
+
+    def _take_top(self, sql: str) -> Tuple[str, str, int | None]:
+        match = self._TOP.search(sql)
+        if match is None:
+            return sql, "", None
+
+        limit = match.group(1) or match.group(2)
+        moved = sql[: match.start()].count("?") if limit == "?" else None
+        sql = sql[: match.start()] + "SELECT" + sql[match.end() :]
+        return sql, f" LIMIT {limit}", moved
+
+    def parameters(self, params: Sequence, moved: int | None) -> Sequence:
+        if moved is None:
+            return params
+        params = list(params)
+        params.append(params.pop(moved))
+        return params
+
+
+def _adapt(params: Sequence) -> Sequence:
+    """
+    Passes `date` parameters as the ISO text DATE columns are stored as, without
+    registering an adapter for every sqlite3 connection of the interpreter.
+    """
+    if not any(isinstance(param, date) for param in params):
+        return params
+    return [param.isoformat() if isinstance(param, date) else param for param in params]
+
+
+class _SqliteCursor:
+    """
+    A cursor that translates every statement with the dialect before running it.
+    """
+
+    def __init__(self, cursor: sqlite3.Cursor, dialect: SqliteDialect) -> None:
+        self._cursor = cursor
+        self._dialect = dialect
+        # Indexes of the DATE columns in the last result set.
+        self._date_columns: List[int] = []
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def execute(self, sql: str, *params) -> "_SqliteCursor":
+        # pyodbc takes the parameters as one sequence or spread out.
+        if len(params) == 1 and isinstance(params[0], (list, tuple)):
+            params = params[0]
+        sql, moved = self._dialect.translate(sql)
+        self._cursor.execute(sql, _adapt(self._dialect.parameters(params, moved)))
+        self._date_columns = [
+            index
+            for index, column in enumerate(self._cursor.description or ())
+            if column[0] in _DATE_COLUMNS
+        ]
+        return self
+
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence]) -> None:
+        sql, moved = self._dialect.translate(sql)
+        self._cursor.executemany(
+            sql,
+            (
+                _adapt(self._dialect.parameters(params, moved))
+                for params in seq_of_params
+            ),
+        )
+        self._date_columns = []
+
+    def _convert(self, row: tuple | None) -> tuple | None:
+        # DATE columns are stored as ISO text, pyodbc returns them as `date`.
+        if row is None or not self._date_columns:
+            return row
+        row = list(row)
+        for index in self._date_columns:
+            if row[index] is not None:
+                row[index] = date.fromisoformat(row[index])
+        return tuple(row)
+
+    def fetchone(self):
+        return self._convert(self._cursor.fetchone())
+
+    def fetchmany(self, size: int = 1) -> List:
+        return [self._convert(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self) -> List:
+        return [self._convert(row) for row in self._cursor.fetchall()]
+
+    def __iter__(self):
+        return (self._convert(row) for row in self._cursor)
+
+    def close(self) -> None:
+        self._cursor.close()
+
+
+class _SqliteConnection:
+    def __init__(self, conn: sqlite3.Connection, dialect: SqliteDialect) -> None:
+        self._conn = conn
+        self._dialect = dialect
+
+    def cursor(self) -> _SqliteCursor:
+        return _SqliteCursor(self._conn.cursor(), self._dialect)
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def rollback(self) -> None:
+        self._conn.rollback()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+# The subset of the MIE Trak schema this application reads and writes.
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS Department (
+    DepartmentPK INTEGER PRIMARY KEY,
+    Name TEXT
+);
+CREATE TABLE IF NOT EXISTS [User] (
+    UserPK INTEGER PRIMARY KEY,
+    FirstName TEXT,
+    LastName TEXT,
+    Code TEXT,
+    Password TEXT,
+    Email TEXT,
+    Enabled INTEGER NOT NULL DEFAULT 1,
+    DepartmentFK INTEGER REFERENCES Department (DepartmentPK)
+);
+CREATE INDEX IF NOT EXISTS IX_User_DepartmentFK ON [User] (DepartmentFK);
+CREATE INDEX IF NOT EXISTS IX_User_Code ON [User] (Code);
+
+CREATE TABLE IF NOT EXISTS Dashboard (
+    DashboardPK INTEGER PRIMARY KEY,
+    Description TEXT
+);
+CREATE TABLE IF NOT EXISTS DashboardUser (
+    DashboardUserPK INTEGER PRIMARY KEY,
+    DashboardFK INTEGER REFERENCES Dashboard (DashboardPK),
+    UserFK INTEGER REFERENCES [User] (UserPK)
+);
+CREATE INDEX IF NOT EXISTS IX_DashboardUser_UserFK ON DashboardUser (UserFK, DashboardFK);
+
+CREATE TABLE IF NOT EXISTS QuickView (
+    QuickViewPK INTEGER PRIMARY KEY,
+    Description TEXT
+);
+CREATE TABLE IF NOT EXISTS QuickViewUser (
+    QuickViewUserPK INTEGER PRIMARY KEY,
+    QuickViewFK INTEGER REFERENCES QuickView (QuickViewPK),
+    UserFK INTEGER REFERENCES [User] (UserPK)
+);
+CREATE INDEX IF NOT EXISTS IX_QuickViewUser_UserFK ON QuickViewUser (UserFK, QuickViewFK);
+
+CREATE TABLE IF NOT EXISTS DocumentGroup (
+    DocumentGroupPK INTEGER PRIMARY KEY,
+    Code TEXT,
+    Name TEXT
+);
+CREATE TABLE IF NOT EXISTS DocumentGroupUsers (
+    DocumentGroupUsersPK INTEGER PRIMARY KEY,
+    DocumentGroupFK INTEGER REFERENCES DocumentGroup (DocumentGroupPK),
+    UserFK INTEGER REFERENCES [User] (UserPK)
+);
+CREATE INDEX IF NOT EXISTS IX_DocumentGroupUsers_UserFK
+    ON DocumentGroupUsers (UserFK, DocumentGroupFK);
+
+CREATE TABLE IF NOT EXISTS VacationRequest (
+    VacationRequestPK INTEGER PRIMARY KEY,
+    EmployeeFK INTEGER REFERENCES [User] (UserPK),
+    FromDate DATE,
+    ToDate DATE,
+    StartTime TEXT,
+    Hours REAL,
+    Reason TEXT,
+    Approved INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS IX_VacationRequest_Approved
+    ON VacationRequest (Approved, VacationRequestPK);
+"""
+
+# Columns of SQLITE_SCHEMA returned as `date` by `_SqliteCursor`.
+_DATE_COLUMNS = frozenset(re.findall(r"(\w+)\s+DATE\b", SQLITE_SCHEMA))
+
+
+class SqliteBackend(DatabaseBackend):
+    """
+    An SQLite stand-in for the MIE Trak database, to run and benchmark the module
+    without the VPN.
+
+    Statements go through `SqliteDialect`, so every `mie_trak_funcs` function runs
+    unchanged. The schema (`SQLITE_SCHEMA`) is created when the backend is built;
+    fill it with `scripts.synthetic_data` or through `raw_connection`. DATE columns
+    are stored as ISO text and come back as `date` through `connect`, StartTime is
+    stored as the "HH:MM:SS.fffffff" text the legacy SQL Server driver returns.
+
+    :param path: The database file, or ":memory:" for a database shared by the
+        connections of this backend and dropped with it.
+    :type path: str
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self.path = path
+        self.dialect = SqliteDialect()
+        self._keep_alive = None
+
+        if path == ":memory:":
+            # Every connection to the same shared-cache URI sees the same database,
+            # which lives as long as one of them is open.
+            self._uri = f"file:mietrak-{id(self)}?mode=memory&cache=shared"
+        else:
+            self._uri = None
+
+        self._keep_alive = self._open()
+        self._keep_alive.executescript(SQLITE_SCHEMA)
+
+    @property
+    def errors(self) -> Tuple[type, ...]:
+        # Every SQLite error is a database error: its OperationalError also covers
+        # SQL mistakes, it never means the network is down.
+        return (sqlite3.Error,)
+
+    def _open(self) -> sqlite3.Connection:
+        if self._uri:
+            conn = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.create_function(
+            "tsql_left",
+            2,
+            lambda text, length: None if text is None else text[:length],
+            deterministic=True,
+        )
+        return conn
+
+    def connect(self) -> _SqliteConnection:
+        """
+        Opens a connection. The pool checks each one out to a single thread at a time.
+        """
+        return _SqliteConnection(self._open(), self.dialect)
+
+    def raw_connection(self) -> sqlite3.Connection:
+        """
+        Returns the backend's own sqlite3 connection, for loading data in bulk.
+        Statements are not translated and dates are not converted on it.
+        """
+        return self._keep_alive
+
+    def close(self) -> None:
+        if self._keep_alive is not None:
+            self._keep_alive.close()
+            self._keep_alive = None
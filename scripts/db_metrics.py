@@ -0,0 +1,328 @@
+import bisect
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List
+from base_logger import getlogger
+
+
+LOGGER = getlogger("DB Metrics")
+
+# Phases of a decorated call, as recorded per function.
+PHASES = ("total", "connect", "execute", "fetch", "commit")
+
+# Histogram bucket upper bounds in seconds: 0.1 ms to about 2 minutes, 25% apart.
+BUCKET_BOUNDS = tuple(0.0001 * 1.25**i for i in range(64))
+
+# Characters of a statement kept for the slow query log.
+_STATEMENT_PREVIEW = 300
+
+
+class LatencyHistogram:
+    """
+    Counts durations in fixed, geometrically spaced buckets.
+
+    Memory stays constant however many calls are recorded. Percentiles are
+    interpolated within their bucket, so they are accurate to about the 25% bucket
+    width, which is plenty to tell a 5 ms query from a 500 ms one.
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)  # The last bucket is +Inf.
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, share: float) -> float:
+        """
+        Returns the duration below which ``share`` (0 to 1) of the observations fall.
+        """
+        if not self.count:
+            return 0.0
+
+        rank = share * self.count
+        seen = 0
+        for bucket, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = BUCKET_BOUNDS[bucket - 1] if bucket else 0.0
+                upper = (
+                    BUCKET_BOUNDS[bucket] if bucket < len(BUCKET_BOUNDS) else self.max
+                )
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(estimate, self.max)
+            seen += bucket_count
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+        }
+
+
+class _FunctionMetrics:
+    __slots__ = ("calls", "errors", "rows", "statements", "phases")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.statements = 0
+        self.phases = {phase: LatencyHistogram() for phase in PHASES}
+
+
+class CallTimer:
+    """
+    Timings of one decorated call, filled in by `with_db_conn` and `InstrumentedCursor`.
+    """
+
+    __slots__ = ("name", "started", "phases", "rows", "statements")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.started = time.perf_counter()
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.rows = 0
+        self.statements: List[str] = []
+
+    def connected(self) -> None:
+        """
+        Marks the connection as checked out, the time since the start is "connect".
+        """
+        self.phases["connect"] = time.perf_counter() - self.started
+
+    def run(self, phase: str, method: Callable, *args) -> Any:
+        """
+        Calls ``method`` and adds its duration to ``phase``.
+        """
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            self.phases[phase] += time.perf_counter() - started
+
+
+class InstrumentedCursor:
+    """
+    Wraps a DB-API cursor and charges its execute and fetch time to a `CallTimer`.
+
+    Everything the wrapper does not time (``rowcount``, ``description``,
+    ``fast_executemany``, ...) is passed through to the wrapped cursor.
+    """
+
+    __slots__ = ("_cursor", "_timer")
+
+    def __init__(self, cursor: Any, timer: CallTimer) -> None:
+        object.__setattr__(self, "_cursor", cursor)
+        object.__setattr__(self, "_timer", timer)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._cursor, name, value)
+
+    def execute(self, sql: str, *params) -> "InstrumentedCursor":
+        self._timer.statements.append(sql)
+        self._timer.run("execute", self._cursor.execute, sql, *params)
+        return self
+
+    def executemany(self, sql: str, seq_of_params) -> None:
+        self._timer.statements.append(sql)
+        self._timer.run("execute", self._cursor.executemany, sql, seq_of_params)
+
+    def fetchone(self):
+        row = self._timer.run("fetch", self._cursor.fetchone)
+        if row is not None:
+            self._timer.rows += 1
+        return row
+
+    def fetchmany(self, *size):
+        rows = self._timer.run("fetch", self._cursor.fetchmany, *size)
+        self._timer.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._timer.run("fetch", self._cursor.fetchall)
+        self._timer.rows += len(rows)
+        return rows
+
+    def __iter__(self) -> Iterator:
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+
+class QueryMetrics:
+    """
+    Per function call counts, row counts and latency histograms of the database layer.
+
+    `with_db_conn` records every decorated call: the total time and how it splits into
+    checking a connection out of the pool ("connect"), running statements
+    ("execute"), reading results ("fetch") and committing. Calls slower than
+    ``slow_query_threshold`` seconds are logged with the statements they ran.
+
+    :param enabled: When False `with_db_conn` does not wrap cursors or record anything.
+    :type enabled: bool
+    :param slow_query_threshold: Seconds above which a call is logged, None to never log.
+    :type slow_query_threshold: float | None
+    """
+
+    def __init__(
+        self, enabled: bool = True, slow_query_threshold: float | None = None
+    ) -> None:
+        self.enabled = enabled
+        self.slow_query_threshold = slow_query_threshold
+        self._functions: Dict[str, _FunctionMetrics] = {}
+        self._lock = threading.Lock()
+
+    def start(self, name: str) -> CallTimer:
+        return CallTimer(name)
+
+    def finish(self, timer: CallTimer, failed: bool = False) -> None:
+        """
+        Records a finished call.
+
+        :param timer: The timer returned by `start` for the call.
+        :type timer: CallTimer
+        :param failed: Whether the call raised.
+        :type failed: bool
+        """
+        timer.phases["total"] = time.perf_counter() - timer.started
+
+        with self._lock:
+            metrics = self._functions.get(timer.name)
+            if metrics is None:
+                metrics = self._functions[timer.name] = _FunctionMetrics()
+
+            metrics.calls += 1
+            metrics.errors += failed
+            metrics.rows += timer.rows
+            metrics.statements += len(timer.statements)
+            for phase, seconds in timer.phases.items():
+                metrics.phases[phase].observe(seconds)
+
+        threshold = self.slow_query_threshold
+        if threshold is not None and timer.phases["total"] >= threshold:
+            self._log_slow(timer)
+
+    def _log_slow(self, timer: CallTimer) -> None:
+        phases = ", ".join(
+            f"{phase} {seconds * 1000:.1f} ms"
+            for phase, seconds in timer.phases.items()
+            if phase != "total"
+        )
+        statements = "\n".join(
+            " ".join(sql.split())[:_STATEMENT_PREVIEW] for sql in timer.statements
+        )
+        LOGGER.warning(
+            f"Slow query in {timer.name}: {timer.phases['total'] * 1000:.1f} ms "
+            f"({phases}), {timer.rows} rows\n{statements}"
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._functions.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the metrics of every function that was called, slowest total p95 first.
+
+        :return: ``{function: {"calls", "errors", "rows", "statements", "latency": {phase: summary}}}``
+            with latencies in seconds.
+        :rtype: Dict[str, Dict[str, Any]]
+        """
+        with self._lock:
+            snapshot = {
+                name: {
+                    "calls": metrics.calls,
+                    "errors": metrics.errors,
+                    "rows": metrics.rows,
+                    "statements": metrics.statements,
+                    "latency": {
+                        phase: histogram.summary()
+                        for phase, histogram in metrics.phases.items()
+                    },
+                }
+                for name, metrics in self._functions.items()
+            }
+
+        return dict(
+            sorted(
+                snapshot.items(),
+                key=lambda item: item[1]["latency"]["total"]["p95"],
+                reverse=True,
+            )
+        )
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(
+            {"generated_at": time.time(), "functions": self.snapshot()}, indent=indent
+        )
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+
+    def to_prometheus(self, prefix: str = "mietrak_db") -> str:
+        """
+        Returns the metrics in the Prometheus text exposition format.
+
+        Histograms are labelled by function and phase, counters by function.
+        """
+        counters = (
+            ("calls_total", "Calls of each database function.", "calls"),
+            ("errors_total", "Calls that raised.", "errors"),
+            ("rows_total", "Rows fetched.", "rows"),
+        )
+
+        with self._lock:
+            functions = sorted(self._functions.items())
+
+            # Every family is written whole, its HELP and TYPE then all of its samples.
+            lines = []
+            for family, description, attribute in counters:
+                lines.append(f"# HELP {prefix}_{family} {description}")
+                lines.append(f"# TYPE {prefix}_{family} counter")
+                for name, metrics in functions:
+                    value = getattr(metrics, attribute)
+                    lines.append(f'{prefix}_{family}{{function="{name}"}} {value}')
+
+            lines.append(f"# HELP {prefix}_seconds Time spent per call and phase.")
+            lines.append(f"# TYPE {prefix}_seconds histogram")
+            for name, metrics in functions:
+                for phase, histogram in metrics.phases.items():
+                    labels = f'function="{name}",phase="{phase}"'
+                    cumulative = 0
+                    for bound, count in zip(BUCKET_BOUNDS, histogram.counts):
+                        cumulative += count
+                        lines.append(
+                            f'{prefix}_seconds_bucket{{{labels},le="{bound:.6g}"}} {cumulative}'
+                        )
+                    lines.append(
+                        f'{prefix}_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}'
+                    )
+                    lines.append(
+                        f"{prefix}_seconds_sum{{{labels}}} {histogram.total:.6f}"
+                    )
+                    lines.append(
+                        f"{prefix}_seconds_count{{{labels}}} {histogram.count}"
+                    )
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,47 @@
+from typing import Dict
+from scripts import mie_trak_funcs
+from scripts.department_store import ACCESSED_KEYS
+
+
+def derive_department_access() -> Dict[int, Dict]:
+    """
+    Computes what every department has access to straight from the link tables.
+
+    Uses one grouped query per item table plus one member count query, so all
+    departments are derived in a single pass. For each department the result holds
+    the items held by every member ("full", the intersection) and the items held by
+    only some members ("partial", the rest of the union) with the share of members
+    holding them.
+
+    :return: ``{DepartmentPK: {"member_count": int, "full": {item_table: {pk: label}},
+        "partial": {item_table: {pk: (label, coverage)}}}}``, coverage being between 0 and 1.
+    :rtype: Dict[int, Dict]
+    """
+    member_counts = mie_trak_funcs.get_department_member_counts()
+
+    access = {
+        department_pk: {
+            "member_count": member_count,
+            "full": {item_table: {} for item_table in ACCESSED_KEYS},
+            "partial": {item_table: {} for item_table in ACCESSED_KEYS},
+        }
+        for department_pk, member_count in member_counts.items()
+    }
+
+    for item_table in ACCESSED_KEYS:
+        rows = mie_trak_funcs.get_department_item_coverage(item_table)
+
+        for department_pk, item_pk, label, holders, member_count in rows:
+            department = access.get(department_pk)
+            if department is None:
+                continue
+
+            if holders >= member_count:
+                department["full"][item_table][item_pk] = label
+            else:
+                department["partial"][item_table][item_pk] = (
+                    label,
+                    holders / member_count,
+                )
+
+    return access
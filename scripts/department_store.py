@@ -0,0 +1,182 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable
+from base_logger import getlogger
+
+
+LOGGER = getlogger("Dept Store")
+
+# Department cache key holding the items of each item table.
+ACCESSED_KEYS = {
+    "Dashboard": "accessed_dashboards",
+    "QuickView": "accessed_quickviews",
+    "DocumentGroup": "accessed_documentgroups",
+}
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS department (
+        department_pk TEXT PRIMARY KEY,
+        name TEXT
+    );
+    CREATE TABLE IF NOT EXISTS department_item (
+        department_pk TEXT NOT NULL,
+        item_table TEXT NOT NULL,
+        item_pk TEXT NOT NULL,
+        label TEXT,
+        PRIMARY KEY (department_pk, item_table, item_pk)
+    ) WITHOUT ROWID;
+"""
+
+
+class DepartmentStore:
+    """
+    Indexed on-disk store of the items each department has access to.
+
+    Replaces rewriting department_data.json after every change: rows are keyed by
+    department PK, item table and item PK in a SQLite database running in WAL mode,
+    so each change is a small upsert or delete. `load` rebuilds the dictionary shape
+    the `Controller` has always used, which then serves every read from memory.
+
+    If the database is empty and ``legacy_json_path`` exists, the JSON cache is
+    imported once on open.
+
+    :param path: Path of the SQLite database file.
+    :type path: str
+    :param legacy_json_path: Path of the old department_data.json to migrate from.
+    :type legacy_json_path: str | None
+    """
+
+    def __init__(self, path: str, legacy_json_path: str | None = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        if legacy_json_path and self._is_empty() and os.path.exists(legacy_json_path):
+            self._migrate_json(legacy_json_path)
+
+    def load(self) -> Dict:
+        """
+        Reads the whole store in department insertion order.
+
+        :return: ``{department_pk: {"name": ..., "accessed_dashboards": {pk: label}, ...}}``
+        :rtype: Dict
+        """
+        with self._lock:
+            departments = self._conn.execute(
+                "SELECT department_pk, name FROM department ORDER BY rowid"
+            ).fetchall()
+            items = self._conn.execute(
+                "SELECT department_pk, item_table, item_pk, label FROM department_item"
+            ).fetchall()
+
+        cache = {
+            department_pk: {"name": name, **{key: {} for key in ACCESSED_KEYS.values()}}
+            for department_pk, name in departments
+        }
+        for department_pk, item_table, item_pk, label in items:
+            department = cache.get(department_pk)
+            if department is not None:
+                department[ACCESSED_KEYS[item_table]][item_pk] = label
+
+        return cache
+
+    def put_department(self, department_pk: int | str, name: str) -> None:
+        """
+        Adds a department, or renames it if it already exists.
+
+        :param department_pk: Primary key of the department.
+        :param name: Name of the department.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO department VALUES (?, ?) "
+                "ON CONFLICT (department_pk) DO UPDATE SET name = excluded.name",
+                (str(department_pk), name),
+            )
+
+    def put_items(
+        self, department_pk: int | str, item_table: str, items: Dict[str, str]
+    ) -> None:
+        """
+        Records that a department has access to the given items.
+
+        :param department_pk: Primary key of the department.
+        :param item_table: One of "Dashboard", "QuickView" or "DocumentGroup".
+        :param items: Mapping of item primary key to label.
+        """
+        rows = [
+            (str(department_pk), item_table, str(pk), label)
+            for pk, label in items.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO department_item VALUES (?, ?, ?, ?)", rows
+            )
+
+    def remove_items(
+        self, department_pk: int | str, item_table: str, item_pks: Iterable
+    ) -> None:
+        """
+        Records that a department no longer has access to the given items.
+
+        :param department_pk: Primary key of the department.
+        :param item_table: One of "Dashboard", "QuickView" or "DocumentGroup".
+        :param item_pks: Primary keys of the removed items.
+        """
+        rows = [(str(department_pk), item_table, str(pk)) for pk in item_pks]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM department_item WHERE department_pk = ? AND item_table = ? AND item_pk = ?",
+                rows,
+            )
+
+    def replace_all(self, cache: Dict) -> None:
+        """
+        Replaces the whole store with the contents of a department dictionary.
+
+        :param cache: A dictionary in the shape returned by `load`.
+        :type cache: Dict
+        """
+        departments = [(str(pk), data.get("name")) for pk, data in cache.items()]
+        items = [
+            (str(pk), item_table, str(item_pk), label)
+            for pk, data in cache.items()
+            for item_table, key in ACCESSED_KEYS.items()
+            for item_pk, label in data.get(key, {}).items()
+        ]
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM department_item")
+            self._conn.execute("DELETE FROM department")
+            self._conn.executemany("INSERT INTO department VALUES (?, ?)", departments)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO department_item VALUES (?, ?, ?, ?)", items
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _is_empty(self) -> bool:
+        with self._lock:
+            return (
+                self._conn.execute("SELECT 1 FROM department LIMIT 1").fetchone()
+                is None
+            )
+
+    def _migrate_json(self, legacy_json_path: str) -> None:
+        try:
+            with open(legacy_json_path, "r") as jsonfile:
+                cache = json.load(jsonfile)
+        except Exception as e:
+            LOGGER.critical(f"Could not migrate {legacy_json_path}: {e}")
+            return
+
+        self.replace_all(cache)
+        LOGGER.info(f"Migrated {len(cache)} departments from {legacy_json_path}")
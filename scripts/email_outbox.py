@@ -0,0 +1,382 @@
+import json
+import os
+import smtplib
+import threading
+import time
+import uuid
+from email.message import EmailMessage
+from typing import Dict, List
+from base_logger import getlogger
+
+
+LOGGER = getlogger("Email Outbox")
+
+
+class OutlookTransport:
+    """
+    Sends through the Outlook desktop client over COM.
+
+    COM is initialised once on the outbox worker thread and the Outlook application
+    object is reused for every message until the transport is closed. The win32
+    modules are imported on `open` so the outbox can run without them.
+    """
+
+    def __init__(self) -> None:
+        self._outlook = None
+
+    def open(self) -> None:
+        import pythoncom
+        import pywintypes
+        import win32com.client
+
+        pythoncom.CoInitialize()  # COM has to be initialised on every thread using it.
+
+        try:
+            self._outlook = win32com.client.GetActiveObject("Outlook.Application")
+            LOGGER.info("Outlook application running...")
+        except pywintypes.com_error:
+            self._outlook = win32com.client.Dispatch("Outlook.Application")
+
+    def send(self, message: Dict) -> None:
+        mail = self._outlook.CreateItem(0)
+        mail.Subject = message["subject"]
+        mail.To = message["to"]
+        mail.Body = message["body"]
+        mail.Send()
+
+    def close(self) -> None:
+        import pythoncom
+
+        self._outlook = None
+        pythoncom.CoUninitialize()
+
+
+class SmtpTransport:
+    """
+    Sends through an SMTP server, keeping one connection open between messages.
+
+    :param host: SMTP server host.
+    :param port: SMTP server port.
+    :param sender: Address used as the From header.
+    :param username: Login user, no login when None.
+    :param password: Login password.
+    :param use_tls: Upgrade the connection with STARTTLS.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 25,
+        sender: str = "",
+        username: str | None = None,
+        password: str | None = None,
+        use_tls: bool = False,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self._smtp = None
+
+    def open(self) -> None:
+        pass  # Connected lazily so a dead server only fails the send, which is retried.
+
+    def send(self, message: Dict) -> None:
+        if self._smtp is None:
+            self._smtp = smtplib.SMTP(self.host, self.port, timeout=30)
+            if self.use_tls:
+                self._smtp.starttls()
+            if self.username:
+                self._smtp.login(self.username, self.password)
+
+        mail = EmailMessage()
+        mail["From"] = self.sender
+        mail["To"] = message["to"]
+        mail["Subject"] = message["subject"]
+        mail.set_content(message["body"])
+
+        try:
+            self._smtp.send_message(mail)
+        except smtplib.SMTPServerDisconnected:
+            self._smtp = None
+            raise
+
+    def close(self) -> None:
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except smtplib.SMTPException:
+                pass
+            self._smtp = None
+
+
+class FileTransport:
+    """
+    Appends every message to a JSON lines file instead of sending it, for testing.
+
+    :param path: File the messages are appended to.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def open(self) -> None:
+        pass
+
+    def send(self, message: Dict) -> None:
+        with open(self.path, "a") as outfile:
+            outfile.write(json.dumps(message) + "\n")
+
+    def close(self) -> None:
+        pass
+
+
+class EmailOutbox:
+    """
+    A persistent queue of emails drained by a background worker thread.
+
+    `enqueue` appends the message to an on-disk journal and returns straight away.
+    The worker sends due messages through one transport session, and a failed send
+    is retried with exponential backoff up to ``max_attempts`` times. The journal is
+    replayed on start, so messages queued before a crash or shutdown are still sent,
+    and it is compacted whenever the queue drains.
+
+    A transport is any object with ``open()``, ``send(message)`` and ``close()``,
+    ``message`` being a dictionary with "to", "subject" and "body".
+
+    :param journal_path: Path of the JSON lines journal, its directory is created.
+    :type journal_path: str
+    :param transport: Transport used to deliver the messages.
+    :param max_attempts: Sends tried before a message is dropped as failed.
+    :type max_attempts: int
+    :param base_delay: Seconds before the first retry, doubled after each failure.
+    :type base_delay: float
+    :param max_delay: Upper bound of the retry delay in seconds.
+    :type max_delay: float
+    """
+
+    def __init__(
+        self,
+        journal_path: str,
+        transport,
+        max_attempts: int = 5,
+        base_delay: float = 2.0,
+        max_delay: float = 300.0,
+    ) -> None:
+        self.journal_path = journal_path
+        self.transport = transport
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        directory = os.path.dirname(journal_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._condition = threading.Condition()
+        self._pending: Dict[str, Dict] = self._replay()
+        self._due_at: Dict[str, float] = {pk: 0.0 for pk in self._pending}
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """
+        Starts the worker thread. Messages replayed from the journal are sent first.
+
+        :raises RuntimeError: If a worker told to stop is still sending, two workers
+            would send the same messages and interleave their journal writes.
+        """
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                if not self._stopping:
+                    return
+                raise RuntimeError("The previous email outbox worker is still running")
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name="email-outbox", daemon=True
+            )
+            self._thread.start()
+
+        if self._pending:
+            LOGGER.info(f"Resuming {len(self._pending)} queued emails")
+
+    def enqueue(self, to: str, subject: str, body: str) -> str:
+        """
+        Queues an email and returns without waiting for it to be sent.
+
+        :return: Id of the queued message.
+        :rtype: str
+        """
+        message = {
+            "id": uuid.uuid4().hex,
+            "to": to,
+            "subject": subject,
+            "body": body,
+            "attempts": 0,
+        }
+
+        with self._condition:
+            self._append({"op": "enqueue", "message": message})
+            self._pending[message["id"]] = message
+            self._due_at[message["id"]] = 0.0
+            self._condition.notify()
+
+        return message["id"]
+
+    def pending_count(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def stop(self, timeout: float | None = 5.0) -> bool:
+        """
+        Stops the worker after the messages that are due now, waiting at most ``timeout``
+        seconds. Whatever is left stays in the journal for the next start.
+
+        :return: False if the worker is still sending after ``timeout``, `start` refuses
+            to run until it has exited.
+        :rtype: bool
+        """
+        with self._condition:
+            thread = self._thread
+            self._stopping = True
+            self._condition.notify()
+
+        if thread is None:
+            return True
+
+        thread.join(timeout)
+        if thread.is_alive():
+            LOGGER.warning(f"Email outbox worker still running after {timeout}s")
+            return False
+
+        with self._condition:
+            if self._thread is thread:
+                self._thread = None
+        return True
+
+    def _run(self) -> None:
+        opened = False
+        try:
+            while True:
+                with self._condition:
+                    due = self._wait_for_due()
+                    if due is None:
+                        return
+
+                if not opened:
+                    try:
+                        self.transport.open()
+                        opened = True
+                    except Exception as e:
+                        LOGGER.error(f"Could not open email transport: {e}")
+                        for message in due:
+                            self._failed(message, e)
+                        continue
+
+                for message in due:
+                    try:
+                        self.transport.send(message)
+                    except Exception as e:
+                        self._failed(message, e)
+                    else:
+                        self._sent(message)
+        finally:
+            if opened:
+                try:
+                    self.transport.close()
+                except Exception as e:
+                    LOGGER.error(f"Could not close email transport: {e}")
+
+    def _wait_for_due(self) -> List[Dict] | None:
+        """
+        Blocks until some messages are due and returns them, None once stopping.
+        Must be called holding the condition.
+        """
+        while True:
+            now = time.monotonic()
+            due = [
+                self._pending[pk]
+                for pk, due_at in self._due_at.items()
+                if due_at <= now
+            ]
+            if due:
+                return due
+            if self._stopping:
+                return None
+
+            timeout = min(self._due_at.values()) - now if self._due_at else None
+            self._condition.wait(timeout)
+
+    def _sent(self, message: Dict) -> None:
+        LOGGER.info(f"Email Sent to - {message['to']}")
+        self._finish(message, {"op": "sent", "id": message["id"]})
+
+    def _failed(self, message: Dict, error: Exception) -> None:
+        with self._condition:
+            message["attempts"] += 1
+            attempts = message["attempts"]
+
+            if attempts >= self.max_attempts:
+                LOGGER.critical(
+                    f"Giving up on email to {message['to']} after {attempts} attempts: {error}"
+                )
+                self._finish(
+                    message, {"op": "failed", "id": message["id"], "error": str(error)}
+                )
+                return
+
+            delay = min(self.base_delay * 2 ** (attempts - 1), self.max_delay)
+            LOGGER.error(
+                f"Failed to send email to {message['to']}, retrying in {delay:.0f}s: {error}"
+            )
+            self._append({"op": "retry", "id": message["id"], "attempts": attempts})
+            self._due_at[message["id"]] = time.monotonic() + delay
+
+    def _finish(self, message: Dict, record: Dict) -> None:
+        with self._condition:
+            self._pending.pop(message["id"], None)
+            self._due_at.pop(message["id"], None)
+
+            if self._pending:
+                self._append(record)
+            else:
+                self._compact()
+
+    def _append(self, record: Dict) -> None:
+        with open(self.journal_path, "a") as journal:
+            journal.write(json.dumps(record) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+
+    def _compact(self) -> None:
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, "w") as journal:
+            for message in self._pending.values():
+                journal.write(json.dumps({"op": "enqueue", "message": message}) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(tmp_path, self.journal_path)
+
+    def _replay(self) -> Dict[str, Dict]:
+        pending: Dict[str, Dict] = {}
+        if not os.path.exists(self.journal_path):
+            return pending
+
+        with open(self.journal_path, "r") as journal:
+            for line in journal:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    LOGGER.error(f"Skipping corrupt outbox journal line: {line!r}")
+                    continue
+
+                if record["op"] == "enqueue":
+                    pending[record["message"]["id"]] = record["message"]
+                elif record["op"] == "retry" and record["id"] in pending:
+                    pending[record["id"]]["attempts"] = record["attempts"]
+                elif record["op"] in ("sent", "failed"):
+                    pending.pop(record["id"], None)
+
+        return pending
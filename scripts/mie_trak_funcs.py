@@ -1,679 +1,1783 @@
-import pyodbc
-import functools
-from datetime import datetime
-from contextlib import closing
-from typing import Dict, List, Callable
-from base_logger import getlogger
-
-
-LOGGER = getlogger("MT Funcs")
-_DSN_SANDBOX = (
-    "DRIVER={SQL Server};SERVER=ETZ-SQL;DATABASE=SANDBOX;Trusted_Connection=yes"
-)
-_DSN_LIVE = "DRIVER={SQL Server};SERVER=ETZ-SQL;DATABASE=ETEZAZIMIETrakLive;Trusted_Connection=yes"
-
-DSN = _DSN_SANDBOX
-
-
-def with_db_conn(commit: bool = False):
-    """
-    A decorator to manage database connections using pyodbc.
-
-    This decorator automatically handles connection management, commits transactions
-    if specified, and properly closes the cursor and connection. If an error occurs,
-    it logs the error and propagates the exception to be handled at a higher level.
-
-    :param commit: If True, commits the transaction after function execution.
-    :type commit: bool
-    :return: A wrapped function with database connection handling.
-    :rtype: Callable
-    """
-
-    def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            try:
-                with pyodbc.connect(DSN) as conn:
-                    with closing(conn.cursor()) as cursor:
-                        result = func(cursor, *args, **kwargs)
-
-                        if commit:
-                            conn.commit()
-
-                        return result
-            except pyodbc.OperationalError as vpn_err:
-                error_msg = (
-                    f"VPN not connected. Could not connect to the database.\n{vpn_err}"
-                )
-                LOGGER.error(error_msg)
-                raise RuntimeError(error_msg)
-            except pyodbc.Error as db_err:
-                error_msg = f"Database Error in {func.__name__}: {db_err}"
-                LOGGER.error(error_msg)
-                raise RuntimeError(error_msg)
-            except Exception as e:
-                error_msg = f"Unexpected Error in {func.__name__}: {e}"
-                LOGGER.error(error_msg)
-                raise RuntimeError(error_msg)
-
-        return wrapper
-
-    return decorator
-
-
-@with_db_conn()
-def get_all_quickviews(cursor) -> Dict[str, str]:
-    """
-    Fetches all QuickViews.
-
-    Returns a dictionary mapping QuickView primary keys to their descriptions.
-
-    :param cursor: Database cursor.
-    :type cursor: pyodbc.Cursor
-    :return: Mapping of QuickViewPK to descriptions.
-    :rtype: Dict[str, str]
-    """
-    query = "SELECT QuickViewPK, Description FROM QuickView"
-    cursor.execute(query)
-    results = cursor.fetchall()
-
-    return {
-        str(quickview_pk): description
-        for quickview_pk, description in results
-        if description
-    }
-
-
-@with_db_conn()
-def get_all_dashboards(cursor) -> Dict[str, str]:
-    """
-    Fetches all dashboards.
-
-    Returns a dictionary mapping Dashboard primary keys to their descriptions.
-
-    :param cursor: Database cursor.
-    :type cursor: pyodbc.Cursor
-    :return: Mapping of DashboardPK to descriptions.
-    :rtype: Dict[str, str]
-    """
-    query = "SELECT DashboardPK, Description FROM Dashboard;"
-    cursor.execute(query)
-    results = cursor.fetchall()
-
-    return {
-        str(dashboard_pk): description
-        for dashboard_pk, description in results
-        if description
-    }
-
-
-@with_db_conn()
-def get_all_document_groups(cursor) -> Dict[str, str]:
-    query = "SELECT DocumentGroupPK, Code FROM DocumentGroup"
-    cursor.execute(query)
-    results = cursor.fetchall()
-
-    return {str(documet_group_pk): code for documet_group_pk, code in results if code}
-
-
-@with_db_conn()
-def get_document_groups(cursor) -> Dict[str, str]:
-    """
-    Fetches all document groups.
-
-    Returns a dictionary mapping DocumentGroup primary keys to their Code.
-
-    :param cursor: Database cursor.
-    :type cursor: pyodbc.Cursor
-    :return: Mapping of DocumentGroupPK to Code.
-    :rtype: Dict[str, str]
-    """
-    query = "SELECT DocumentGroupPK, Code FROM DocumentGroup"
-    cursor.execute(query)
-    results = cursor.fetchall()
-
-    return {str(doc_group_pk): code for doc_group_pk, code in results if code}
-
-
-@with_db_conn()
-def get_user_quick_view(cursor, userpk: int) -> Dict[str, str]:
-    """
-    Fetches QuickViews assigned to a user.
-
-    Returns a dictionary mapping QuickView primary keys to their descriptions.
-
-    :param cursor: Database cursor.
-    :type cursor: pyodbc.Cursor
-    :param userpk: User's primary key.
-    :type userpk: int
-    :return: Mapping of QuickViewPK to descriptions.
-    :rtype: Dict[str, str]
-    """
-    query = """
-        SELECT q.QuickViewPK, q.Description
-        FROM QuickViewUser qu
-        JOIN QuickView q ON qu.QuickViewFK = q.QuickViewPK
-        WHERE qu.UserFK = ?;
-    """
-    cursor.execute(query, (userpk,))
-    results = cursor.fetchall()
-
-    return {
-        str(quickview_pk): description
-        for quickview_pk, description in results
-        if description
-    }
-
-
-@with_db_conn()
-def get_user_dashboards(cursor, userpk: int) -> Dict[str, str]:
-    """
-    Fetches dashboards assigned to a user.
-
-    Returns a dictionary mapping Dashboard primary keys to their descriptions.
-
-    :param cursor: Database cursor.
-    :type cursor: pyodbc.Cursor
-    :param userpk: User's primary key.
-    :type userpk: int
-    :return: Mapping of DashboardPK to descriptions.
-    :rtype: Dict[str, str]
-    """
-    query = """
-        SELECT d.DashboardPK, d.Description
-        FROM DashboardUser du
-        JOIN Dashboard d ON du.DashboardFK = d.DashboardPK
-        WHERE du.UserFK = ?;
-    """
-    cursor.execute(query, (userpk,))
-    results = cursor.fetchall()
-
-    return {
-        str(dashboard_pk): description
-        for dashboard_pk, description in results
-        if description
-    }
-
-
-@with_db_conn()
-def get_user_document_groups(cursor, userpk: int) -> Dict[str, str]:
-    query = """
-        SELECT d.DocumentGroupPK, d.Code
-        FROM DocumentGroupUsers du
-        JOIN DocumentGroup d ON du.DocumentGroupFK = d.DocumentGroupPK
-        WHERE du.UserFK = ?;
-    """
-    cursor.execute(query, (userpk,))
-    results = cursor.fetchall()
-
-    return {str(doc_group_pk): code for doc_group_pk, code in results if code}
-
-
-@with_db_conn(commit=True)
-def add_dashboard_to_user(cursor, dashboard_pk: str, user_fk: int) -> None:
-    """
-    Adds a dashboard-user relationship if it does not already exist.
-
-    Checks if an entry with the given `dashboard_pk` and `user_fk` exists in the
-    `DashboardUser` table. If it does, returns the existing primary key.
-    Otherwise, inserts a new record and returns the generated primary key.
-
-    :param cursor: Database cursor.
-    :type cursor: pyodbc.Cursor
-    :param dashboard_pk: Primary key of the dashboard.
-    :type dashboard_pk: str
-    :param user_fk: Primary key of the user.
-    :type user_fk: int
-    :return: Primary key of the DashboardUser record.
-    :rtype: int
-    """
-    query_check = """
-        SELECT DashboardUserPK 
-        FROM DashboardUser 
-        WHERE DashboardFK = ? AND UserFK = ?;
-    """
-    cursor.execute(query_check, (dashboard_pk, user_fk))
-    result = cursor.fetchone()
-
-    if result:
-        return result[0]  # Return existing primary key if found
-
-    query_insert = """
-        INSERT INTO DashboardUser (DashboardFK, UserFK) 
-        VALUES (?, ?);
-    """
-    cursor.execute(query_insert, (dashboard_pk, user_fk))
-
-
-@with_db_conn(commit=True)
-def add_quickview_to_user(cursor, quickview_pk: str, user_fk: int) -> None:
-    """
-    Adds a QuickView-user relationship if it does not already exist.
-
-    Checks if an entry with the given `quickview_pk` and `user_fk` exists in the
-    `QuickViewUser` table. If it exists, returns the existing primary key.
-    Otherwise, inserts a new record and returns the generated primary key.
-
-    :param cursor: Database cursor.
-    :type cursor: pyodbc.Cursor
-    :param quickview_pk: Primary key of the QuickView.
-    :type quickview_pk: str
-    :param user_fk: Primary key of the user.
-    :type user_fk: int
-    :return: Primary key of the QuickViewUser record.
-    :rtype: int
-    """
-    query_check = """
-        SELECT QuickViewUserPK 
-        FROM QuickViewUser 
-        WHERE QuickViewFK = ? AND UserFK = ?;
-    """
-    cursor.execute(query_check, (quickview_pk, user_fk))
-    result = cursor.fetchone()
-
-    # TODO: inform the user that this is already added.
-    if result:
-        return result[0]
-
-    query_insert = """
-        INSERT INTO QuickViewUser (QuickViewFK, UserFK) 
-        VALUES (?, ?);
-    """
-    cursor.execute(query_insert, (quickview_pk, user_fk))
-
-
-@with_db_conn(commit=True)
-def add_document_group_to_user(cursor, doc_group_pk: str, user_pk: int) -> None:
-    query_check = """
-        SELECT DocumentGroupUsersPK 
-        FROM DocumentGroupUsers 
-        WHERE DocumentGroupFK = ? AND UserFK = ?;
-    """
-    cursor.execute(query_check, (doc_group_pk, user_pk))
-    result = cursor.fetchone()
-
-    # TODO: inform the user that this is already added.
-    if result:
-        return result[0]
-
-    query_insert = """
-        INSERT INTO DocumentGroupUsers (DocumentGroupFK, UserFK)
-        VALUES (?, ?);
-    """
-    cursor.execute(query_insert, (doc_group_pk, user_pk))
-
-
-@with_db_conn(commit=True)
-def delete_dashboard_from_user(cursor, userpk: int, dashboardpk: int) -> None:
-    """
-    Revokes a user's access to a specific dashboard.
-
-    This function removes the association between a user and a dashboard in
-    the `DashboardUser` table, effectively revoking the user's access to it.
-
-    :param cursor: Database cursor passed by the decorator.
-    :type cursor: pyodbc.Cursor
-    :param userpk: Primary key of the user whose access is being revoked.
-    :type userpk: int
-    :param dashboardpk: Primary key of the dashboard to be removed from the user's access.
-    :type dashboardpk: int
-    :return: None
-    """
-    query = "DELETE FROM DashboardUser WHERE UserFK = ? AND DashboardFK = ?;"
-    cursor.execute(query, (userpk, dashboardpk))
-
-
-@with_db_conn(commit=True)
-def delete_quickview_from_user(cursor, userpk: int, quickviewpk: int) -> None:
-    """
-    Revokes a user's access to a specific QuickView.
-
-    This function removes the association between a user and a QuickView in
-    the `QuickViewUser` table, preventing the user from accessing it.
-
-    :param cursor: Database cursor passed by the decorator.
-    :type cursor: pyodbc.Cursor
-    :param userpk: Primary key of the user whose QuickView access is being revoked.
-    :type userpk: int
-    :param quickviewpk: Primary key of the QuickView to be removed from the user's access.
-    :type quickviewpk: int
-    :return: None
-    """
-    query = "DELETE FROM QuickViewUser WHERE UserFK = ? AND QuickViewFK = ?;"
-    cursor.execute(query, (userpk, quickviewpk))
-
-
-@with_db_conn(commit=True)
-def delete_document_group_from_user(
-    cursor, userpk: int, document_group_pk: int
-) -> None:
-    """
-    [TODO:description]
-
-    :param cursor [TODO:type]: [TODO:description]
-    :param userpk: [TODO:description]
-    :param document_group_pk: [TODO:description]
-    """
-    query = "DELETE FROM DocumentGroupUsers WHERE UserFK = ? AND DocumentGroupFK = ?"
-    cursor.execute(query, (userpk, document_group_pk))
-
-
-@with_db_conn(commit=True)
-def create_document_group(cursor, code: str, name: str):
-    query = """
-    INSERT INTO DocumentGroup (Code, Name)
-    OUTPUT INSERTED.DocumentGroupPK
-    VALUES (?, ?);
-    """
-    cursor.execute(query, (code, name))
-    inserted_pk = cursor.fetchone()[0]
-    LOGGER.info(f"Created document group:\nPK: {inserted_pk} CODE: {code} NAME: {name}")
-    return inserted_pk
-
-
-# USER
-@with_db_conn()
-def get_user_data(cursor, enabled: bool = True) -> Dict[int, List[str]]:
-    """
-    Retrieves user data filtered by enabled status.
-
-    Returns a dictionary mapping user IDs to their first and last names.
-
-    :param cursor: Database cursor.
-    :type cursor: pyodbc.Cursor
-    :param enabled: Whether to fetch only enabled users.
-    :type enabled: bool
-    :return: Mapping of UserPK to [FirstName, LastName].
-    :rtype: Dict[int, List[str]]
-    :raises ValueError: If no users are found.
-    """
-    query = "SELECT UserPK, FirstName, LastName FROM [User] WHERE Enabled=?"
-
-    user_dict = {}
-    cursor.execute(query, (1 if enabled else 0,))
-    users = cursor.fetchall()
-
-    if not users:
-        raise ValueError("Mie Trak did not return any values. Check last query.")
-
-    for x in users:
-        if x:
-            user_dict[x[0]] = [x[1], x[2]]
-
-    return user_dict
-
-
-@with_db_conn()
-def get_user_first_last(cursor, userpk: int) -> List[str]:
-    """
-    Retrieves the first and last name of a user given their primary key.
-
-    :param cursor: A database cursor used to execute the query.
-    :param userpk: The primary key of the user.
-    :return: A list containing the user's first name and last name.
-    :raises ValueError: If no user with the given primary key is found.
-    """
-    query = "SELECT FirstName, LastName FROM [User] WHERE UserPK = ?"
-    cursor.execute(query, (userpk,))
-    result = cursor.fetchone()
-
-    if not result:
-        raise ValueError("Database did not return any value")
-
-    return [result[0], result[1]]
-
-
-@with_db_conn()
-def login_user(cursor, username: str, password: str) -> bool:
-    query = "SELECT Code, Password FROM [User] WHERE Code = ?"
-    cursor.execute(query, (username,))
-    results = cursor.fetchall()
-
-    if not results:
-        raise ValueError("Database did not return anything")
-
-    for _, mt_password in results:
-        if password.casefold() == mt_password.casefold():
-            return True
-
-    return False
-
-
-# DEPARTMENT
-@with_db_conn()
-def get_all_departments(cursor) -> Dict[int, str]:
-    """
-    Fetches all departments.
-
-    Returns a dictionary mapping department IDs to department names.
-
-    :param cursor: Database cursor.
-    :type cursor: pyodbc.Cursor
-    :return: Mapping of DepartmentPK to department names.
-    :rtype: Dict[int, str]
-    """
-    query = "SELECT DepartmentPK, Name FROM Department"
-
-    cursor.execute(query)
-    departments = cursor.fetchall()
-
-    department_dict = {}
-    if departments:
-        for x in departments:
-            if x[1]:
-                department_dict[x[0]] = x[1]
-
-    return department_dict
-
-
-@with_db_conn()
-def get_department_name(cursor, departmentpk: int) -> str:
-    """
-    Retrieves the name of a department given its primary key.
-
-    :param cursor: A database cursor used to execute the query.
-    :param departmentpk: The primary key of the department.
-    :return: The name of the department.
-    :raises ValueError: If no department with the given primary key is found.
-    """
-    query = "SELECT Name FROM Department WHERE DepartmentPK = ?"
-
-    cursor.execute(query, (departmentpk,))
-    result = cursor.fetchone()
-
-    if not result:
-        raise ValueError("Database did not return any value")
-
-    return result[0]
-
-
-@with_db_conn()
-def get_users_in_department(cursor, departmentpk: int) -> Dict[int, tuple[str, str]]:
-    query_users = (
-        "SELECT UserPK, FirstName, LastName FROM [User] WHERE DepartmentFK = ?"
-    )
-    cursor.execute(query_users, (departmentpk,))
-    department_users = cursor.fetchall()
-
-    return {
-        userpk: (firstname, lastname)
-        for userpk, firstname, lastname in department_users
-    }
-
-
-# VACATION REQUESTS
-
-
-@with_db_conn()
-def get_all_vacation_requests(cursor) -> List:
-    """
-    Fetch all pending vacation requests by joining the User table.
-
-    This function retrieves all vacation requests that are not yet approved,
-    including employee details such as first name and last name.
-
-    :param cursor: Database cursor passed by the decorator.
-    :type cursor: pyodbc.Cursor
-    :return: A formatted list of vacation request records.
-    :rtype: List
-    :raises ValueError: If no records are returned from the query.
-    """
-    query = """
-        SELECT v.VacationRequestPK, u.firstname, u.lastname, v.FromDate, v.ToDate, 
-               v.StartTime, v.Hours, v.Reason, v.Approved
-        FROM VacationRequest v
-        JOIN [User] u ON v.EmployeeFK = u.UserPK 
-        WHERE v.Approved = 0
-        ORDER BY v.VacationRequestPK DESC;
-    """
-
-    cursor.execute(query)
-    results = cursor.fetchall()
-
-    if not results:
-        LOGGER.error(f"MT did not return anything for: \n{query}")
-        raise ValueError("Mie Trak did not return anything. Check Query.")
-
-    return _format_results(results)
-
-
-def _format_results(data):
-    """
-    Formats raw database query results into a structured list of dictionaries.
-
-    Each dictionary represents a vacation request with properly formatted dates,
-    times, and employee details.
-
-    :param data: List of tuples containing raw database results.
-    :type data: List[Tuple]
-    :return: A list of formatted vacation request records.
-    :rtype: List[Dict[str, Any]]
-    """
-    formatted_data = []
-    for row in data:
-        (
-            vacation_id,
-            first_name,
-            last_name,
-            from_date,
-            to_date,
-            start_time,
-            hours,
-            reason,
-            approved,
-        ) = row
-        formatted_row = {
-            "Vacation ID": vacation_id,
-            "Employee": f"{first_name} {last_name}",
-            "From Date": from_date.strftime("%Y-%m-%d") if from_date else "N/A",
-            "To Date": to_date.strftime("%Y-%m-%d") if to_date else "N/A",
-            "Start Time": datetime.strptime(start_time[:15], "%H:%M:%S.%f").strftime(
-                "%I:%M %p"
-            )
-            if start_time
-            else "N/A",
-            "Hours": float(hours) if hours else "N/A",
-            "Reason": reason,
-            "Approved": approved,
-        }
-        formatted_data.append(formatted_row)
-    return formatted_data
-
-
-@with_db_conn(commit=True)
-def approve_vacation_request(cursor, request_pk: int) -> None:
-    """
-    Marks a vacation request as approved.
-
-    Updates the `Approved` field of the `VacationRequest` table for the given request.
-
-    :param cursor: Database cursor.
-    :type cursor: pyodbc.Cursor
-    :param request_pk: Primary key of the vacation request to approve.
-    :type request_pk: int
-    :return: None
-    """
-    query = """
-        UPDATE VacationRequest
-        SET Approved = 1
-        WHERE VacationRequestPK = ?
-    """
-    cursor.execute(query, (request_pk,))
-
-
-@with_db_conn(commit=True)
-def update_vacation_request_reason(cursor, vacation_request_pk: int, reason: str):
-    """
-    Adds a note to the vacation request.
-
-    Appends the `Reason` field of the `VacationRequest` table with the reason string.
-    Usually done when we want to keep track of what was disapproved in mie trak.
-
-    NOTE: Reason should have a timestamp. For reasoning formatting see VacationRequestPK = 3;
-
-    :param cursor: Database cursor.
-    :type cursor: pyodbc.Cursor
-    :param vacation_request_pk: Primary key of the vacation request to update.
-    :type vacation_request_pk: int
-    :param reason: The note to update the vacation request with.
-    :type reason: str
-    :raises RuntimeError: If parameters are None.
-    """
-    query = """
-    UPDATE VacationRequest
-    SET Reason = reason + CHAR(13) + CHAR(14) + CHAR(13) + CHAR(14) + ?
-    WHERE VacationRequestPK = ?
-    """
-    cursor.execute(query, (reason, vacation_request_pk))
-
-
-@with_db_conn()
-def get_user_email_from_vacation_pk(cursor, pk: int) -> str:
-    """
-    Retrieves the email of the user associated with a given vacation request.
-
-    :param cursor: Database cursor.
-    :type cursor: pyodbc.Cursor
-    :param pk: Primary key of the vacation request.
-    :type pk: int
-    :return: Email address of the user.
-    :rtype: str
-    :raises ValueError: If no matching record is found.
-    """
-    query = """
-        SELECT u.Email
-        FROM VacationRequest v
-        JOIN [User] u ON v.EmployeeFK = u.UserPK
-        WHERE v.VacationRequestPK = ?;
-    """
-
-    cursor.execute(query, (pk,))
-    result = cursor.fetchone()
-
-    if not result:
-        LOGGER.error("Database did not return anything")
-        raise ValueError("Database did not return anything")
-
-    return result[0]
-
-
-@with_db_conn()
-def get_entry_from_table(cursor, table_name: str, pk: int) -> Dict[str, str]:
-    """
-    Retrieves dashboard information as a dictionary.
-
-    :param cursor: A database cursor used to execute the query.
-    :param dashboardpk: The primary key of the dashboard.
-    :return: A dictionary containing dashboard information with column names as keys.
-    :raises ValueError: If no dashboard with the given primary key is found.
-    """
-    query = f"SELECT * FROM {table_name} WHERE {table_name}PK = ?"
-    cursor.execute(query, (pk,))
-    row = cursor.fetchone()
-
-    if not row:
-        raise ValueError(f"No entry found in {table_name}PK:  {pk}")
-
-    column_names = [desc[0] for desc in cursor.description]
-
-    return dict(zip(column_names, row))
+import functools
+from contextlib import closing
+from typing import Any, Dict, Iterable, List, Callable
+from scripts.connection_pool import ConnectionPool
+from scripts.db_backend import DatabaseBackend, PyodbcBackend
+from scripts.db_metrics import InstrumentedCursor, QueryMetrics
+from scripts.reference_cache import ReferenceCache
+from scripts.vacation_record import VacationRequestRecord
+from base_logger import getlogger
+
+
+LOGGER = getlogger("MT Funcs")
+_DSN_SANDBOX = (
+    "DRIVER={SQL Server};SERVER=ETZ-SQL;DATABASE=SANDBOX;Trusted_Connection=yes"
+)
+_DSN_LIVE = "DRIVER={SQL Server};SERVER=ETZ-SQL;DATABASE=ETEZAZIMIETrakLive;Trusted_Connection=yes"
+
+DSN = _DSN_SANDBOX
+
+# Where connections come from, see `configure_backend`.
+BACKEND: DatabaseBackend = PyodbcBackend(DSN)
+
+
+def _connect():
+    return BACKEND.connect()
+
+
+CONNECTION_POOL = ConnectionPool(_connect)
+
+# Seconds reference data is served from memory before it is queried again.
+REFERENCE_TTLS = {
+    "Dashboard": 900.0,
+    "QuickView": 900.0,
+    "DocumentGroup": 900.0,
+    "User": 300.0,
+    "Department": 3600.0,
+}
+
+REFERENCE_CACHE = ReferenceCache(REFERENCE_TTLS)
+
+# Call counts and latencies of every `with_db_conn` function, see `configure_metrics`.
+QUERY_METRICS = QueryMetrics()
+
+
+def configure_pool(factory: Callable | None = None, **pool_kwargs) -> ConnectionPool:
+    """
+    Replaces the module connection pool.
+
+    Closes the current pool and builds a new one, e.g. to point the module at a local
+    stand-in database for benchmarking or to tune the pool size.
+
+    :param factory: Zero-argument callable returning a new connection. Defaults to connecting through `BACKEND`.
+    :type factory: Callable | None
+    :param pool_kwargs: Extra keyword arguments passed to `ConnectionPool`.
+    :return: The new pool.
+    :rtype: ConnectionPool
+    """
+    global CONNECTION_POOL
+
+    CONNECTION_POOL.close_all()
+    CONNECTION_POOL = ConnectionPool(factory or _connect, **pool_kwargs)
+    return CONNECTION_POOL
+
+
+def configure_backend(backend: DatabaseBackend, **pool_kwargs) -> ConnectionPool:
+    """
+    Points the module at another database, e.g. `db_backend.SqliteBackend` to run
+    and benchmark without the VPN.
+
+    Replaces the connection pool and drops the cached reference data of the previous
+    database.
+
+    :param backend: The backend to connect through.
+    :type backend: DatabaseBackend
+    :param pool_kwargs: Extra keyword arguments passed to `ConnectionPool`.
+    :return: The new pool.
+    :rtype: ConnectionPool
+    """
+    global BACKEND
+
+    BACKEND = backend
+    REFERENCE_CACHE.invalidate()
+    return configure_pool(**pool_kwargs)
+
+
+def configure_metrics(
+    enabled: bool = True, slow_query_threshold: float | None = None
+) -> QueryMetrics:
+    """
+    Turns the query instrumentation of `with_db_conn` on or off and sets the slow query log.
+
+    The recorded metrics are kept, call `QUERY_METRICS.reset()` to start over. Export
+    them with `QUERY_METRICS.to_json()` or `QUERY_METRICS.to_prometheus()`.
+
+    :param enabled: Whether decorated calls are timed.
+    :type enabled: bool
+    :param slow_query_threshold: Seconds above which a call is logged with its statements, None to never log.
+    :type slow_query_threshold: float | None
+    :return: The module metrics.
+    :rtype: QueryMetrics
+    """
+    QUERY_METRICS.enabled = enabled
+    QUERY_METRICS.slow_query_threshold = slow_query_threshold
+    return QUERY_METRICS
+
+
+def with_db_conn(commit: bool = False, invalidates: tuple[str, ...] = ()):
+    """
+    A decorator to manage database connections of the configured `BACKEND` (pyodbc by default).
+
+    This decorator checks a connection out of `CONNECTION_POOL`, commits the transaction
+    if specified, closes the cursor and returns the connection to the pool. Anything not
+    committed is rolled back when the connection is returned. If an error occurs,
+    it logs the error and propagates the exception to be handled at a higher level.
+    Every call is timed into `QUERY_METRICS` while it is enabled.
+
+    :param commit: If True, commits the transaction after function execution.
+    :type commit: bool
+    :param invalidates: Tables whose `REFERENCE_CACHE` entries are dropped once the function succeeds.
+    :type invalidates: tuple[str, ...]
+    :return: A wrapped function with database connection handling.
+    :rtype: Callable
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            timer = (
+                QUERY_METRICS.start(func.__name__) if QUERY_METRICS.enabled else None
+            )
+            succeeded = False
+            try:
+                with CONNECTION_POOL.connection() as conn:
+                    with closing(conn.cursor()) as cursor:
+                        if timer is not None:
+                            timer.connected()
+                            cursor = InstrumentedCursor(cursor, timer)
+
+                        result = func(cursor, *args, **kwargs)
+
+                        if commit:
+                            if timer is not None:
+                                timer.run("commit", conn.commit)
+                            else:
+                                conn.commit()
+
+                        if invalidates:
+                            REFERENCE_CACHE.invalidate(*invalidates)
+
+                        succeeded = True
+                        return result
+            except BACKEND.operational_errors as vpn_err:
+                error_msg = (
+                    f"VPN not connected. Could not connect to the database.\n{vpn_err}"
+                )
+                LOGGER.error(error_msg)
+                raise RuntimeError(error_msg)
+            except BACKEND.errors as db_err:
+                error_msg = f"Database Error in {func.__name__}: {db_err}"
+                LOGGER.error(error_msg)
+                raise RuntimeError(error_msg)
+            except Exception as e:
+                error_msg = f"Unexpected Error in {func.__name__}: {e}"
+                LOGGER.error(error_msg)
+                raise RuntimeError(error_msg)
+            finally:
+                if timer is not None:
+                    QUERY_METRICS.finish(timer, failed=not succeeded)
+
+        return wrapper
+
+    return decorator
+
+
+@REFERENCE_CACHE.cached("QuickView")
+@with_db_conn()
+def get_all_quickviews(cursor) -> Dict[str, str]:
+    """
+    Fetches all QuickViews.
+
+    Returns a dictionary mapping QuickView primary keys to their descriptions.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :return: Mapping of QuickViewPK to descriptions.
+    :rtype: Dict[str, str]
+    """
+    query = "SELECT QuickViewPK, Description FROM QuickView"
+    cursor.execute(query)
+    results = cursor.fetchall()
+
+    return {
+        str(quickview_pk): description
+        for quickview_pk, description in results
+        if description
+    }
+
+
+@REFERENCE_CACHE.cached("Dashboard")
+@with_db_conn()
+def get_all_dashboards(cursor) -> Dict[str, str]:
+    """
+    Fetches all dashboards.
+
+    Returns a dictionary mapping Dashboard primary keys to their descriptions.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :return: Mapping of DashboardPK to descriptions.
+    :rtype: Dict[str, str]
+    """
+    query = "SELECT DashboardPK, Description FROM Dashboard;"
+    cursor.execute(query)
+    results = cursor.fetchall()
+
+    return {
+        str(dashboard_pk): description
+        for dashboard_pk, description in results
+        if description
+    }
+
+
+@REFERENCE_CACHE.cached("DocumentGroup")
+@with_db_conn()
+def get_all_document_groups(cursor) -> Dict[str, str]:
+    query = "SELECT DocumentGroupPK, Code FROM DocumentGroup"
+    cursor.execute(query)
+    results = cursor.fetchall()
+
+    return {str(documet_group_pk): code for documet_group_pk, code in results if code}
+
+
+@REFERENCE_CACHE.cached("DocumentGroup")
+@with_db_conn()
+def get_document_groups(cursor) -> Dict[str, str]:
+    """
+    Fetches all document groups.
+
+    Returns a dictionary mapping DocumentGroup primary keys to their Code.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :return: Mapping of DocumentGroupPK to Code.
+    :rtype: Dict[str, str]
+    """
+    query = "SELECT DocumentGroupPK, Code FROM DocumentGroup"
+    cursor.execute(query)
+    results = cursor.fetchall()
+
+    return {str(doc_group_pk): code for doc_group_pk, code in results if code}
+
+
+@with_db_conn()
+def get_user_quick_view(cursor, userpk: int) -> Dict[str, str]:
+    """
+    Fetches QuickViews assigned to a user.
+
+    Returns a dictionary mapping QuickView primary keys to their descriptions.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param userpk: User's primary key.
+    :type userpk: int
+    :return: Mapping of QuickViewPK to descriptions.
+    :rtype: Dict[str, str]
+    """
+    query = """
+        SELECT q.QuickViewPK, q.Description
+        FROM QuickViewUser qu
+        JOIN QuickView q ON qu.QuickViewFK = q.QuickViewPK
+        WHERE qu.UserFK = ?;
+    """
+    cursor.execute(query, (userpk,))
+    results = cursor.fetchall()
+
+    return {
+        str(quickview_pk): description
+        for quickview_pk, description in results
+        if description
+    }
+
+
+@with_db_conn()
+def get_user_dashboards(cursor, userpk: int) -> Dict[str, str]:
+    """
+    Fetches dashboards assigned to a user.
+
+    Returns a dictionary mapping Dashboard primary keys to their descriptions.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param userpk: User's primary key.
+    :type userpk: int
+    :return: Mapping of DashboardPK to descriptions.
+    :rtype: Dict[str, str]
+    """
+    query = """
+        SELECT d.DashboardPK, d.Description
+        FROM DashboardUser du
+        JOIN Dashboard d ON du.DashboardFK = d.DashboardPK
+        WHERE du.UserFK = ?;
+    """
+    cursor.execute(query, (userpk,))
+    results = cursor.fetchall()
+
+    return {
+        str(dashboard_pk): description
+        for dashboard_pk, description in results
+        if description
+    }
+
+
+@with_db_conn()
+def get_user_document_groups(cursor, userpk: int) -> Dict[str, str]:
+    query = """
+        SELECT d.DocumentGroupPK, d.Code
+        FROM DocumentGroupUsers du
+        JOIN DocumentGroup d ON du.DocumentGroupFK = d.DocumentGroupPK
+        WHERE du.UserFK = ?;
+    """
+    cursor.execute(query, (userpk,))
+    results = cursor.fetchall()
+
+    return {str(doc_group_pk): code for doc_group_pk, code in results if code}
+
+
+@with_db_conn(commit=True)
+def add_dashboard_to_user(cursor, dashboard_pk: str, user_fk: int) -> None:
+    """
+    Adds a dashboard-user relationship if it does not already exist.
+
+    Checks if an entry with the given `dashboard_pk` and `user_fk` exists in the
+    `DashboardUser` table. If it does, returns the existing primary key.
+    Otherwise, inserts a new record and returns the generated primary key.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param dashboard_pk: Primary key of the dashboard.
+    :type dashboard_pk: str
+    :param user_fk: Primary key of the user.
+    :type user_fk: int
+    :return: Primary key of the DashboardUser record.
+    :rtype: int
+    """
+    query_check = """
+        SELECT DashboardUserPK 
+        FROM DashboardUser 
+        WHERE DashboardFK = ? AND UserFK = ?;
+    """
+    cursor.execute(query_check, (dashboard_pk, user_fk))
+    result = cursor.fetchone()
+
+    if result:
+        return result[0]  # Return existing primary key if found
+
+    query_insert = """
+        INSERT INTO DashboardUser (DashboardFK, UserFK) 
+        VALUES (?, ?);
+    """
+    cursor.execute(query_insert, (dashboard_pk, user_fk))
+
+
+@with_db_conn(commit=True)
+def add_quickview_to_user(cursor, quickview_pk: str, user_fk: int) -> None:
+    """
+    Adds a QuickView-user relationship if it does not already exist.
+
+    Checks if an entry with the given `quickview_pk` and `user_fk` exists in the
+    `QuickViewUser` table. If it exists, returns the existing primary key.
+    Otherwise, inserts a new record and returns the generated primary key.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param quickview_pk: Primary key of the QuickView.
+    :type quickview_pk: str
+    :param user_fk: Primary key of the user.
+    :type user_fk: int
+    :return: Primary key of the QuickViewUser record.
+    :rtype: int
+    """
+    query_check = """
+        SELECT QuickViewUserPK 
+        FROM QuickViewUser 
+        WHERE QuickViewFK = ? AND UserFK = ?;
+    """
+    cursor.execute(query_check, (quickview_pk, user_fk))
+    result = cursor.fetchone()
+
+    # TODO: inform the user that this is already added.
+    if result:
+        return result[0]
+
+    query_insert = """
+        INSERT INTO QuickViewUser (QuickViewFK, UserFK) 
+        VALUES (?, ?);
+    """
+    cursor.execute(query_insert, (quickview_pk, user_fk))
+
+
+@with_db_conn(commit=True)
+def add_document_group_to_user(cursor, doc_group_pk: str, user_pk: int) -> None:
+    query_check = """
+        SELECT DocumentGroupUsersPK 
+        FROM DocumentGroupUsers 
+        WHERE DocumentGroupFK = ? AND UserFK = ?;
+    """
+    cursor.execute(query_check, (doc_group_pk, user_pk))
+    result = cursor.fetchone()
+
+    # TODO: inform the user that this is already added.
+    if result:
+        return result[0]
+
+    query_insert = """
+        INSERT INTO DocumentGroupUsers (DocumentGroupFK, UserFK)
+        VALUES (?, ?);
+    """
+    cursor.execute(query_insert, (doc_group_pk, user_pk))
+
+
+# SQL Server rejects statements with more than 2100 parameters.
+_MAX_PARAMS = 2000
+
+# Link tables that grant a user access to an item, keyed by the item table.
+_LINK_TABLES = {
+    "Dashboard": ("DashboardUser", "DashboardFK"),
+    "QuickView": ("QuickViewUser", "QuickViewFK"),
+    "DocumentGroup": ("DocumentGroupUsers", "DocumentGroupFK"),
+}
+
+# Column shown to the user for each item table.
+_LABEL_COLUMNS = {
+    "Dashboard": "Description",
+    "QuickView": "Description",
+    "DocumentGroup": "Code",
+}
+
+
+def _get_link_table(item_table: str) -> tuple[str, str]:
+    """
+    Resolves the link table and item foreign key column for an item table.
+
+    :param item_table: One of "Dashboard", "QuickView" or "DocumentGroup".
+    :type item_table: str
+    :return: The link table name and its item foreign key column.
+    :rtype: tuple[str, str]
+    :raises ValueError: If the item table has no link table.
+    """
+    try:
+        return _LINK_TABLES[item_table]
+    except KeyError:
+        raise ValueError(f"No user link table for: {item_table}")
+
+
+def _chunks(values: List, size: int) -> List[List]:
+    """
+    Splits a list into consecutive chunks of at most ``size`` elements.
+    """
+    return [values[i : i + size] for i in range(0, len(values), size)]
+
+
+def _add_item_to_department_users(
+    cursor, item_table: str, item_pk: int, departmentpk: int
+) -> Dict[str, List[int]]:
+    """
+    Grants an item to every user in a department with one set-based INSERT.
+
+    The department members that already hold the item are read first so the caller
+    gets an exact per-user breakdown, then the missing link rows are inserted with
+    a single ``INSERT ... SELECT ... WHERE NOT EXISTS``. Both statements run on the
+    same cursor and therefore in the same transaction.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param item_table: One of "Dashboard", "QuickView" or "DocumentGroup".
+    :type item_table: str
+    :param item_pk: Primary key of the item to grant.
+    :type item_pk: int
+    :param departmentpk: Primary key of the department.
+    :type departmentpk: int
+    :return: UserPKs that were granted the item ("inserted") and that already had it ("skipped").
+    :rtype: Dict[str, List[int]]
+    """
+    link_table, item_fk = _get_link_table(item_table)
+
+    query_existing = f"""
+        SELECT u.UserPK,
+               CASE WHEN EXISTS (
+                   SELECT 1 FROM {link_table} l
+                   WHERE l.{item_fk} = ? AND l.UserFK = u.UserPK
+               ) THEN 1 ELSE 0 END
+        FROM [User] u
+        WHERE u.DepartmentFK = ?;
+    """
+    cursor.execute(query_existing, (item_pk, departmentpk))
+    department_users = cursor.fetchall()
+
+    inserted = [userpk for userpk, has_item in department_users if not has_item]
+    skipped = [userpk for userpk, has_item in department_users if has_item]
+
+    if inserted:
+        query_insert = f"""
+            INSERT INTO {link_table} ({item_fk}, UserFK)
+            SELECT ?, u.UserPK
+            FROM [User] u
+            WHERE u.DepartmentFK = ?
+              AND NOT EXISTS (
+                  SELECT 1 FROM {link_table} l
+                  WHERE l.{item_fk} = ? AND l.UserFK = u.UserPK
+              );
+        """
+        cursor.execute(query_insert, (item_pk, departmentpk, item_pk))
+
+    return {"inserted": inserted, "skipped": skipped}
+
+
+@with_db_conn(commit=True)
+def add_dashboard_to_department(
+    cursor, dashboard_pk: int, departmentpk: int
+) -> Dict[str, List[int]]:
+    """
+    Adds a dashboard to every user in a department in a single transaction.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param dashboard_pk: Primary key of the dashboard.
+    :type dashboard_pk: int
+    :param departmentpk: Primary key of the department.
+    :type departmentpk: int
+    :return: UserPKs that were granted the dashboard ("inserted") and that already had it ("skipped").
+    :rtype: Dict[str, List[int]]
+    """
+    return _add_item_to_department_users(
+        cursor, "Dashboard", dashboard_pk, departmentpk
+    )
+
+
+@with_db_conn(commit=True)
+def add_quickview_to_department(
+    cursor, quickview_pk: int, departmentpk: int
+) -> Dict[str, List[int]]:
+    """
+    Adds a QuickView to every user in a department in a single transaction.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param quickview_pk: Primary key of the QuickView.
+    :type quickview_pk: int
+    :param departmentpk: Primary key of the department.
+    :type departmentpk: int
+    :return: UserPKs that were granted the QuickView ("inserted") and that already had it ("skipped").
+    :rtype: Dict[str, List[int]]
+    """
+    return _add_item_to_department_users(
+        cursor, "QuickView", quickview_pk, departmentpk
+    )
+
+
+@with_db_conn(commit=True)
+def add_document_group_to_department(
+    cursor, doc_group_pk: int, departmentpk: int
+) -> Dict[str, List[int]]:
+    """
+    Adds a document group to every user in a department in a single transaction.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param doc_group_pk: Primary key of the document group.
+    :type doc_group_pk: int
+    :param departmentpk: Primary key of the department.
+    :type departmentpk: int
+    :return: UserPKs that were granted the document group ("inserted") and that already had it ("skipped").
+    :rtype: Dict[str, List[int]]
+    """
+    return _add_item_to_department_users(
+        cursor, "DocumentGroup", doc_group_pk, departmentpk
+    )
+
+
+def _add_items_to_users(
+    cursor, user_pks: List[int], items: Dict[str, List[int]]
+) -> Dict[str, Dict[str, int]]:
+    """
+    Grants every item in ``items`` to every user in ``user_pks``.
+
+    Existing link rows for the whole selection are read with one query per link
+    table (chunked only past the parameter limit), and the missing pairs are inserted
+    with one ``executemany`` per link table.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param user_pks: Primary keys of the users.
+    :type user_pks: List[int]
+    :param items: Item primary keys keyed by item table ("Dashboard", "QuickView", "DocumentGroup").
+    :type items: Dict[str, List[int]]
+    :return: Inserted and skipped (already linked) pair counts keyed by item table.
+    :rtype: Dict[str, Dict[str, int]]
+    """
+    user_pks = list(dict.fromkeys(int(pk) for pk in user_pks))
+    chunk_size = _MAX_PARAMS // 2
+
+    if hasattr(cursor, "fast_executemany"):
+        cursor.fast_executemany = True
+
+    results = {}
+    for item_table, item_pks in items.items():
+        link_table, item_fk = _get_link_table(item_table)
+        item_pks = list(dict.fromkeys(int(pk) for pk in item_pks))
+
+        if not item_pks or not user_pks:
+            results[item_table] = {"inserted": 0, "skipped": 0}
+            continue
+
+        existing = set()
+        for user_chunk in _chunks(user_pks, chunk_size):
+            user_placeholders = ", ".join("?" * len(user_chunk))
+
+            for item_chunk in _chunks(item_pks, chunk_size):
+                item_placeholders = ", ".join("?" * len(item_chunk))
+                query_existing = f"""
+                    SELECT UserFK, {item_fk}
+                    FROM {link_table}
+                    WHERE UserFK IN ({user_placeholders})
+                      AND {item_fk} IN ({item_placeholders});
+                """
+                cursor.execute(query_existing, (*user_chunk, *item_chunk))
+                existing.update((int(u), int(i)) for u, i in cursor.fetchall())
+
+        missing = [
+            (item_pk, user_pk)
+            for user_pk in user_pks
+            for item_pk in item_pks
+            if (user_pk, item_pk) not in existing
+        ]
+
+        if missing:
+            query_insert = (
+                f"INSERT INTO {link_table} ({item_fk}, UserFK) VALUES (?, ?);"
+            )
+            cursor.executemany(query_insert, missing)
+
+        results[item_table] = {
+            "inserted": len(missing),
+            "skipped": len(user_pks) * len(item_pks) - len(missing),
+        }
+
+    return results
+
+
+@with_db_conn(commit=True)
+def add_items_to_users(
+    cursor, user_pks: List[int], items: Dict[str, List[int]]
+) -> Dict[str, Dict[str, int]]:
+    """
+    Grants dashboards, QuickViews and document groups to many users in one transaction.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param user_pks: Primary keys of the users.
+    :type user_pks: List[int]
+    :param items: Item primary keys keyed by item table ("Dashboard", "QuickView", "DocumentGroup").
+    :type items: Dict[str, List[int]]
+    :return: Inserted and skipped (already linked) pair counts keyed by item table.
+    :rtype: Dict[str, Dict[str, int]]
+    """
+    return _add_items_to_users(cursor, user_pks, items)
+
+
+@with_db_conn(commit=True)
+def add_items_to_department(
+    cursor, items: Dict[str, List[int]], departmentpk: int
+) -> Dict[str, Dict[str, int]]:
+    """
+    Grants dashboards, QuickViews and document groups to every user in a department.
+
+    The department members are resolved on the same cursor, so the lookup and all
+    inserts share one transaction.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param items: Item primary keys keyed by item table ("Dashboard", "QuickView", "DocumentGroup").
+    :type items: Dict[str, List[int]]
+    :param departmentpk: Primary key of the department.
+    :type departmentpk: int
+    :return: Inserted and skipped (already linked) pair counts keyed by item table.
+    :rtype: Dict[str, Dict[str, int]]
+    """
+    cursor.execute("SELECT UserPK FROM [User] WHERE DepartmentFK = ?", (departmentpk,))
+    user_pks = [row[0] for row in cursor.fetchall()]
+
+    return _add_items_to_users(cursor, user_pks, items)
+
+
+@with_db_conn()
+def get_item_labels(cursor, item_table: str, item_pks: List[int]) -> Dict[str, str]:
+    """
+    Fetches the display label (Description or Code) of many items of one table.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param item_table: One of "Dashboard", "QuickView" or "DocumentGroup".
+    :type item_table: str
+    :param item_pks: Primary keys of the items.
+    :type item_pks: List[int]
+    :return: Mapping of item primary key to label, items without a label are left out.
+    :rtype: Dict[str, str]
+    """
+    _get_link_table(item_table)  # validates item_table before it is formatted into SQL
+    label_column = _LABEL_COLUMNS[item_table]
+
+    labels = {}
+    for chunk in _chunks(list(item_pks), _MAX_PARAMS):
+        placeholders = ", ".join("?" * len(chunk))
+        query = f"""
+            SELECT {item_table}PK, {label_column}
+            FROM {item_table}
+            WHERE {item_table}PK IN ({placeholders});
+        """
+        cursor.execute(query, tuple(chunk))
+        labels.update({str(pk): label for pk, label in cursor.fetchall() if label})
+
+    return labels
+
+
+@with_db_conn()
+def get_all_user_links(
+    cursor, item_table: str, userpk: int | None = None
+) -> List[tuple[int, int]]:
+    """
+    Fetches every (UserPK, item PK) pair of a link table in one query.
+
+    Link rows are joined to the user and item tables so rows pointing at deleted
+    users or items are left out, like in `get_user_dashboards`.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param item_table: One of "Dashboard", "QuickView" or "DocumentGroup".
+    :type item_table: str
+    :param userpk: Only fetch the links of this user when given.
+    :type userpk: int | None
+    :return: (UserPK, item PK) pairs.
+    :rtype: List[tuple[int, int]]
+    """
+    link_table, item_fk = _get_link_table(item_table)
+
+    query = f"""
+        SELECT l.UserFK, l.{item_fk}
+        FROM {link_table} l
+        JOIN {item_table} i ON l.{item_fk} = i.{item_table}PK
+        JOIN [User] u ON l.UserFK = u.UserPK
+    """
+    params = ()
+    if userpk is not None:
+        query += " WHERE l.UserFK = ?"
+        params = (userpk,)
+
+    cursor.execute(query, params)
+    return [(int(user_fk), int(item_pk)) for user_fk, item_pk in cursor.fetchall()]
+
+
+@with_db_conn()
+def get_all_link_rows(cursor, item_table: str) -> List[tuple[int, int, int]]:
+    """
+    Fetches every row of a link table, including its own primary key.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param item_table: One of "Dashboard", "QuickView" or "DocumentGroup".
+    :type item_table: str
+    :return: (link PK, UserFK, item FK) rows.
+    :rtype: List[tuple[int, int, int]]
+    """
+    link_table, item_fk = _get_link_table(item_table)
+
+    cursor.execute(f"SELECT {link_table}PK, UserFK, {item_fk} FROM {link_table}")
+
+    return [
+        (int(link_pk), int(user_fk), int(item_pk))
+        for link_pk, user_fk, item_pk in cursor.fetchall()
+        if user_fk is not None and item_pk is not None
+    ]
+
+
+@with_db_conn(commit=True)
+def apply_link_changes(
+    cursor,
+    inserts: Dict[str, List[tuple[int, int]]],
+    deletes: Dict[str, List[int]],
+) -> Dict[str, Dict[str, int]]:
+    """
+    Inserts and deletes link rows of several link tables in one transaction.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param inserts: (UserPK, item PK) pairs to insert, keyed by item table.
+    :type inserts: Dict[str, List[tuple[int, int]]]
+    :param deletes: Link table primary keys to delete, keyed by item table.
+    :type deletes: Dict[str, List[int]]
+    :return: Inserted and deleted row counts keyed by item table.
+    :rtype: Dict[str, Dict[str, int]]
+    """
+    if hasattr(cursor, "fast_executemany"):
+        cursor.fast_executemany = True
+
+    results = {}
+    for item_table in set(inserts) | set(deletes):
+        link_table, item_fk = _get_link_table(item_table)
+        counts = results.setdefault(item_table, {"inserted": 0, "deleted": 0})
+
+        pairs = inserts.get(item_table, [])
+        if pairs:
+            query_insert = (
+                f"INSERT INTO {link_table} ({item_fk}, UserFK) VALUES (?, ?);"
+            )
+            cursor.executemany(query_insert, [(item, user) for user, item in pairs])
+            counts["inserted"] = len(pairs)
+
+        for chunk in _chunks(list(deletes.get(item_table, [])), _MAX_PARAMS):
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(
+                f"DELETE FROM {link_table} WHERE {link_table}PK IN ({placeholders});",
+                tuple(chunk),
+            )
+            counts["deleted"] += max(cursor.rowcount, 0)
+
+    return results
+
+
+def _existing_user_links(
+    cursor, item_table: str, pairs: List[tuple[int, int]]
+) -> List[tuple[int, int, int]]:
+    """
+    Fetches the link rows matching any of the (UserPK, item PK) pairs.
+
+    Each chunk of pairs is looked up with one query on its users and items, which
+    can match more rows than asked for, so the rows are filtered down to the pairs.
+
+    :return: (link PK, UserFK, item FK) rows.
+    :rtype: List[tuple[int, int, int]]
+    """
+    link_table, item_fk = _get_link_table(item_table)
+    wanted = set(pairs)
+
+    rows = []
+    for chunk in _chunks(pairs, _MAX_PARAMS // 2):
+        user_pks = list({user_pk for user_pk, _ in chunk})
+        item_pks = list({item_pk for _, item_pk in chunk})
+        query = f"""
+            SELECT {link_table}PK, UserFK, {item_fk}
+            FROM {link_table}
+            WHERE UserFK IN ({", ".join("?" * len(user_pks))})
+              AND {item_fk} IN ({", ".join("?" * len(item_pks))});
+        """
+        cursor.execute(query, (*user_pks, *item_pks))
+        rows.extend(
+            (int(link_pk), int(user_fk), int(item_pk))
+            for link_pk, user_fk, item_pk in cursor.fetchall()
+            if (int(user_fk), int(item_pk)) in wanted
+        )
+
+    return rows
+
+
+@with_db_conn(commit=True)
+def add_user_links(
+    cursor, item_table: str, pairs: List[tuple[int, int]]
+) -> List[tuple[int, int]]:
+    """
+    Grants items of one table to users pair by pair, in one transaction.
+
+    Unlike `add_items_to_users` the pairs are arbitrary, not every user times every
+    item. Existing links are read in chunks and only the missing pairs are inserted
+    with one ``executemany``.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param item_table: One of "Dashboard", "QuickView" or "DocumentGroup".
+    :type item_table: str
+    :param pairs: (UserPK, item PK) pairs to link.
+    :type pairs: List[tuple[int, int]]
+    :return: The pairs that were inserted, the others were already linked.
+    :rtype: List[tuple[int, int]]
+    """
+    link_table, item_fk = _get_link_table(item_table)
+    pairs = list(dict.fromkeys((int(user), int(item)) for user, item in pairs))
+
+    existing = {
+        (user, item)
+        for _, user, item in _existing_user_links(cursor, item_table, pairs)
+    }
+    missing = [pair for pair in pairs if pair not in existing]
+
+    if missing:
+        if hasattr(cursor, "fast_executemany"):
+            cursor.fast_executemany = True
+        query_insert = f"INSERT INTO {link_table} ({item_fk}, UserFK) VALUES (?, ?);"
+        cursor.executemany(query_insert, [(item, user) for user, item in missing])
+
+    return missing
+
+
+@with_db_conn(commit=True)
+def delete_user_links(
+    cursor, item_table: str, pairs: List[tuple[int, int]]
+) -> List[tuple[int, int]]:
+    """
+    Revokes items of one table from users pair by pair, in one transaction.
+
+    Duplicate link rows of a pair are all deleted.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param item_table: One of "Dashboard", "QuickView" or "DocumentGroup".
+    :type item_table: str
+    :param pairs: (UserPK, item PK) pairs to unlink.
+    :type pairs: List[tuple[int, int]]
+    :return: The pairs that were deleted, the others were not linked.
+    :rtype: List[tuple[int, int]]
+    """
+    link_table, _ = _get_link_table(item_table)
+    pairs = list(dict.fromkeys((int(user), int(item)) for user, item in pairs))
+
+    rows = _existing_user_links(cursor, item_table, pairs)
+    for chunk in _chunks([link_pk for link_pk, _, _ in rows], _MAX_PARAMS):
+        placeholders = ", ".join("?" * len(chunk))
+        cursor.execute(
+            f"DELETE FROM {link_table} WHERE {link_table}PK IN ({placeholders});",
+            tuple(chunk),
+        )
+
+    return list(dict.fromkeys((user, item) for _, user, item in rows))
+
+
+@with_db_conn(commit=True)
+def delete_dashboard_from_user(cursor, userpk: int, dashboardpk: int) -> None:
+    """
+    Revokes a user's access to a specific dashboard.
+
+    This function removes the association between a user and a dashboard in
+    the `DashboardUser` table, effectively revoking the user's access to it.
+
+    :param cursor: Database cursor passed by the decorator.
+    :type cursor: pyodbc.Cursor
+    :param userpk: Primary key of the user whose access is being revoked.
+    :type userpk: int
+    :param dashboardpk: Primary key of the dashboard to be removed from the user's access.
+    :type dashboardpk: int
+    :return: None
+    """
+    query = "DELETE FROM DashboardUser WHERE UserFK = ? AND DashboardFK = ?;"
+    cursor.execute(query, (userpk, dashboardpk))
+
+
+@with_db_conn(commit=True)
+def delete_quickview_from_user(cursor, userpk: int, quickviewpk: int) -> None:
+    """
+    Revokes a user's access to a specific QuickView.
+
+    This function removes the association between a user and a QuickView in
+    the `QuickViewUser` table, preventing the user from accessing it.
+
+    :param cursor: Database cursor passed by the decorator.
+    :type cursor: pyodbc.Cursor
+    :param userpk: Primary key of the user whose QuickView access is being revoked.
+    :type userpk: int
+    :param quickviewpk: Primary key of the QuickView to be removed from the user's access.
+    :type quickviewpk: int
+    :return: None
+    """
+    query = "DELETE FROM QuickViewUser WHERE UserFK = ? AND QuickViewFK = ?;"
+    cursor.execute(query, (userpk, quickviewpk))
+
+
+@with_db_conn(commit=True)
+def delete_document_group_from_user(
+    cursor, userpk: int, document_group_pk: int
+) -> None:
+    """
+    [TODO:description]
+
+    :param cursor [TODO:type]: [TODO:description]
+    :param userpk: [TODO:description]
+    :param document_group_pk: [TODO:description]
+    """
+    query = "DELETE FROM DocumentGroupUsers WHERE UserFK = ? AND DocumentGroupFK = ?"
+    cursor.execute(query, (userpk, document_group_pk))
+
+
+@with_db_conn(commit=True)
+def delete_items_from_department(
+    cursor, item_table: str, item_pks: List[int], departmentpk: int
+) -> int:
+    """
+    Revokes many items from every user in a department in one transaction.
+
+    The department members are resolved inside the DELETE, and the item keys are
+    sent in chunks so a single statement stays under SQL Server's parameter limit.
+
+    :param cursor: Database cursor passed by the decorator.
+    :type cursor: pyodbc.Cursor
+    :param item_table: One of "Dashboard", "QuickView" or "DocumentGroup".
+    :type item_table: str
+    :param item_pks: Primary keys of the items to revoke.
+    :type item_pks: List[int]
+    :param departmentpk: Primary key of the department.
+    :type departmentpk: int
+    :return: Number of link rows deleted.
+    :rtype: int
+    """
+    link_table, item_fk = _get_link_table(item_table)
+
+    deleted = 0
+    for chunk in _chunks(list(item_pks), _MAX_PARAMS - 1):
+        placeholders = ", ".join("?" * len(chunk))
+        query = f"""
+            DELETE FROM {link_table}
+            WHERE UserFK IN (SELECT UserPK FROM [User] WHERE DepartmentFK = ?)
+              AND {item_fk} IN ({placeholders});
+        """
+        cursor.execute(query, (departmentpk, *chunk))
+        deleted += max(cursor.rowcount, 0)
+
+    return deleted
+
+
+@with_db_conn(commit=True)
+def delete_items_from_users(
+    cursor, item_table: str, item_pks: List[int], user_pks: List[int]
+) -> int:
+    """
+    Revokes many items from many users in one transaction.
+
+    Both key lists are chunked so that every statement stays under SQL Server's
+    parameter limit.
+
+    :param cursor: Database cursor passed by the decorator.
+    :type cursor: pyodbc.Cursor
+    :param item_table: One of "Dashboard", "QuickView" or "DocumentGroup".
+    :type item_table: str
+    :param item_pks: Primary keys of the items to revoke.
+    :type item_pks: List[int]
+    :param user_pks: Primary keys of the users losing access.
+    :type user_pks: List[int]
+    :return: Number of link rows deleted.
+    :rtype: int
+    """
+    link_table, item_fk = _get_link_table(item_table)
+    chunk_size = _MAX_PARAMS // 2
+
+    deleted = 0
+    for user_chunk in _chunks(list(user_pks), chunk_size):
+        user_placeholders = ", ".join("?" * len(user_chunk))
+
+        for item_chunk in _chunks(list(item_pks), chunk_size):
+            item_placeholders = ", ".join("?" * len(item_chunk))
+            query = f"""
+                DELETE FROM {link_table}
+                WHERE UserFK IN ({user_placeholders})
+                  AND {item_fk} IN ({item_placeholders});
+            """
+            cursor.execute(query, (*user_chunk, *item_chunk))
+            deleted += max(cursor.rowcount, 0)
+
+    return deleted
+
+
+@with_db_conn(commit=True, invalidates=("DocumentGroup",))
+def create_document_group(cursor, code: str, name: str):
+    query = """
+    INSERT INTO DocumentGroup (Code, Name)
+    OUTPUT INSERTED.DocumentGroupPK
+    VALUES (?, ?);
+    """
+    cursor.execute(query, (code, name))
+    inserted_pk = cursor.fetchone()[0]
+    LOGGER.info(f"Created document group:\nPK: {inserted_pk} CODE: {code} NAME: {name}")
+    return inserted_pk
+
+
+# USER
+@REFERENCE_CACHE.cached("User")
+@with_db_conn()
+def get_user_data(cursor, enabled: bool = True) -> Dict[int, List[str]]:
+    """
+    Retrieves user data filtered by enabled status.
+
+    Returns a dictionary mapping user IDs to their first and last names.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param enabled: Whether to fetch only enabled users.
+    :type enabled: bool
+    :return: Mapping of UserPK to [FirstName, LastName].
+    :rtype: Dict[int, List[str]]
+    :raises ValueError: If no users are found.
+    """
+    query = "SELECT UserPK, FirstName, LastName FROM [User] WHERE Enabled=?"
+
+    user_dict = {}
+    cursor.execute(query, (1 if enabled else 0,))
+    users = cursor.fetchall()
+
+    if not users:
+        raise ValueError("Mie Trak did not return any values. Check last query.")
+
+    for x in users:
+        if x:
+            user_dict[x[0]] = [x[1], x[2]]
+
+    return user_dict
+
+
+@with_db_conn()
+def get_user_first_last(cursor, userpk: int) -> List[str]:
+    """
+    Retrieves the first and last name of a user given their primary key.
+
+    :param cursor: A database cursor used to execute the query.
+    :param userpk: The primary key of the user.
+    :return: A list containing the user's first name and last name.
+    :raises ValueError: If no user with the given primary key is found.
+    """
+    query = "SELECT FirstName, LastName FROM [User] WHERE UserPK = ?"
+    cursor.execute(query, (userpk,))
+    result = cursor.fetchone()
+
+    if not result:
+        raise ValueError("Database did not return any value")
+
+    return [result[0], result[1]]
+
+
+@with_db_conn()
+def login_user(cursor, username: str, password: str) -> bool:
+    query = "SELECT Code, Password FROM [User] WHERE Code = ?"
+    cursor.execute(query, (username,))
+    results = cursor.fetchall()
+
+    if not results:
+        raise ValueError("Database did not return anything")
+
+    for _, mt_password in results:
+        if password.casefold() == mt_password.casefold():
+            return True
+
+    return False
+
+
+# DEPARTMENT
+@REFERENCE_CACHE.cached("Department")
+@with_db_conn()
+def get_all_departments(cursor) -> Dict[int, str]:
+    """
+    Fetches all departments.
+
+    Returns a dictionary mapping department IDs to department names.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :return: Mapping of DepartmentPK to department names.
+    :rtype: Dict[int, str]
+    """
+    query = "SELECT DepartmentPK, Name FROM Department"
+
+    cursor.execute(query)
+    departments = cursor.fetchall()
+
+    department_dict = {}
+    if departments:
+        for x in departments:
+            if x[1]:
+                department_dict[x[0]] = x[1]
+
+    return department_dict
+
+
+@with_db_conn()
+def get_department_name(cursor, departmentpk: int) -> str:
+    """
+    Retrieves the name of a department given its primary key.
+
+    :param cursor: A database cursor used to execute the query.
+    :param departmentpk: The primary key of the department.
+    :return: The name of the department.
+    :raises ValueError: If no department with the given primary key is found.
+    """
+    query = "SELECT Name FROM Department WHERE DepartmentPK = ?"
+
+    cursor.execute(query, (departmentpk,))
+    result = cursor.fetchone()
+
+    if not result:
+        raise ValueError("Database did not return any value")
+
+    return result[0]
+
+
+@with_db_conn()
+def get_users_in_department(cursor, departmentpk: int) -> Dict[int, tuple[str, str]]:
+    query_users = (
+        "SELECT UserPK, FirstName, LastName FROM [User] WHERE DepartmentFK = ?"
+    )
+    cursor.execute(query_users, (departmentpk,))
+    department_users = cursor.fetchall()
+
+    return {
+        userpk: (firstname, lastname)
+        for userpk, firstname, lastname in department_users
+    }
+
+
+@with_db_conn()
+def get_all_department_members(cursor) -> Dict[int, List[int]]:
+    """
+    Fetches the UserPKs of every department in one query.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :return: Mapping of DepartmentPK to the UserPKs in it.
+    :rtype: Dict[int, List[int]]
+    """
+    query = "SELECT DepartmentFK, UserPK FROM [User] WHERE DepartmentFK IS NOT NULL"
+    cursor.execute(query)
+
+    members = {}
+    for department_pk, userpk in cursor.fetchall():
+        members.setdefault(department_pk, []).append(userpk)
+
+    return members
+
+
+@with_db_conn()
+def get_user_departments(cursor) -> Dict[int, int | None]:
+    """
+    Fetches the department of every user, enabled or not, in one query.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :return: Mapping of UserPK to DepartmentFK (None for users without a department).
+    :rtype: Dict[int, int | None]
+    """
+    cursor.execute("SELECT UserPK, DepartmentFK FROM [User]")
+
+    return {
+        int(userpk): None if department_pk is None else int(department_pk)
+        for userpk, department_pk in cursor.fetchall()
+    }
+
+
+@with_db_conn()
+def get_department_member_counts(cursor) -> Dict[int, int]:
+    """
+    Counts the users of every department in one grouped query.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :return: Mapping of DepartmentPK to number of users.
+    :rtype: Dict[int, int]
+    """
+    query = """
+        SELECT DepartmentFK, COUNT(*)
+        FROM [User]
+        WHERE DepartmentFK IS NOT NULL
+        GROUP BY DepartmentFK;
+    """
+    cursor.execute(query)
+
+    return {department_pk: count for department_pk, count in cursor.fetchall()}
+
+
+@with_db_conn()
+def get_department_item_coverage(
+    cursor, item_table: str, full_only: bool = False
+) -> List[tuple[int, str, str, int, int]]:
+    """
+    Counts, for every department and item, how many department members hold the item.
+
+    One grouped query covers all departments. With ``full_only`` the query keeps only
+    the items held by every member (``HAVING COUNT = member_count``).
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param item_table: One of "Dashboard", "QuickView" or "DocumentGroup".
+    :type item_table: str
+    :param full_only: Only return items held by every member of the department.
+    :type full_only: bool
+    :return: (DepartmentPK, item PK, item label, members holding it, member count) rows.
+    :rtype: List[tuple[int, str, str, int, int]]
+    """
+    link_table, item_fk = _get_link_table(item_table)
+    label_column = _LABEL_COLUMNS[item_table]
+
+    query = f"""
+        SELECT u.DepartmentFK, i.{item_table}PK, i.{label_column},
+               COUNT(DISTINCT l.UserFK), m.MemberCount
+        FROM {link_table} l
+        JOIN [User] u ON l.UserFK = u.UserPK
+        JOIN {item_table} i ON l.{item_fk} = i.{item_table}PK
+        JOIN (
+            SELECT DepartmentFK, COUNT(*) AS MemberCount
+            FROM [User]
+            WHERE DepartmentFK IS NOT NULL
+            GROUP BY DepartmentFK
+        ) m ON m.DepartmentFK = u.DepartmentFK
+        GROUP BY u.DepartmentFK, i.{item_table}PK, i.{label_column}, m.MemberCount
+    """
+    if full_only:
+        query += " HAVING COUNT(DISTINCT l.UserFK) = m.MemberCount"
+
+    cursor.execute(query)
+
+    return [
+        (department_pk, str(item_pk), label, holders, member_count)
+        for department_pk, item_pk, label, holders, member_count in cursor.fetchall()
+        if label
+    ]
+
+
+# VACATION REQUESTS
+
+
+@with_db_conn()
+def get_all_vacation_requests(cursor, exclude_pks: Iterable[int] = ()) -> List:
+    """
+    Fetch all pending vacation requests by joining the User table.
+
+    This function retrieves all vacation requests that are not yet approved,
+    including employee details such as first name and last name.
+
+    :param cursor: Database cursor passed by the decorator.
+    :type cursor: pyodbc.Cursor
+    :param exclude_pks: Requests to leave out, e.g. the ones already disapproved.
+    :type exclude_pks: Iterable[int]
+    :return: A formatted list of vacation request records.
+    :rtype: List
+    :raises ValueError: If no records are returned from the query.
+    """
+    exclude = _exclude_vacation_requests(cursor, exclude_pks)
+    query = f"""
+        SELECT v.VacationRequestPK, u.firstname, u.lastname, v.FromDate, v.ToDate, 
+               v.StartTime, v.Hours, v.Reason, v.Approved
+        FROM VacationRequest v
+        JOIN [User] u ON v.EmployeeFK = u.UserPK 
+        WHERE v.Approved = 0{exclude}
+        ORDER BY v.VacationRequestPK DESC;
+    """
+
+    cursor.execute(query)
+    results = cursor.fetchall()
+
+    if not results:
+        LOGGER.error(f"MT did not return anything for: \n{query}")
+        raise ValueError("Mie Trak did not return anything. Check Query.")
+
+    return _format_results(results)
+
+
+# Characters of the Reason shown in lists, the full text is read with get_vacation_request_reason.
+REASON_PREVIEW_LENGTH = 100
+
+# Sort options of get_vacation_requests_page: (sort expression, direction).
+VACATION_REQUEST_SORTS = {
+    "newest": ("v.VacationRequestPK", "DESC"),
+    "oldest": ("v.VacationRequestPK", "ASC"),
+    "from_date": ("ISNULL(v.FromDate, '19000101')", "ASC"),
+}
+
+_VACATION_REQUEST_COLUMNS = f"""
+    v.VacationRequestPK, u.firstname, u.lastname, v.FromDate, v.ToDate,
+    v.StartTime, v.Hours, LEFT(v.Reason, {REASON_PREVIEW_LENGTH}), v.Approved,
+    CASE WHEN LEN(v.Reason) > {REASON_PREVIEW_LENGTH} THEN 1 ELSE 0 END
+"""
+_VACATION_REQUEST_FROM = """
+    FROM VacationRequest v
+    JOIN [User] u ON v.EmployeeFK = u.UserPK
+"""
+
+
+def _vacation_request_where(
+    cursor, filters: Dict[str, Any] | None, exclude_pks: Iterable[int]
+) -> tuple[str, List[Any]]:
+    """
+    Builds the WHERE clause shared by the pending vacation request queries.
+
+    :param filters: Optional "from_date" and "to_date" (requests overlapping the range),
+        "employee" (part of the first or last name) and "department_pk".
+    :return: The clause, starting with WHERE, and its parameters.
+    """
+    filters = filters or {}
+    conditions = ["v.Approved = 0"]
+    params: List[Any] = []
+
+    if filters.get("from_date"):
+        conditions.append("v.ToDate >= ?")
+        params.append(filters["from_date"])
+    if filters.get("to_date"):
+        conditions.append("v.FromDate <= ?")
+        params.append(filters["to_date"])
+    if filters.get("employee"):
+        conditions.append("(u.FirstName + ' ' + u.LastName) LIKE ?")
+        params.append(f"%{filters['employee']}%")
+    if filters.get("department_pk") is not None:
+        conditions.append("u.DepartmentFK = ?")
+        params.append(filters["department_pk"])
+
+    where = "WHERE " + " AND ".join(conditions)
+    return where + _exclude_vacation_requests(cursor, exclude_pks), params
+
+
+def _format_previews(rows) -> List[VacationRequestRecord]:
+    formatted = []
+    for row in rows:
+        record = VacationRequestRecord(*row[:9])
+        record.reason_truncated = bool(row[9])
+        formatted.append(record)
+    return formatted
+
+
+@with_db_conn()
+def get_vacation_requests_page(
+    cursor,
+    filters: Dict[str, Any] | None = None,
+    exclude_pks: Iterable[int] = (),
+    sort: str = "newest",
+    after: tuple | None = None,
+    limit: int = 100,
+) -> Dict[str, Any]:
+    """
+    Fetches one page of pending vacation requests.
+
+    Pages are read by keyset rather than offset, so every page costs the same however
+    deep the caller scrolls. Reasons are cut to REASON_PREVIEW_LENGTH characters and
+    flagged with "Reason Truncated".
+
+    :param cursor: Database cursor passed by the decorator.
+    :type cursor: pyodbc.Cursor
+    :param filters: See `_vacation_request_where`.
+    :type filters: Dict[str, Any] | None
+    :param exclude_pks: Requests to leave out, e.g. the ones already disapproved.
+    :type exclude_pks: Iterable[int]
+    :param sort: One of VACATION_REQUEST_SORTS.
+    :type sort: str
+    :param after: The "next" value of the previous page, None for the first page.
+    :type after: tuple | None
+    :param limit: Maximum number of requests returned.
+    :type limit: int
+    :return: ``{"rows": formatted requests, "next": keyset of the next page or None}``
+    :rtype: Dict[str, Any]
+    """
+    sort_key, direction = VACATION_REQUEST_SORTS[sort]
+    where, params = _vacation_request_where(cursor, filters, exclude_pks)
+
+    if after is not None:
+        op = "<" if direction == "DESC" else ">"
+        after_key, after_pk = after
+        where += f" AND ({sort_key} {op} ? OR ({sort_key} = ? AND v.VacationRequestPK {op} ?))"
+        params.extend((after_key, after_key, after_pk))
+
+    query = f"""
+        SELECT TOP (?) {sort_key}, {_VACATION_REQUEST_COLUMNS}
+        {_VACATION_REQUEST_FROM}
+        {where}
+        ORDER BY {sort_key} {direction}, v.VacationRequestPK {direction};
+    """
+    cursor.execute(query, (limit, *params))
+    results = cursor.fetchall()
+
+    next_page = None
+    if len(results) == limit:
+        next_page = (results[-1][0], results[-1][1])
+
+    return {"rows": _format_previews([row[1:] for row in results]), "next": next_page}
+
+
+@with_db_conn()
+def count_vacation_requests(
+    cursor, filters: Dict[str, Any] | None = None, exclude_pks: Iterable[int] = ()
+) -> int:
+    """
+    Counts the pending vacation requests matching the filters.
+
+    :param cursor: Database cursor passed by the decorator.
+    :type cursor: pyodbc.Cursor
+    :param filters: See `_vacation_request_where`.
+    :type filters: Dict[str, Any] | None
+    :param exclude_pks: Requests to leave out.
+    :type exclude_pks: Iterable[int]
+    :return: Number of matching requests.
+    :rtype: int
+    """
+    where, params = _vacation_request_where(cursor, filters, exclude_pks)
+    cursor.execute(f"SELECT COUNT(*) {_VACATION_REQUEST_FROM} {where};", params)
+    return cursor.fetchone()[0]
+
+
+@with_db_conn()
+def get_vacation_request_reason(cursor, pk: int) -> str:
+    """
+    Fetches the full Reason of a vacation request.
+
+    :param cursor: Database cursor passed by the decorator.
+    :type cursor: pyodbc.Cursor
+    :param pk: Primary key of the vacation request.
+    :type pk: int
+    :return: The reason, empty if there is none.
+    :rtype: str
+    """
+    cursor.execute(
+        "SELECT Reason FROM VacationRequest WHERE VacationRequestPK = ?;", (pk,)
+    )
+    result = cursor.fetchone()
+    return (result[0] or "") if result else ""
+
+
+@with_db_conn()
+def get_vacation_request_reasons(cursor, pks: List[int]) -> Dict[int, str]:
+    """
+    Fetches the full Reason of many vacation requests.
+
+    :param cursor: Database cursor passed by the decorator.
+    :type cursor: pyodbc.Cursor
+    :param pks: Primary keys of the vacation requests.
+    :type pks: List[int]
+    :return: Mapping of VacationRequestPK to its reason, empty if there is none.
+    :rtype: Dict[int, str]
+    """
+    reasons = {}
+    for chunk in _chunks(list(pks), _MAX_PARAMS):
+        placeholders = ", ".join("?" * len(chunk))
+        cursor.execute(
+            "SELECT VacationRequestPK, Reason FROM VacationRequest "
+            f"WHERE VacationRequestPK IN ({placeholders});",
+            tuple(chunk),
+        )
+        reasons.update({int(pk): reason or "" for pk, reason in cursor.fetchall()})
+
+    return reasons
+
+
+@with_db_conn()
+def get_vacation_request_updates(
+    cursor,
+    after_pk: int,
+    known_pks: Iterable[int],
+    exclude_pks: Iterable[int] = (),
+    filters: Dict[str, Any] | None = None,
+    min_pk: int = 0,
+) -> Dict[str, Any]:
+    """
+    Fetches what changed in the pending vacation requests since the last refresh.
+
+    VacationRequestPK only grows, so new requests are read past a high-water mark.
+    Requests that stopped being pending (approved elsewhere) or became pending again
+    are found from a PK-only query of the pending requests, and only the latter are
+    read in full.
+
+    :param cursor: Database cursor passed by the decorator.
+    :type cursor: pyodbc.Cursor
+    :param after_pk: Highest VacationRequestPK the caller has already seen.
+    :type after_pk: int
+    :param known_pks: PKs of the pending requests the caller already holds.
+    :type known_pks: Iterable[int]
+    :param exclude_pks: Requests to leave out, e.g. the ones already disapproved.
+    :type exclude_pks: Iterable[int]
+    :param filters: See `_vacation_request_where`.
+    :type filters: Dict[str, Any] | None
+    :param min_pk: Re-pending requests below this PK are not read, for callers that
+        have not paged that far yet.
+    :type min_pk: int
+    :return: ``{"rows": formatted new or re-pending requests, "pending": set of every pending PK}``
+    :rtype: Dict[str, Any]
+    """
+    known_pks = set(known_pks)
+    where, params = _vacation_request_where(cursor, filters, exclude_pks)
+
+    cursor.execute(
+        f"SELECT v.VacationRequestPK {_VACATION_REQUEST_FROM} {where}", params
+    )
+    pending = {row[0] for row in cursor.fetchall()}
+
+    query = f"SELECT {_VACATION_REQUEST_COLUMNS} {_VACATION_REQUEST_FROM} {where}"
+
+    rows = []
+    if any(pk > after_pk for pk in pending):
+        cursor.execute(query + " AND v.VacationRequestPK > ?", (*params, after_pk))
+        rows.extend(cursor.fetchall())
+
+    resurfaced = sorted(pk for pk in pending - known_pks if min_pk <= pk <= after_pk)
+    for chunk in _chunks(resurfaced, _MAX_PARAMS - len(params)):
+        placeholders = ", ".join("?" * len(chunk))
+        cursor.execute(
+            query + f" AND v.VacationRequestPK IN ({placeholders})", (*params, *chunk)
+        )
+        rows.extend(cursor.fetchall())
+
+    rows.sort(key=lambda row: row[0], reverse=True)
+
+    return {"rows": _format_previews(rows), "pending": pending}
+
+
+def _exclude_vacation_requests(cursor, exclude_pks: Iterable[int]) -> str:
+    """
+    Loads the PKs into the #ExcludedVacationRequest temp table of this connection.
+
+    A temp table keeps the statement a fixed size however long the exclusion list
+    grows, where a NOT IN with one parameter per PK would hit the parameter limit.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param exclude_pks: Primary keys of the vacation requests to leave out.
+    :type exclude_pks: Iterable[int]
+    :return: A condition to append to a WHERE clause on ``VacationRequest v``,
+        empty when there is nothing to exclude.
+    :rtype: str
+    """
+    exclude_pks = sorted({int(pk) for pk in exclude_pks if pk is not None})
+
+    # Pooled connections keep their session, drop a table left by a previous call.
+    cursor.execute(
+        "IF OBJECT_ID('tempdb..#ExcludedVacationRequest') IS NOT NULL "
+        "DROP TABLE #ExcludedVacationRequest;"
+    )
+    if not exclude_pks:
+        return ""
+
+    cursor.execute(
+        "CREATE TABLE #ExcludedVacationRequest (VacationRequestPK INT PRIMARY KEY);"
+    )
+    if hasattr(cursor, "fast_executemany"):
+        cursor.fast_executemany = True
+    cursor.executemany(
+        "INSERT INTO #ExcludedVacationRequest (VacationRequestPK) VALUES (?);",
+        [(pk,) for pk in exclude_pks],
+    )
+
+    return (
+        " AND v.VacationRequestPK NOT IN "
+        "(SELECT VacationRequestPK FROM #ExcludedVacationRequest)"
+    )
+
+
+def _format_results(data) -> List[VacationRequestRecord]:
+    """
+    Wraps raw database query results in `VacationRequestRecord`.
+
+    Each record represents a vacation request. Dates, times and the employee name
+    are only formatted when the GUI reads them, with repeated values served from a cache.
+
+    :param data: List of tuples containing raw database results.
+    :type data: List[Tuple]
+    :return: A list of vacation request records.
+    :rtype: List[VacationRequestRecord]
+    """
+    return [VacationRequestRecord(*row) for row in data]
+
+
+@with_db_conn(commit=True)
+def approve_vacation_request(cursor, request_pk: int) -> None:
+    """
+    Marks a vacation request as approved.
+
+    Updates the `Approved` field of the `VacationRequest` table for the given request.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param request_pk: Primary key of the vacation request to approve.
+    :type request_pk: int
+    :return: None
+    """
+    query = """
+        UPDATE VacationRequest
+        SET Approved = 1
+        WHERE VacationRequestPK = ?
+    """
+    cursor.execute(query, (request_pk,))
+
+
+@with_db_conn(commit=True)
+def approve_vacation_requests(cursor, request_pks: List[int]) -> List[int]:
+    """
+    Approves many vacation requests in a single transaction.
+
+    Runs one UPDATE per chunk of PKs (a single round trip for any realistic selection)
+    and only touches requests that are still pending.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param request_pks: Primary keys of the vacation requests to approve.
+    :type request_pks: List[int]
+    :return: The PKs that were actually changed from pending to approved.
+    :rtype: List[int]
+    """
+    approved = []
+    for chunk in _chunks(list(request_pks), _MAX_PARAMS):
+        placeholders = ", ".join("?" * len(chunk))
+        query = f"""
+            UPDATE VacationRequest
+            SET Approved = 1
+            OUTPUT INSERTED.VacationRequestPK
+            WHERE VacationRequestPK IN ({placeholders}) AND Approved = 0
+        """
+        cursor.execute(query, tuple(chunk))
+        approved.extend(row[0] for row in cursor.fetchall())
+
+    return approved
+
+
+@with_db_conn(commit=True)
+def update_vacation_request_reason(cursor, vacation_request_pk: int, reason: str):
+    """
+    Adds a note to the vacation request.
+
+    Appends the `Reason` field of the `VacationRequest` table with the reason string.
+    Usually done when we want to keep track of what was disapproved in mie trak.
+
+    NOTE: Reason should have a timestamp. For reasoning formatting see VacationRequestPK = 3;
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param vacation_request_pk: Primary key of the vacation request to update.
+    :type vacation_request_pk: int
+    :param reason: The note to update the vacation request with.
+    :type reason: str
+    :raises RuntimeError: If parameters are None.
+    """
+    query = """
+    UPDATE VacationRequest
+    SET Reason = reason + CHAR(13) + CHAR(14) + CHAR(13) + CHAR(14) + ?
+    WHERE VacationRequestPK = ?
+    """
+    cursor.execute(query, (reason, vacation_request_pk))
+
+
+@with_db_conn()
+def get_user_email_from_vacation_pk(cursor, pk: int) -> str:
+    """
+    Retrieves the email of the user associated with a given vacation request.
+
+    :param cursor: Database cursor.
+    :type cursor: pyodbc.Cursor
+    :param pk: Primary key of the vacation request.
+    :type pk: int
+    :return: Email address of the user.
+    :rtype: str
+    :raises ValueError: If no matching record is found.
+    """
+    query = """
+        SELECT u.Email
+        FROM VacationRequest v
+        JOIN [User] u ON v.EmployeeFK = u.UserPK
+        WHERE v.VacationRequestPK = ?;
+    """
+
+    cursor.execute(query, (pk,))
+    result = cursor.fetchone()
+
+    if not result:
+        LOGGER.error("Database did not return anything")
+        raise ValueError("Database did not return anything")
+
+    return result[0]
+
+
+@with_db_conn()
+def get_entry_from_table(cursor, table_name: str, pk: int) -> Dict[str, str]:
+    """
+    Retrieves dashboard information as a dictionary.
+
+    :param cursor: A database cursor used to execute the query.
+    :param dashboardpk: The primary key of the dashboard.
+    :return: A dictionary containing dashboard information with column names as keys.
+    :raises ValueError: If no dashboard with the given primary key is found.
+    """
+    query = f"SELECT * FROM {table_name} WHERE {table_name}PK = ?"
+    cursor.execute(query, (pk,))
+    row = cursor.fetchone()
+
+    if not row:
+        raise ValueError(f"No entry found in {table_name}PK:  {pk}")
+
+    column_names = [desc[0] for desc in cursor.description]
+
+    return dict(zip(column_names, row))
@@ -0,0 +1,192 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List
+from scripts import mie_trak_funcs
+from base_logger import getlogger
+
+
+LOGGER = getlogger("Permissions")
+
+ITEM_TABLES = ("Dashboard", "QuickView", "DocumentGroup")
+
+
+def _contains(values: array, value: int) -> bool:
+    idx = bisect_left(values, value)
+    return idx < len(values) and values[idx] == value
+
+
+def _add(index: Dict[int, array], key: int, value: int) -> bool:
+    values = index.setdefault(key, array("q"))
+    if _contains(values, value):
+        return False
+    insort(values, value)
+    return True
+
+
+def _remove(index: Dict[int, array], key: int, value: int) -> bool:
+    values = index.get(key)
+    if values is None:
+        return False
+
+    idx = bisect_left(values, value)
+    if idx == len(values) or values[idx] != value:
+        return False
+
+    del values[idx]
+    if not values:
+        del index[key]
+    return True
+
+
+class PermissionMatrix:
+    """
+    In-memory user x item access for dashboards, QuickViews and document groups.
+
+    The whole matrix is loaded with one query per link table and kept as two indexes
+    per item table: user -> sorted item PKs and item -> sorted user PKs, each stored
+    as a compact ``array``. Lookups in either direction are served from memory, and
+    writes made through the `Controller` patch the indexes in place instead of
+    reloading them.
+
+    :param max_age: Seconds after which `ensure_loaded` reloads the matrix, so changes
+        made outside this application are picked up.
+    :type max_age: float
+    """
+
+    def __init__(self, max_age: float = 300.0) -> None:
+        self.max_age = max_age
+        self.loaded_at: float | None = None
+
+        self._lock = threading.RLock()
+        self._by_user: Dict[str, Dict[int, array]] = {t: {} for t in ITEM_TABLES}
+        self._by_item: Dict[str, Dict[int, array]] = {t: {} for t in ITEM_TABLES}
+
+    def load(self) -> None:
+        """
+        Loads the full matrix from the database, replacing the current contents.
+        """
+        by_user = {}
+        by_item = {}
+
+        for item_table in ITEM_TABLES:
+            links = mie_trak_funcs.get_all_user_links(item_table)
+            by_user[item_table] = self._build_index(links, 0)
+            by_item[item_table] = self._build_index(links, 1)
+
+        with self._lock:
+            self._by_user = by_user
+            self._by_item = by_item
+            self.loaded_at = time.monotonic()
+
+        LOGGER.info(
+            "Permission matrix loaded: "
+            + ", ".join(f"{t}: {self.link_count(t)} links" for t in ITEM_TABLES)
+        )
+
+    def ensure_loaded(self) -> None:
+        """
+        Loads the matrix if it was never loaded or is older than ``max_age``.
+        """
+        if self.loaded_at is None or time.monotonic() - self.loaded_at > self.max_age:
+            self.load()
+
+    def refresh_user(self, userpk: int) -> None:
+        """
+        Reloads the rows of a single user from the database.
+
+        :param userpk: Primary key of the user.
+        :type userpk: int
+        """
+        userpk = int(userpk)
+        fresh = {
+            item_table: [
+                pk for _, pk in mie_trak_funcs.get_all_user_links(item_table, userpk)
+            ]
+            for item_table in ITEM_TABLES
+        }
+
+        with self._lock:
+            for item_table, item_pks in fresh.items():
+                current = list(self._by_user[item_table].get(userpk, ()))
+                self.revoke(item_table, [userpk], current)
+                self.grant(item_table, [userpk], item_pks)
+
+    def items_for_user(self, item_table: str, userpk: int) -> List[int]:
+        """
+        Returns the sorted PKs of the items of one table a user has access to.
+
+        :rtype: List[int]
+        """
+        with self._lock:
+            return list(self._by_user[item_table].get(int(userpk), ()))
+
+    def users_for_item(self, item_table: str, item_pk: int) -> List[int]:
+        """
+        Returns the sorted PKs of the users that have access to an item.
+
+        :rtype: List[int]
+        """
+        with self._lock:
+            return list(self._by_item[item_table].get(int(item_pk), ()))
+
+    def has_access(self, item_table: str, userpk: int, item_pk: int) -> bool:
+        """
+        Returns whether a user has access to an item.
+        """
+        with self._lock:
+            values = self._by_user[item_table].get(int(userpk))
+            return values is not None and _contains(values, int(item_pk))
+
+    def link_count(self, item_table: str) -> int:
+        """
+        Returns the number of user/item links held for an item table.
+        """
+        with self._lock:
+            return sum(len(values) for values in self._by_user[item_table].values())
+
+    def grant(
+        self, item_table: str, user_pks: Iterable[int], item_pks: Iterable[int]
+    ) -> None:
+        """
+        Records that every user in ``user_pks`` now has every item in ``item_pks``.
+        """
+        item_pks = [int(pk) for pk in item_pks]
+
+        with self._lock:
+            by_user = self._by_user[item_table]
+            by_item = self._by_item[item_table]
+            for userpk in user_pks:
+                userpk = int(userpk)
+                for item_pk in item_pks:
+                    if _add(by_user, userpk, item_pk):
+                        _add(by_item, item_pk, userpk)
+
+    def revoke(
+        self, item_table: str, user_pks: Iterable[int], item_pks: Iterable[int]
+    ) -> None:
+        """
+        Records that no user in ``user_pks`` has any item in ``item_pks`` anymore.
+        """
+        item_pks = [int(pk) for pk in item_pks]
+
+        with self._lock:
+            by_user = self._by_user[item_table]
+            by_item = self._by_item[item_table]
+            for userpk in user_pks:
+                userpk = int(userpk)
+                for item_pk in item_pks:
+                    if _remove(by_user, userpk, item_pk):
+                        _remove(by_item, item_pk, userpk)
+
+    @staticmethod
+    def _build_index(
+        links: List[tuple[int, int]], key_position: int
+    ) -> Dict[int, array]:
+        grouped: Dict[int, set] = {}
+        value_position = 1 - key_position
+        for link in links:
+            grouped.setdefault(link[key_position], set()).add(link[value_position])
+
+        return {key: array("q", sorted(values)) for key, values in grouped.items()}
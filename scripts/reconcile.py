@@ -0,0 +1,187 @@
+"""
+Repairs drift between the department cache and the link tables.
+
+Usage (from the project root):
+
+    python -m scripts.reconcile --dry-run
+    python -m scripts.reconcile --department 12 --department 14 --plan-file plan.json
+"""
+
+import argparse
+import json
+import time
+from typing import Dict, Iterable, List
+from scripts import mie_trak_funcs
+from scripts.department_store import ACCESSED_KEYS
+from base_logger import getlogger
+
+
+LOGGER = getlogger("Reconcile")
+
+
+class ReconcilePlan:
+    """
+    The link table changes needed to match the department cache.
+
+    - ``inserts``: (UserPK, item PK) pairs a department member is missing, keyed by item table.
+    - ``deletes``: link table PKs of duplicate rows (same user and item), keyed by item table.
+      The oldest row of each pair is kept.
+    - ``missing``: per department and item table, the members missing each item, for reporting.
+    """
+
+    def __init__(self) -> None:
+        self.inserts: Dict[str, List[tuple[int, int]]] = {t: [] for t in ACCESSED_KEYS}
+        self.deletes: Dict[str, List[int]] = {t: [] for t in ACCESSED_KEYS}
+        self.missing: Dict[str, Dict[str, Dict[str, List[int]]]] = {}
+
+    def is_empty(self) -> bool:
+        return not any(self.inserts.values()) and not any(self.deletes.values())
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        return {
+            item_table: {
+                "inserts": len(self.inserts[item_table]),
+                "deletes": len(self.deletes[item_table]),
+            }
+            for item_table in ACCESSED_KEYS
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            "summary": self.summary(),
+            "missing": self.missing,
+            "duplicate_link_pks": self.deletes,
+        }
+
+
+def build_plan(
+    cache_dict: Dict, department_pks: Iterable[int | str] | None = None
+) -> ReconcilePlan:
+    """
+    Diffs the expected department grants against the link tables.
+
+    Everything is bulk loaded up front (one query for all department members and one
+    per link table) and compared with set operations in memory. When only some
+    departments are reconciled, only the duplicate link rows of their members are
+    deleted.
+
+    :param cache_dict: Department cache in the `Controller.cache_dict` shape.
+    :type cache_dict: Dict
+    :param department_pks: Only reconcile these departments, all of them when None.
+    :type department_pks: Iterable[int | str] | None
+    :return: The plan.
+    :rtype: ReconcilePlan
+    """
+    wanted = None if department_pks is None else {str(pk) for pk in department_pks}
+    members = mie_trak_funcs.get_all_department_members()
+    plan = ReconcilePlan()
+
+    # Duplicates are only cleaned up for the members of the reconciled departments.
+    wanted_users = None
+    if wanted is not None:
+        wanted_users = {
+            userpk
+            for department_pk, department_members in members.items()
+            if str(department_pk) in wanted
+            for userpk in department_members
+        }
+
+    for item_table, accessed_key in ACCESSED_KEYS.items():
+        held = set()
+        for link_pk, user_fk, item_pk in sorted(
+            mie_trak_funcs.get_all_link_rows(item_table)
+        ):
+            if (user_fk, item_pk) not in held:
+                held.add((user_fk, item_pk))
+            elif wanted_users is None or user_fk in wanted_users:
+                plan.deletes[item_table].append(link_pk)
+
+        planned = set()
+        for department_pk, department in cache_dict.items():
+            if wanted is not None and department_pk not in wanted:
+                continue
+
+            department_members = members.get(int(department_pk), [])
+            for item_pk in department.get(accessed_key, {}):
+                item_pk = int(item_pk)
+                missing_users = [
+                    userpk
+                    for userpk in department_members
+                    if (userpk, item_pk) not in held
+                ]
+                if not missing_users:
+                    continue
+
+                plan.missing.setdefault(department_pk, {}).setdefault(item_table, {})[
+                    str(item_pk)
+                ] = missing_users
+
+                for userpk in missing_users:
+                    # Users can only be in one department, but guard against duplicates anyway.
+                    if (userpk, item_pk) not in planned:
+                        planned.add((userpk, item_pk))
+                        plan.inserts[item_table].append((userpk, item_pk))
+
+    return plan
+
+
+def apply_plan(plan: ReconcilePlan) -> Dict[str, Dict[str, int]]:
+    """
+    Applies a plan with bulk inserts and deletes in a single transaction.
+
+    :param plan: The plan returned by `build_plan`.
+    :type plan: ReconcilePlan
+    :return: Inserted and deleted row counts keyed by item table.
+    :rtype: Dict[str, Dict[str, int]]
+    """
+    if plan.is_empty():
+        return {}
+
+    return mie_trak_funcs.apply_link_changes(plan.inserts, plan.deletes)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Repair drift between the department cache and the link tables."
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only print the plan, change nothing."
+    )
+    parser.add_argument(
+        "--department",
+        action="append",
+        dest="departments",
+        help="DepartmentPK to reconcile, can be repeated. Defaults to every department.",
+    )
+    parser.add_argument(
+        "--plan-file", help="Also write the full plan to this JSON file."
+    )
+    args = parser.parse_args(argv)
+
+    # Imported here so building a plan from another module does not need the Outlook bindings.
+    from scripts.controller import Controller
+
+    start = time.perf_counter()
+    controller = Controller()
+    plan = build_plan(controller.cache_dict, args.departments)
+    planned_in = time.perf_counter() - start
+
+    print(json.dumps(plan.summary(), indent=4))
+    LOGGER.info(f"Plan built in {planned_in:.2f}s")
+
+    if args.plan_file:
+        with open(args.plan_file, "w") as jsonfile:
+            json.dump(plan.to_dict(), jsonfile, indent=4)
+
+    if args.dry_run or plan.is_empty():
+        return 0
+
+    start = time.perf_counter()
+    result = apply_plan(plan)
+    LOGGER.info(f"Plan applied in {time.perf_counter() - start:.2f}s: {result}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+import copy
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class ReferenceCache:
+    """
+    A process-wide, thread-safe cache for reference tables that rarely change.
+
+    Entries are grouped by table so each table has its own time to live and can be
+    invalidated on its own after a write. Callers get a shallow copy of the cached
+    value so they can freely mutate what they receive.
+
+    :param ttls: Seconds an entry stays fresh, keyed by table name.
+    :type ttls: Dict[str, float]
+    :param default_ttl: Seconds an entry stays fresh for tables missing from ``ttls``.
+    :type default_ttl: float
+    """
+
+    def __init__(self, ttls: Dict[str, float], default_ttl: float = 300.0) -> None:
+        self.ttls = dict(ttls)
+        self.default_ttl = default_ttl
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[Hashable, Tuple[float, Any]]] = {}
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._generations: Dict[str, int] = {}
+
+    def cached(self, table: str) -> Callable:
+        """
+        Decorator caching a function's result under ``table``, keyed by its arguments.
+
+        :param table: Name of the table the function reads.
+        :type table: str
+        :return: The decorator.
+        :rtype: Callable
+        """
+
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key = (func.__name__, args, tuple(sorted(kwargs.items())))
+                return self.get_or_load(table, key, lambda: func(*args, **kwargs))
+
+            return wrapper
+
+        return decorator
+
+    def get_or_load(self, table: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value for ``key`` or loads and caches it.
+
+        :param table: Name of the table the value belongs to.
+        :type table: str
+        :param key: Cache key within the table.
+        :type key: Hashable
+        :param loader: Called on a miss or an expired entry.
+        :type loader: Callable[[], Any]
+        :return: A shallow copy of the cached value.
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(table, {}).get(key)
+            if entry is not None and entry[0] > now:
+                self._hits[table] = self._hits.get(table, 0) + 1
+                return copy.copy(entry[1])
+            self._misses[table] = self._misses.get(table, 0) + 1
+            generation = self._generations.get(table, 0)
+
+        value = loader()
+        expires_at = time.monotonic() + self.ttls.get(table, self.default_ttl)
+
+        with self._lock:
+            # Don't store a value loaded before an invalidation of its table.
+            if self._generations.get(table, 0) == generation:
+                self._entries.setdefault(table, {})[key] = (expires_at, value)
+
+        return copy.copy(value)
+
+    def invalidate(self, *tables: str) -> None:
+        """
+        Drops the cached entries of the given tables, or of every table if none are given.
+        """
+        with self._lock:
+            known_tables = (
+                set(self._entries) | set(self._generations) | set(self._misses)
+            )
+            for table in tables or known_tables:
+                self._entries.pop(table, None)
+                self._generations[table] = self._generations.get(table, 0) + 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Returns hit, miss and entry counts per table.
+
+        :rtype: Dict[str, Dict[str, int]]
+        """
+        with self._lock:
+            tables = set(self._hits) | set(self._misses) | set(self._entries)
+            return {
+                table: {
+                    "hits": self._hits.get(table, 0),
+                    "misses": self._misses.get(table, 0),
+                    "entries": len(self._entries.get(table, {})),
+                }
+                for table in sorted(tables)
+            }
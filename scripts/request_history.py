@@ -1,29 +1,216 @@
-from typing import List, Dict, Any
-import json
-
-
-class RequestHistory:
-    def __init__(self):
-        try:
-            with open(
-                r"C:\PythonProjects\QuickViewDashboardAccess\data\past_requests.json",
-                "r",
-            ) as jsonfile:
-                data = json.load(jsonfile)
-                self.approved_requests = data.get("approved_requests")
-                self.disapproved_requests = data.get("disapproved_requests")
-        except Exception as e:
-            print(e)
-            self.approved_requests: List[Dict[str, Any]] = []
-            self.disapproved_requests: List[Dict[str, Any]] = []
-
-    def write_cache(self):
-        data = {
-            "approved_requests": self.approved_requests,
-            "disapproved_requests": self.disapproved_requests,
-        }
-
-        with open(
-            r"C:\PythonProjects\QuickViewDashboardAccess\data\past_requests.json", "w"
-        ) as jsonfile:
-            json.dump(data, jsonfile, indent=4)
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import List, Dict, Any
+from base_logger import getlogger
+
+
+LOGGER = getlogger("Request History")
+
+HISTORY_FILE = r"C:\PythonProjects\QuickViewDashboardAccess\data\past_requests.db"
+# Legacy JSON history, only read once to seed HISTORY_FILE.
+LEGACY_HISTORY_FILE = (
+    r"C:\PythonProjects\QuickViewDashboardAccess\data\past_requests.json"
+)
+
+TIME_STAMP_FORMAT = "%Y-%m-%d %I:%M %p"
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS request_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        vacation_pk INTEGER,
+        status TEXT NOT NULL,
+        recorded_at TEXT,
+        row TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS request_history_vacation_pk ON request_history (vacation_pk);
+    CREATE INDEX IF NOT EXISTS request_history_status ON request_history (status, id);
+    CREATE INDEX IF NOT EXISTS request_history_status_vacation_pk
+        ON request_history (status, vacation_pk);
+    CREATE INDEX IF NOT EXISTS request_history_recorded_at ON request_history (recorded_at);
+"""
+
+
+class RequestHistory:
+    """
+    Append-only history of the approved and disapproved vacation requests.
+
+    Rows live in a SQLite database indexed on vacation PK, status and timestamp, so
+    recording a decision is a single insert and nothing is loaded at startup; the
+    history is read a page at a time with `query`. Each row is stored whole as JSON
+    next to the indexed columns. The disapproved vacation PKs are also kept in a set,
+    read once from the index and updated on every append, so filtering pending
+    requests against them is a constant time lookup per request.
+
+    If the database is empty and ``legacy_json_path`` exists, the old
+    past_requests.json is imported once on open.
+
+    :param path: Path of the SQLite database file.
+    :type path: str
+    :param legacy_json_path: Path of the old past_requests.json to migrate from.
+    :type legacy_json_path: str | None
+    """
+
+    def __init__(
+        self,
+        path: str = HISTORY_FILE,
+        legacy_json_path: str | None = LEGACY_HISTORY_FILE,
+    ) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._disapproved_pks: set | None = None
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        if legacy_json_path and self._is_empty() and os.path.exists(legacy_json_path):
+            self._migrate_json(legacy_json_path)
+
+    def append(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Records decided requests. Every row needs its "Status" ("Approved" or
+        "Disapproved") and normally a "Time Stamp".
+
+        :param rows: The vacation request rows to record.
+        :type rows: List[Dict[str, Any]]
+        """
+        records = [self._record(row) for row in rows]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO request_history (vacation_pk, status, recorded_at, row) "
+                "VALUES (?, ?, ?, ?)",
+                records,
+            )
+
+            if self._disapproved_pks is not None:
+                self._disapproved_pks.update(
+                    pk for pk, status, _, _ in records if status == "Disapproved"
+                )
+
+    def query(
+        self,
+        status: str | None = None,
+        limit: int = 100,
+        before_id: int | None = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns one page of the history, newest first.
+
+        Pages are read by keyset: pass the "History ID" of the last row of a page as
+        ``before_id`` to get the next one.
+
+        :param status: Only rows with this status, every row when None.
+        :type status: str | None
+        :param limit: Maximum number of rows returned.
+        :type limit: int
+        :param before_id: Only rows recorded before this history row.
+        :type before_id: int | None
+        :return: The rows, each with its "History ID".
+        :rtype: List[Dict[str, Any]]
+        """
+        conditions, params = self._filters(status)
+        if before_id is not None:
+            conditions.append("id < ?")
+            params.append(before_id)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            records = self._conn.execute(
+                f"SELECT id, row FROM request_history {where} ORDER BY id DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+
+        return [
+            {**json.loads(row), "History ID": history_id} for history_id, row in records
+        ]
+
+    def count(self, status: str | None = None) -> int:
+        """
+        Returns the number of recorded rows, optionally only those with ``status``.
+
+        :rtype: int
+        """
+        conditions, params = self._filters(status)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT COUNT(*) FROM request_history {where}", params
+            ).fetchone()[0]
+
+    def disapproved_pks(self) -> frozenset:
+        """
+        Returns the vacation PKs that were disapproved.
+
+        :rtype: frozenset
+        """
+        with self._lock:
+            if self._disapproved_pks is None:
+                self._disapproved_pks = {
+                    pk
+                    for (pk,) in self._conn.execute(
+                        "SELECT DISTINCT vacation_pk FROM request_history WHERE status = ?",
+                        ("Disapproved",),
+                    )
+                }
+            return frozenset(self._disapproved_pks)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _filters(status: str | None) -> tuple[List[str], List[Any]]:
+        if status is None:
+            return [], []
+        return ["status = ?"], [status]
+
+    @staticmethod
+    def _record(row: Dict[str, Any]) -> tuple:
+        recorded_at = None
+        time_stamp = row.get("Time Stamp")
+        if time_stamp:
+            try:
+                recorded_at = datetime.strptime(
+                    time_stamp, TIME_STAMP_FORMAT
+                ).isoformat()
+            except ValueError:
+                recorded_at = time_stamp
+
+        return (
+            row.get("Vacation ID"),
+            row["Status"],
+            recorded_at,
+            json.dumps(dict(row)),
+        )
+
+    def _is_empty(self) -> bool:
+        with self._lock:
+            return (
+                self._conn.execute("SELECT 1 FROM request_history LIMIT 1").fetchone()
+                is None
+            )
+
+    def _migrate_json(self, legacy_json_path: str) -> None:
+        try:
+            with open(legacy_json_path, "r") as jsonfile:
+                data = json.load(jsonfile)
+        except Exception as e:
+            LOGGER.critical(f"Could not migrate {legacy_json_path}: {e}")
+            return
+
+        rows = []
+        for key, status in (
+            ("approved_requests", "Approved"),
+            ("disapproved_requests", "Disapproved"),
+        ):
+            for row in data.get(key) or []:
+                rows.append({**row, "Status": row.get("Status") or status})
+
+        # Oldest first, so the ids follow the order the decisions were made in.
+        rows.sort(key=lambda row: self._record(row)[2] or "")
+        self.append(rows)
+        LOGGER.info(f"Migrated {len(rows)} past requests from {legacy_json_path}")
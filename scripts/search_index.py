@@ -0,0 +1,164 @@
+import heapq
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Set
+
+
+def _normalize(text: str) -> str:
+    return " ".join(str(text).lower().split())
+
+
+def _trigrams(word: str) -> Set[str]:
+    padded = f" {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """
+    Type-ahead search over a list of labels (user names, item descriptions or codes).
+
+    Built once when the reference data loads, the index holds a sorted word list for
+    prefix lookups and a trigram posting list for fuzzy matches. Every word of the
+    query has to match a word of the label, either as a prefix or, for words of three
+    characters or more, through shared trigrams (typos, swapped letters). Results
+    are ranked: whole label prefix, then word prefix, then substring, then fuzzy
+    matches by similarity, shorter labels first within a tier.
+
+    :param labels: The searchable texts, results are positions in this sequence.
+    :type labels: Iterable[str]
+    :param fuzzy_threshold: Share of a query word's trigrams a word needs to match fuzzily.
+    :type fuzzy_threshold: float
+    """
+
+    def __init__(self, labels: Iterable[str], fuzzy_threshold: float = 0.5) -> None:
+        self.fuzzy_threshold = fuzzy_threshold
+        self._texts = [_normalize(label) for label in labels]
+        self._padded_texts = [f" {text}" for text in self._texts]
+        # Within a tier shorter labels come first, then the original order.
+        count = len(self._texts)
+        self._order = [len(text) * count + i for i, text in enumerate(self._texts)]
+        # Whole labels sorted, for "label starts with the query" lookups.
+        self._by_text = sorted(range(count), key=self._texts.__getitem__)
+        self._sorted_texts = [self._texts[i] for i in self._by_text]
+
+        word_ids: Dict[str, Set[int]] = {}
+        for position, text in enumerate(self._texts):
+            for word in text.split():
+                word_ids.setdefault(word, set()).add(position)
+
+        self._words = sorted(word_ids)
+        self._word_ids = [word_ids[word] for word in self._words]
+
+        self._trigram_words: Dict[str, List[int]] = {}
+        for word_number, word in enumerate(self._words):
+            for trigram in _trigrams(word):
+                self._trigram_words.setdefault(trigram, []).append(word_number)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def search(self, query: str, limit: int | None = None) -> List[int]:
+        """
+        Returns the positions of the labels matching ``query``, best match first.
+
+        :param query: What the user typed.
+        :type query: str
+        :param limit: Maximum number of results, all of them when None.
+        :type limit: int | None
+        :return: Positions into the labels the index was built from.
+        :rtype: List[int]
+        """
+        query = _normalize(query)
+        if not query:
+            return list(range(len(self._texts)))[:limit]
+
+        candidates = None
+        similarity: Dict[int, float] = {}
+        for token in query.split():
+            matches = self._prefix_matches(token)
+            if len(token) >= 3:
+                for position, score in self._fuzzy_matches(token).items():
+                    if position not in matches:
+                        similarity[position] = min(similarity.get(position, 1.0), score)
+                        matches.add(position)
+
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+
+        # Labels starting with the query, found with a bisect instead of testing each candidate.
+        start = bisect_left(self._sorted_texts, query)
+        stop = bisect_left(self._sorted_texts, query + "\uffff", start)
+        leading = candidates.intersection(self._by_text[start:stop])
+        rest = candidates - leading
+
+        if " " not in query and not similarity:
+            # A single word matched only by word prefixes: everything else is one tier.
+            tiers = [leading, rest]
+        else:
+            tiers = [leading, *self._tiers(rest, query, similarity)]
+
+        ranked: List[int] = []
+        for tier in tiers:
+            if limit is not None and len(ranked) >= limit:
+                break
+            remaining = None if limit is None else limit - len(ranked)
+            ranked.extend(self._sorted(tier, remaining, similarity))
+        return ranked
+
+    def _sorted(
+        self, positions: Set[int], limit: int | None, similarity: Dict[int, float]
+    ) -> List[int]:
+        if similarity:
+
+            def key(position: int) -> tuple[float, int]:
+                return (-similarity.get(position, 1.0), self._order[position])
+
+        else:
+            key = self._order.__getitem__
+        if limit is not None and limit < len(positions):
+            return heapq.nsmallest(limit, positions, key=key)
+        return sorted(positions, key=key)
+
+    def _tiers(
+        self, positions: Set[int], query: str, similarity: Dict[int, float]
+    ) -> List[Set[int]]:
+        """
+        Splits the matches that do not start with the query into word prefix,
+        substring (or words out of order) and fuzzy matches.
+        """
+        padded_query = f" {query}"
+        word_prefix, substring, fuzzy = set(), set(), set()
+        for position in positions:
+            if padded_query in self._padded_texts[position]:
+                word_prefix.add(position)
+            elif query in self._texts[position] or position not in similarity:
+                substring.add(position)
+            else:
+                fuzzy.add(position)
+        return [word_prefix, substring, fuzzy]
+
+    def _prefix_matches(self, token: str) -> Set[int]:
+        matches: Set[int] = set()
+        index = bisect_left(self._words, token)
+        while index < len(self._words) and self._words[index].startswith(token):
+            matches |= self._word_ids[index]
+            index += 1
+        return matches
+
+    def _fuzzy_matches(self, token: str) -> Dict[int, float]:
+        token_trigrams = _trigrams(token)
+        shared = Counter()
+        for trigram in token_trigrams:
+            shared.update(self._trigram_words.get(trigram, ()))
+
+        needed = self.fuzzy_threshold * len(token_trigrams)
+        matches: Dict[int, float] = {}
+        for word_number, count in shared.items():
+            if count < needed:
+                continue
+
+            score = count / len(token_trigrams | _trigrams(self._words[word_number]))
+            for position in self._word_ids[word_number]:
+                matches[position] = max(matches.get(position, 0.0), score)
+        return matches
@@ -0,0 +1,500 @@
+"""
+Fills an SQLite stand-in database with synthetic MIE Trak data for scale testing.
+
+Usage (from the project root):
+
+    python -m scripts.synthetic_data --tier large --output mietrak_large.db
+    python -m scripts.synthetic_data --tier medium --seed 7 --output medium.db --department-store departments.db
+
+The same tier and seed always produce the same rows, so benchmark results taken on
+different changes can be compared.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List, Sequence, Tuple
+from scripts.db_backend import SqliteBackend
+from scripts.department_store import ACCESSED_KEYS, DepartmentStore
+from base_logger import getlogger
+
+
+LOGGER = getlogger("Synthetic Data")
+
+# Row counts of each scale tier. "link_rows" is the total over the three link tables.
+SCALE_TIERS: Dict[str, Dict[str, int]] = {
+    "small": {
+        "users": 200,
+        "departments": 12,
+        "dashboards": 40,
+        "quickviews": 400,
+        "document_groups": 30,
+        "link_rows": 8_000,
+        "vacation_requests": 600,
+    },
+    "medium": {
+        "users": 1_000,
+        "departments": 60,
+        "dashboards": 200,
+        "quickviews": 2_000,
+        "document_groups": 150,
+        "link_rows": 60_000,
+        "vacation_requests": 5_000,
+    },
+    "large": {
+        "users": 5_000,
+        "departments": 300,
+        "dashboards": 1_000,
+        "quickviews": 10_000,
+        "document_groups": 600,
+        "link_rows": 500_000,
+        "vacation_requests": 25_000,
+    },
+}
+
+# Share of the link rows going to each link table.
+LINK_SHARES = {"Dashboard": 0.25, "QuickView": 0.65, "DocumentGroup": 0.10}
+
+# Share of each link table granted through department-wide assignments, the rest
+# are individual grants.
+DEPARTMENT_GRANT_SHARE = 0.4
+
+# Exponent of the power law of item popularity: the item of rank r is picked with
+# weight 1 / r ** ITEM_POPULARITY_EXPONENT.
+ITEM_POPULARITY_EXPONENT = 1.1
+
+_FIRST_NAMES = (
+    "James Mary Robert Patricia John Jennifer Michael Linda David Elizabeth William "
+    "Barbara Richard Susan Joseph Jessica Thomas Sarah Charles Karen Daniel Lisa "
+    "Matthew Nancy Anthony Betty Mark Sandra Donald Ashley Steven Kimberly Andrew "
+    "Emily Paul Donna Joshua Michelle Kenneth Carol Kevin Amanda Brian Melissa "
+    "George Deborah Timothy Stephanie Ronald Rebecca Jason Sharon Edward Laura"
+).split()
+_LAST_NAMES = (
+    "Smith Johnson Williams Brown Jones Garcia Miller Davis Rodriguez Martinez "
+    "Hernandez Lopez Gonzalez Wilson Anderson Thomas Taylor Moore Jackson Martin Lee "
+    "Perez Thompson White Harris Sanchez Clark Ramirez Lewis Robinson Walker Young "
+    "Allen King Wright Scott Torres Nguyen Hill Flores Green Adams Nelson Baker Hall "
+    "Rivera Campbell Mitchell Carter Roberts Patel Shah Kowalski Novak Schmidt"
+).split()
+_DEPARTMENTS = (
+    "Machining Welding Assembly Shipping Receiving Quality Engineering Purchasing "
+    "Sales Accounting Maintenance Inspection Planning Tooling Painting Fabrication "
+    "Estimating Inventory Logistics Production"
+).split()
+_ITEM_SUBJECTS = (
+    "Orders Jobs Invoices Shipments Receipts Quotes Inventory Scrap Labor Routers "
+    "Parts Customers Vendors Purchase Work Centers Operations Certifications NCRs "
+    "Backlog Capacity Schedule Payroll Overtime Tooling Gauges"
+).split()
+_ITEM_QUALIFIERS = (
+    "Open Late Weekly Daily Monthly Pending Closed Overdue Active Hot Released "
+    "Unbilled Partial Rejected Approved Expected Past-Due Top Recent Annual"
+).split()
+_REASON_WORDS = (
+    "family vacation trip doctor appointment medical personal day wedding funeral "
+    "moving house school event kids daycare closed car repair court date travel "
+    "visiting parents out of state holiday weekend fishing hunting season surgery "
+    "recovery dentist jury duty training course certification exam home repairs "
+    "contractor coming inspection closing on the house graduation ceremony"
+).split()
+_START_TIMES = (
+    "07:00:00.0000000",
+    "08:00:00.0000000",
+    "06:30:00.0000000",
+    "12:00:00.0000000",
+    "13:00:00.0000000",
+)
+
+# Rows inserted per executemany call.
+_BATCH_SIZE = 10_000
+
+
+class SyntheticDataset:
+    """
+    What `populate` generated.
+
+    - ``counts``: rows inserted per table.
+    - ``department_cache``: the department-wide grants, in the shape of
+      `DepartmentStore.load`, so the `Controller` sees the departments it would
+      have built itself.
+    """
+
+    def __init__(self, tier: str, seed: int) -> None:
+        self.tier = tier
+        self.seed = seed
+        self.counts: Dict[str, int] = {}
+        self.department_cache: Dict[str, Dict[str, Any]] = {}
+
+    def summary(self) -> Dict[str, Any]:
+        return {"tier": self.tier, "seed": self.seed, "counts": self.counts}
+
+
+def _cumulative(weights: Sequence[float]) -> List[float]:
+    cumulative, total = [], 0.0
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+    return cumulative
+
+
+def _insert(conn, table: str, columns: Sequence[str], rows: List[tuple]) -> int:
+    placeholders = ", ".join("?" * len(columns))
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+    for start in range(0, len(rows), _BATCH_SIZE):
+        conn.executemany(query, rows[start : start + _BATCH_SIZE])
+    return len(rows)
+
+
+def _departments(rng: random.Random, count: int) -> List[tuple]:
+    rows = []
+    for pk in range(1, count + 1):
+        name = _DEPARTMENTS[(pk - 1) % len(_DEPARTMENTS)]
+        if pk > len(_DEPARTMENTS):
+            name = f"{name} {rng.choice(('Cell', 'Line', 'Shift', 'Team'))} {pk}"
+        rows.append((pk, name))
+    return rows
+
+
+def _users(rng: random.Random, count: int, department_count: int) -> List[tuple]:
+    """
+    Users spread over departments with log-normal sizes: a few large departments
+    and a long tail of small ones. About 5% have no department, 3% are disabled.
+    """
+    sizes = _cumulative([rng.lognormvariate(0.0, 1.0) for _ in range(department_count)])
+    departments = rng.choices(
+        range(1, department_count + 1), cum_weights=sizes, k=count
+    )
+
+    rows = []
+    for pk, department_pk in enumerate(departments, start=1):
+        first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+        code = f"{first[0]}{last}{pk}".lower()
+        rows.append(
+            (
+                pk,
+                first,
+                last,
+                code,
+                f"pw{pk}",
+                f"{code}@example.com",
+                0 if rng.random() < 0.03 else 1,
+                None if rng.random() < 0.05 else department_pk,
+            )
+        )
+    return rows
+
+
+def _items(rng: random.Random, count: int) -> List[str]:
+    labels = []
+    for number in range(1, count + 1):
+        label = f"{rng.choice(_ITEM_QUALIFIERS)} {rng.choice(_ITEM_SUBJECTS)}"
+        if rng.random() < 0.5:
+            label += f" {rng.choice(_ITEM_SUBJECTS)}"
+        labels.append(f"{label} #{number}")
+    return labels
+
+
+def _links(
+    rng: random.Random,
+    target: int,
+    item_count: int,
+    users: List[tuple],
+    members: Dict[int, List[int]],
+) -> Tuple[List[tuple[int, int]], Dict[int, List[int]]]:
+    """
+    (UserFK, item PK) pairs for one link table, and the items granted to each whole
+    department. Item popularity follows a power law, user activity is log-normal.
+    """
+    popularity = _cumulative(
+        [1.0 / rank**ITEM_POPULARITY_EXPONENT for rank in range(1, item_count + 1)]
+    )
+    items = range(1, item_count + 1)
+
+    # Department-wide grants, until they use their share of the table.
+    department_items: Dict[int, List[int]] = {}
+    department_links: set = set()
+    budget = target * DEPARTMENT_GRANT_SHARE
+    for department_pk, user_pks in members.items():
+        wanted = max(1, min(item_count, int(rng.lognormvariate(1.0, 0.8))))
+        granted = sorted(set(rng.choices(items, cum_weights=popularity, k=wanted)))
+        if len(department_links) + len(granted) * len(user_pks) > budget:
+            continue
+        department_items[department_pk] = granted
+        department_links.update((u, i) for u in user_pks for i in granted)
+
+    # Individual grants fill the rest.
+    user_pks = [row[0] for row in users]
+    activity = _cumulative([rng.lognormvariate(0.0, 1.2) for _ in user_pks])
+    wanted = min(target, len(user_pks) * item_count) - len(department_links)
+    individual: set = set()
+    for _ in range(50):
+        missing = wanted - len(individual)
+        if missing <= 0:
+            break
+        batch = int(missing * 1.2) + 10
+        individual.update(
+            zip(
+                rng.choices(user_pks, cum_weights=activity, k=batch),
+                rng.choices(items, cum_weights=popularity, k=batch),
+            )
+        )
+        individual -= department_links
+
+    # Set order is not reproducible: sort, then shuffle with the seeded generator so
+    # link PKs are not ordered by user.
+    individual_links = sorted(individual)
+    rng.shuffle(individual_links)
+    links = sorted(department_links) + individual_links[: max(wanted, 0)]
+    rng.shuffle(links)
+    return links, department_items
+
+
+def _reason(rng: random.Random) -> str:
+    """
+    Mostly a sentence or two, with a long tail of multi-paragraph explanations and
+    notes appended the way `update_vacation_request_reason` does.
+    """
+    word_count = min(2_000, max(2, int(rng.lognormvariate(3.0, 1.2))))
+    words = rng.choices(_REASON_WORDS, k=word_count)
+    reason = " ".join(words).capitalize() + "."
+    if rng.random() < 0.1:
+        reason += (
+            "\r\x0e\r\x0e" + f"Disapproved: {' '.join(rng.choices(_REASON_WORDS, k=8))}"
+        )
+    return reason
+
+
+def _vacation_requests(
+    rng: random.Random, count: int, users: List[tuple]
+) -> List[tuple]:
+    enabled = [row[0] for row in users if row[6]]
+    first_day = date(2025, 1, 1)
+
+    rows = []
+    for pk in range(1, count + 1):
+        from_date = first_day + timedelta(days=rng.randrange(540))
+        days = rng.choices((1, 2, 3, 5, 10), weights=(60, 15, 10, 10, 5))[0]
+        half_day = days == 1 and rng.random() < 0.2
+        rows.append(
+            (
+                pk,
+                rng.choice(enabled),
+                from_date.isoformat(),
+                (from_date + timedelta(days=days - 1)).isoformat(),
+                rng.choice(_START_TIMES),
+                4.0 if half_day else 8.0 * days,
+                _reason(rng),
+                1 if rng.random() < 0.65 else 0,
+            )
+        )
+    return rows
+
+
+def populate(
+    backend: SqliteBackend, tier: str = "small", seed: int = 0
+) -> SyntheticDataset:
+    """
+    Generates a scale tier into an empty `SqliteBackend` database.
+
+    :param backend: The stand-in database, with its schema created.
+    :type backend: SqliteBackend
+    :param tier: One of `SCALE_TIERS`.
+    :type tier: str
+    :param seed: Seed of the generator, the same tier and seed give the same rows.
+    :type seed: int
+    :return: The row counts and the department cache of the generated data.
+    :rtype: SyntheticDataset
+    """
+    try:
+        sizes = SCALE_TIERS[tier]
+    except KeyError:
+        raise ValueError(f"Unknown scale tier: {tier}")
+
+    rng = random.Random(f"{tier}:{seed}")
+    dataset = SyntheticDataset(tier, seed)
+    conn = backend.raw_connection()
+
+    departments = _departments(rng, sizes["departments"])
+    users = _users(rng, sizes["users"], sizes["departments"])
+    members: Dict[int, List[int]] = {}
+    for row in users:
+        if row[7] is not None:
+            members.setdefault(row[7], []).append(row[0])
+
+    item_labels = {
+        "Dashboard": _items(rng, sizes["dashboards"]),
+        "QuickView": _items(rng, sizes["quickviews"]),
+        "DocumentGroup": _items(rng, sizes["document_groups"]),
+    }
+
+    dataset.department_cache = {
+        str(pk): {"name": name, **{key: {} for key in ACCESSED_KEYS.values()}}
+        for pk, name in departments
+    }
+
+    with conn:
+        counts = dataset.counts
+        counts["Department"] = _insert(
+            conn, "Department", ("DepartmentPK", "Name"), departments
+        )
+        counts["User"] = _insert(
+            conn,
+            "[User]",
+            (
+                "UserPK",
+                "FirstName",
+                "LastName",
+                "Code",
+                "Password",
+                "Email",
+                "Enabled",
+                "DepartmentFK",
+            ),
+            users,
+        )
+
+        counts["Dashboard"] = _insert(
+            conn,
+            "Dashboard",
+            ("DashboardPK", "Description"),
+            list(enumerate(item_labels["Dashboard"], 1)),
+        )
+        counts["QuickView"] = _insert(
+            conn,
+            "QuickView",
+            ("QuickViewPK", "Description"),
+            list(enumerate(item_labels["QuickView"], 1)),
+        )
+        counts["DocumentGroup"] = _insert(
+            conn,
+            "DocumentGroup",
+            ("DocumentGroupPK", "Code", "Name"),
+            [
+                (pk, f"DG-{pk:04d}", label)
+                for pk, label in enumerate(item_labels["DocumentGroup"], 1)
+            ],
+        )
+
+        link_tables = {
+            "Dashboard": ("DashboardUser", "DashboardFK"),
+            "QuickView": ("QuickViewUser", "QuickViewFK"),
+            "DocumentGroup": ("DocumentGroupUsers", "DocumentGroupFK"),
+        }
+        for item_table, (link_table, item_fk) in link_tables.items():
+            links, department_items = _links(
+                rng,
+                int(sizes["link_rows"] * LINK_SHARES[item_table]),
+                len(item_labels[item_table]),
+                users,
+                members,
+            )
+            counts[link_table] = _insert(conn, link_table, ("UserFK", item_fk), links)
+
+            key = ACCESSED_KEYS[item_table]
+            for department_pk, item_pks in department_items.items():
+                dataset.department_cache[str(department_pk)][key] = {
+                    str(item_pk): item_labels[item_table][item_pk - 1]
+                    for item_pk in item_pks
+                }
+
+        counts["VacationRequest"] = _insert(
+            conn,
+            "VacationRequest",
+            (
+                "VacationRequestPK",
+                "EmployeeFK",
+                "FromDate",
+                "ToDate",
+                "StartTime",
+                "Hours",
+                "Reason",
+                "Approved",
+            ),
+            _vacation_requests(rng, sizes["vacation_requests"], users),
+        )
+
+    return dataset
+
+
+def fingerprint(backend: SqliteBackend) -> str:
+    """
+    Returns a hash of every generated table, to check that two databases hold the same data.
+    """
+    digest = hashlib.sha256()
+    conn = backend.raw_connection()
+    for table in (
+        "Department",
+        "[User]",
+        "Dashboard",
+        "QuickView",
+        "DocumentGroup",
+        "DashboardUser",
+        "QuickViewUser",
+        "DocumentGroupUsers",
+        "VacationRequest",
+    ):
+        for row in conn.execute(f"SELECT * FROM {table} ORDER BY 1"):
+            digest.update(repr(row).encode())
+    return digest.hexdigest()
+
+
+def synthetic_backend(
+    tier: str = "small", seed: int = 0, path: str = ":memory:"
+) -> Tuple[SqliteBackend, SyntheticDataset]:
+    """
+    Builds an `SqliteBackend` and fills it with a scale tier, ready for
+    `mie_trak_funcs.configure_backend`.
+
+    :return: The backend and what was generated into it.
+    :rtype: Tuple[SqliteBackend, SyntheticDataset]
+    """
+    backend = SqliteBackend(path)
+    return backend, populate(backend, tier, seed)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Fill an SQLite stand-in database with synthetic MIE Trak data."
+    )
+    parser.add_argument("--tier", choices=sorted(SCALE_TIERS), default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", required=True, help="SQLite database file to create."
+    )
+    parser.add_argument(
+        "--department-store",
+        help="Also write the department cache to this DepartmentStore file.",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Replace the output file if it exists."
+    )
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.output):
+        if not args.force:
+            parser.error(f"{args.output} exists, use --force to replace it")
+        os.remove(args.output)
+
+    start = time.perf_counter()
+    backend, dataset = synthetic_backend(args.tier, args.seed, args.output)
+    LOGGER.info(f"Generated {args.tier} tier in {time.perf_counter() - start:.2f}s")
+
+    if args.department_store:
+        store = DepartmentStore(args.department_store)
+        store.replace_all(dataset.department_cache)
+        store.close()
+
+    print(
+        json.dumps({**dataset.summary(), "fingerprint": fingerprint(backend)}, indent=4)
+    )
+    backend.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+import functools
+from collections.abc import Mapping
+from datetime import date, datetime, time
+from typing import Any, Iterator
+
+
+@functools.lru_cache(maxsize=4096)
+def format_date(value: date | None) -> str:
+    """
+    Formats a request date for display. Cached, the same dates come back on many rows.
+    """
+    return value.strftime("%Y-%m-%d") if value else "N/A"
+
+
+@functools.lru_cache(maxsize=4096)
+def format_start_time(value: time | str | None) -> str:
+    """
+    Formats a request start time for display. Cached, requests mostly start at a
+    handful of times.
+
+    :param value: A `time` when the driver converts the column (see
+        `db_backend.PyodbcBackend`), otherwise the "HH:MM:SS.fffffff" string the
+        legacy SQL Server driver returns.
+    """
+    if not value:
+        return "N/A"
+    if isinstance(value, str):
+        value = datetime.strptime(value[:15], "%H:%M:%S.%f")
+    return value.strftime("%I:%M %p")
+
+
+class VacationRequestRecord(Mapping):
+    """
+    A pending vacation request as read from the database.
+
+    Holds the raw column values in slots and formats dates and times only when they are
+    read, so loading many requests does not build a dictionary of display strings per
+    row. It reads like the dictionaries the GUI has always used ("Vacation ID",
+    "Employee", "From Date", ...), and "Reason", "Status", "Time Stamp", "Note" and
+    "Reason Truncated" can be set on it. ``dict(record)`` gives the plain dictionary.
+    """
+
+    __slots__ = (
+        "pk",
+        "first_name",
+        "last_name",
+        "from_date",
+        "to_date",
+        "start_time",
+        "hours",
+        "reason",
+        "approved",
+        "reason_truncated",
+        "status",
+        "time_stamp",
+        "note",
+    )
+
+    # Keys that are always present, in display order.
+    _COLUMNS = {
+        "Vacation ID": lambda r: r.pk,
+        "Employee": lambda r: f"{r.first_name} {r.last_name}",
+        "From Date": lambda r: format_date(r.from_date),
+        "To Date": lambda r: format_date(r.to_date),
+        "Start Time": lambda r: format_start_time(r.start_time),
+        "Hours": lambda r: float(r.hours) if r.hours else "N/A",
+        "Reason": lambda r: r.reason,
+        "Approved": lambda r: r.approved,
+    }
+    # Keys set after the request is read, and only present once set.
+    _ANNOTATIONS = {
+        "Reason Truncated": "reason_truncated",
+        "Status": "status",
+        "Time Stamp": "time_stamp",
+        "Note": "note",
+    }
+
+    def __init__(
+        self,
+        pk: int,
+        first_name: str,
+        last_name: str,
+        from_date: date | None,
+        to_date: date | None,
+        start_time: time | str | None,
+        hours,
+        reason: str | None,
+        approved,
+    ) -> None:
+        self.pk = pk
+        self.first_name = first_name
+        self.last_name = last_name
+        self.from_date = from_date
+        self.to_date = to_date
+        self.start_time = start_time
+        self.hours = hours
+        self.reason = reason
+        self.approved = approved
+        self.reason_truncated = None
+        self.status = None
+        self.time_stamp = None
+        self.note = None
+
+    def __getitem__(self, key: str) -> Any:
+        column = self._COLUMNS.get(key)
+        if column is not None:
+            return column(self)
+
+        attribute = self._ANNOTATIONS.get(key)
+        if attribute is not None:
+            value = getattr(self, attribute)
+            if value is not None:
+                return value
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == "Reason":
+            # Replaces a preview with the full text.
+            self.reason = value
+            return
+
+        attribute = self._ANNOTATIONS.get(key)
+        if attribute is None:
+            raise KeyError(f"{key} can not be set on a vacation request")
+        setattr(self, attribute, value)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._COLUMNS
+        for key, attribute in self._ANNOTATIONS.items():
+            if getattr(self, attribute) is not None:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"VacationRequestRecord({dict(self)!r})"
@@ -0,0 +1,91 @@
+import pytest
+from scripts import mie_trak_funcs
+from scripts.db_backend import SqliteBackend
+from scripts.reconcile import apply_plan, build_plan
+
+
+# Department 1 (users 10 and 11) and department 2 (user 20) should both have
+# dashboard 1. User 10 and user 20 each hold a duplicate link row.
+LINK_ROWS = [
+    (1, 1, 10),
+    (2, 1, 10),  # duplicate of 1
+    (3, 2, 20),
+    (4, 2, 20),  # duplicate of 3
+]
+
+CACHE = {
+    "1": {"name": "Shop", "accessed_dashboards": {"1": "Open Orders"}},
+    "2": {"name": "Office", "accessed_dashboards": {"1": "Open Orders"}},
+}
+
+
+@pytest.fixture
+def backend():
+    backend = SqliteBackend()
+    conn = backend.raw_connection()
+    with conn:
+        conn.executemany(
+            "INSERT INTO Department VALUES (?, ?)", [(1, "Shop"), (2, "Office")]
+        )
+        conn.executemany(
+            "INSERT INTO [User] (UserPK, Enabled, DepartmentFK) VALUES (?, 1, ?)",
+            [(10, 1), (11, 1), (20, 2)],
+        )
+        conn.executemany(
+            "INSERT INTO Dashboard VALUES (?, ?)",
+            [(1, "Open Orders"), (2, "Closed Jobs")],
+        )
+        conn.executemany("INSERT INTO DashboardUser VALUES (?, ?, ?)", LINK_ROWS)
+
+    mie_trak_funcs.configure_backend(backend)
+    yield backend
+    backend.close()
+
+
+def _dashboard_links(backend) -> list:
+    query = "SELECT UserFK, DashboardFK FROM DashboardUser ORDER BY UserFK, DashboardFK"
+    return backend.raw_connection().execute(query).fetchall()
+
+
+def test_build_plan_covers_every_department(backend):
+    plan = build_plan(CACHE)
+
+    assert sorted(plan.inserts["Dashboard"]) == [(11, 1), (20, 1)]
+    assert sorted(plan.deletes["Dashboard"]) == [2, 4]
+    assert plan.missing == {
+        "1": {"Dashboard": {"1": [11]}},
+        "2": {"Dashboard": {"1": [20]}},
+    }
+
+
+def test_build_plan_scoped_to_departments(backend):
+    plan = build_plan(CACHE, department_pks=[1])
+
+    assert plan.inserts["Dashboard"] == [(11, 1)]
+    # The duplicate of user 20, in department 2, is left alone.
+    assert plan.deletes["Dashboard"] == [2]
+    assert list(plan.missing) == ["1"]
+
+
+def test_apply_plan_every_department(backend):
+    result = apply_plan(build_plan(CACHE))
+
+    assert result["Dashboard"] == {"inserted": 2, "deleted": 2}
+    assert _dashboard_links(backend) == [(10, 1), (11, 1), (20, 1), (20, 2)]
+    assert build_plan(CACHE).is_empty()
+
+
+def test_apply_plan_scoped_to_departments(backend):
+    result = apply_plan(build_plan(CACHE, department_pks=["1"]))
+
+    assert result["Dashboard"] == {"inserted": 1, "deleted": 1}
+    assert _dashboard_links(backend) == [(10, 1), (11, 1), (20, 2), (20, 2)]
+    assert build_plan(CACHE, department_pks=["1"]).is_empty()
+
+
+def test_apply_plan_without_changes(backend):
+    plan = build_plan(CACHE, department_pks=[3])
+
+    assert plan.is_empty()
+    assert apply_plan(plan) == {}
+    assert len(_dashboard_links(backend)) == len(LINK_ROWS)